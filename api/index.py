@@ -1,63 +1,68 @@
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, send_file
 from flask_cors import CORS
-import pandas as pd
 import os
+import sys
 from datetime import datetime
+from functools import lru_cache
 import random
 
+# Import the backend's readers for the prebuilt artifacts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+# Only light modules are imported at cold start; every route answers from
+# artifacts built ahead of time (NumPy is imported by /geo/pincodes for its index)
+from dashboard_aggregates import DashboardAggregates
+from serverless_bundle import bundled_gzip
+
 app = Flask(__name__)
 CORS(app)
 
 # Path to Excel files
 EXCEL_DATA_PATH = "XLSx data/"
 
+# Exact dashboard totals, built offline by backend/dashboard_aggregates.py and deployed with the API
+aggregates = DashboardAggregates(excel_folder=EXCEL_DATA_PATH)
+
+@lru_cache(maxsize=None)
+def pincode_tiles():
+    """Pre-simplified pincode boundaries, memory-mapped on first use"""
+    from geo_tiles import GeoTileStore
+    return GeoTileStore()
+
+def send_geo_file(name, missing_error):
+    """Serve a boundary file, as its pre-gzipped bundle copy when the client accepts gzip"""
+    gz_path = bundled_gzip(name, source_path=name)
+    if gz_path and request.accept_encodings['gzip']:
+        response = send_file(gz_path, mimetype='application/json', conditional=True, max_age=3600)
+        response.headers['Content-Encoding'] = 'gzip'
+    elif os.path.exists(name):
+        response = send_file(os.path.abspath(name), mimetype='application/json', conditional=True, max_age=3600)
+    else:
+        return jsonify({"error": missing_error}), 404
+    response.vary.add('Accept-Encoding')
+    return response
+
 @app.route("/")
 def home():
     return {"message": "DLC Pension Management API", "status": "running", "timestamp": datetime.now().isoformat()}
 
+def aggregate_response(section, limit=None):
+    """JSON response for one section of the precomputed aggregates, cacheable by ETag"""
+    data, etag = aggregates.get(section)
+    response = jsonify(data[:limit] if limit else data)
+    # Only changes when the artifact is rebuilt and redeployed
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'public, max-age=300'
+    return response.make_conditional(request)
+
 @app.route("/api/dashboard/stats")
 def get_dashboard_stats():
-    """Get main dashboard statistics from Excel files"""
+    """Get main dashboard statistics (exact totals over all workbook rows)"""
     try:
-        total_pensioners = 0
-        verified_count = 0
-        pending_count = 0
-        total_amount = 0
-        
-        # Process all Excel files
-        excel_files = [f for f in os.listdir(EXCEL_DATA_PATH) if f.endswith('.xlsx')]
-        
-        for file in excel_files[:5]:  # Process first 5 files
-            file_path = os.path.join(EXCEL_DATA_PATH, file)
-            df = pd.read_excel(file_path, nrows=10000)  # Limit rows for performance
-            
-            total_pensioners += len(df)
-            
-            # Assume columns exist (adjust based on actual Excel structure)
-            if 'Status' in df.columns:
-                verified_count += len(df[df['Status'] == 'Verified'])
-                pending_count += len(df[df['Status'] == 'Pending'])
-            else:
-                # Mock data if columns don't exist
-                verified_count += int(len(df) * 0.85)
-                pending_count += int(len(df) * 0.15)
-            
-            if 'Amount' in df.columns:
-                total_amount += df['Amount'].sum()
-            else:
-                # Mock amount calculation
-                total_amount += len(df) * random.uniform(8000, 25000)
-        
-        return jsonify({
-            'totalPensioners': total_pensioners,
-            'verifiedThisMonth': verified_count,
-            'pendingVerifications': pending_count,
-            'totalAmount': round(total_amount, 2),
-            'lastUpdated': datetime.now().isoformat()
-        })
+        return aggregate_response('stats')
         
     except Exception as e:
-        # Fallback to mock data if Excel processing fails
+        # Fallback to mock data if the aggregates cannot be read
         return jsonify({
             'totalPensioners': 125847,
             'verifiedThisMonth': 8934,
@@ -69,47 +74,9 @@ def get_dashboard_stats():
 
 @app.route("/api/dashboard/age-distribution")
 def get_age_distribution():
-    """Get age-wise distribution from Excel data"""
+    """Get age-wise distribution over all workbook rows"""
     try:
-        age_groups = {'60-65': 0, '66-70': 0, '71-75': 0, '76-80': 0, '80+': 0}
-        
-        excel_files = [f for f in os.listdir(EXCEL_DATA_PATH) if f.endswith('.xlsx')]
-        
-        for file in excel_files[:3]:  # Process first 3 files for performance
-            file_path = os.path.join(EXCEL_DATA_PATH, file)
-            df = pd.read_excel(file_path, nrows=5000)
-            
-            if 'Age' in df.columns:
-                for age in df['Age'].dropna():
-                    if 60 <= age <= 65:
-                        age_groups['60-65'] += 1
-                    elif 66 <= age <= 70:
-                        age_groups['66-70'] += 1
-                    elif 71 <= age <= 75:
-                        age_groups['71-75'] += 1
-                    elif 76 <= age <= 80:
-                        age_groups['76-80'] += 1
-                    elif age > 80:
-                        age_groups['80+'] += 1
-            elif 'YOB' in df.columns:
-                current_year = datetime.now().year
-                for yob in df['YOB'].dropna():
-                    age = current_year - int(yob)
-                    if 60 <= age <= 65:
-                        age_groups['60-65'] += 1
-                    elif 66 <= age <= 70:
-                        age_groups['66-70'] += 1
-                    elif 71 <= age <= 75:
-                        age_groups['71-75'] += 1
-                    elif 76 <= age <= 80:
-                        age_groups['76-80'] += 1
-                    elif age > 80:
-                        age_groups['80+'] += 1
-        
-        return jsonify([
-            {'ageGroup': group, 'count': count} 
-            for group, count in age_groups.items()
-        ])
+        return aggregate_response('age_distribution')
         
     except Exception as e:
         # Fallback mock data
@@ -123,43 +90,9 @@ def get_age_distribution():
 
 @app.route("/api/dashboard/state-wise-data")
 def get_state_wise_data():
-    """Get state-wise pension data from Excel"""
+    """Get state-wise pension data over all workbook rows"""
     try:
-        state_data = {}
-        
-        excel_files = [f for f in os.listdir(EXCEL_DATA_PATH) if f.endswith('.xlsx')]
-        
-        for file in excel_files[:3]:
-            file_path = os.path.join(EXCEL_DATA_PATH, file)
-            df = pd.read_excel(file_path, nrows=5000)
-            
-            if 'State' in df.columns:
-                for state in df['State'].dropna().unique():
-                    state_df = df[df['State'] == state]
-                    if state not in state_data:
-                        state_data[state] = {
-                            'state': state,
-                            'totalPensioners': 0,
-                            'verified': 0,
-                            'pending': 0,
-                            'avgAmount': 0
-                        }
-                    
-                    state_data[state]['totalPensioners'] += len(state_df)
-                    
-                    if 'Status' in df.columns:
-                        state_data[state]['verified'] += len(state_df[state_df['Status'] == 'Verified'])
-                        state_data[state]['pending'] += len(state_df[state_df['Status'] == 'Pending'])
-                    else:
-                        state_data[state]['verified'] += int(len(state_df) * 0.85)
-                        state_data[state]['pending'] += int(len(state_df) * 0.15)
-                    
-                    if 'Amount' in df.columns:
-                        state_data[state]['avgAmount'] = state_df['Amount'].mean()
-                    else:
-                        state_data[state]['avgAmount'] = random.uniform(10000, 15000)
-        
-        return jsonify(list(state_data.values())[:10])  # Top 10 states
+        return aggregate_response('state_wise', limit=10)  # Top 10 states by pensioners
         
     except Exception as e:
         # Fallback mock data
@@ -173,39 +106,43 @@ def get_state_wise_data():
 
 @app.route("/api/pensioners")
 def get_pensioners():
-    """Get paginated list of pensioners from Excel"""
+    """Get paginated list of pensioners from the bundled Excel sample"""
     try:
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 50))
         
-        all_pensioners = []
-        excel_files = [f for f in os.listdir(EXCEL_DATA_PATH) if f.endswith('.xlsx')]
+        # First 1000 rows of the first 2 files, bundled in the aggregates artifact;
+        # columns the workbooks lack are generated per row as before
+        sample, _ = aggregates.get('pensioners')
+        columns = sample['columns']
+        total = sample['total']
         
-        for file in excel_files[:2]:  # Process first 2 files
-            file_path = os.path.join(EXCEL_DATA_PATH, file)
-            df = pd.read_excel(file_path, nrows=1000)
-            
-            for _, row in df.iterrows():
-                pensioner = {
-                    'id': len(all_pensioners) + 1,
-                    'name': row.get('Name', f'Pensioner {len(all_pensioners) + 1}'),
-                    'age': row.get('Age', random.randint(60, 85)),
-                    'state': row.get('State', 'Unknown'),
-                    'status': row.get('Status', random.choice(['Verified', 'Pending'])),
-                    'amount': row.get('Amount', round(random.uniform(8000, 25000), 2))
-                }
-                all_pensioners.append(pensioner)
+        start = max((page - 1) * per_page, 0)
+        end = min(start + per_page, total)
+        ids = range(start + 1, end + 1)
         
-        # Pagination
-        start = (page - 1) * per_page
-        end = start + per_page
-        paginated_data = all_pensioners[start:end]
+        def column(name, generate):
+            if name in columns:
+                return columns[name][start:end]
+            return [generate(pensioner_id) for pensioner_id in ids]
+        
+        values = {
+            'name': column('Name', lambda i: f'Pensioner {i}'),
+            'age': column('Age', lambda i: random.randint(60, 85)),
+            'state': column('State', lambda i: 'Unknown'),
+            'status': column('Status', lambda i: random.choice(['Verified', 'Pending'])),
+            'amount': column('Amount', lambda i: round(random.uniform(8000, 25000), 2)),
+        }
+        paginated_data = [
+            {'id': pensioner_id, **{key: column_values[index] for key, column_values in values.items()}}
+            for index, pensioner_id in enumerate(ids)
+        ]
         
         return jsonify({
             'data': paginated_data,
             'page': page,
             'per_page': per_page,
-            'total': len(all_pensioners)
+            'total': total
         })
         
     except Exception as e:
@@ -246,11 +183,7 @@ def get_analytics_trends():
 def get_pincode_geojson():
     """Serve pincode boundary GeoJSON file"""
     try:
-        with open("All_India_pincode_Boundary.geojson", 'r', encoding='utf-8') as f:
-            geojson_data = f.read()
-        return geojson_data, 200, {'Content-Type': 'application/json'}
-    except FileNotFoundError:
-        return jsonify({"error": "GeoJSON file not found"}), 404
+        return send_geo_file("All_India_pincode_Boundary.geojson", "GeoJSON file not found")
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -258,11 +191,7 @@ def get_pincode_geojson():
 def get_filtered_pincode_geojson():
     """Serve filtered pincode boundary GeoJSON file"""
     try:
-        with open("Filtered_Pincode_Boundaries.geojson", 'r', encoding='utf-8') as f:
-            geojson_data = f.read()
-        return geojson_data, 200, {'Content-Type': 'application/json'}
-    except FileNotFoundError:
-        return jsonify({"error": "Filtered GeoJSON file not found"}), 404
+        return send_geo_file("Filtered_Pincode_Boundaries.geojson", "Filtered GeoJSON file not found")
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -270,23 +199,61 @@ def get_filtered_pincode_geojson():
 def get_real_pensioner_pincode_geojson():
     """Serve real pensioner pincode boundary GeoJSON file"""
     try:
-        with open("Real_Pensioner_Pincode_Boundaries.geojson", 'r', encoding='utf-8') as f:
-            geojson_data = f.read()
-        return geojson_data, 200, {'Content-Type': 'application/json'}
+        return send_geo_file("Real_Pensioner_Pincode_Boundaries.geojson", "Real pensioner GeoJSON file not found")
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/geo/pincodes")
+def get_pincode_tiles():
+    """Pincode boundaries for a state and/or viewport, simplified for the zoom level
+
+    Query: state=<name>, bbox=min_lon,min_lat,max_lon,max_lat, zoom=<map zoom>
+    """
+    from geo_tiles import parse_bbox
+
+    try:
+        state = request.args.get('state')
+        bbox = parse_bbox(request.args['bbox']) if request.args.get('bbox') else None
+        zoom = float(request.args['zoom']) if request.args.get('zoom') else None
+    except ValueError as e:
+        return jsonify({"error": f"Invalid query: {e}"}), 400
+
+    geo_tiles = pincode_tiles()
+    try:
+        body = geo_tiles.query(state=state, bbox=bbox, zoom=zoom)
+    except KeyError:
+        return jsonify({"error": f"Unknown state: {state}", "states": geo_tiles.state_names()}), 404
     except FileNotFoundError:
-        return jsonify({"error": "Real pensioner GeoJSON file not found"}), 404
+        return jsonify({"error": "Pincode boundary GeoJSON file not found"}), 404
+
+    response = app.response_class(body, mimetype='application/json')
+    # Tiles only change when the source GeoJSON changes
+    response.set_etag(geo_tiles.etag)
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response.make_conditional(request)
+
+@app.route("/topo/<name>.json")
+def get_topology(name):
+    """Simplified, quantized TopoJSON of india.json or a states/<name>.json map for ?zoom="""
+    try:
+        zoom = float(request.args.get('zoom', 5))
+    except ValueError:
+        return jsonify({"error": "zoom must be a number"}), 400
+
+    try:
+        from topology_build import topology_path
+        path = topology_path(name, zoom)
+    except KeyError:
+        return jsonify({"error": f"Unknown map: {name}"}), 404
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+    return send_file(path, mimetype='application/json', conditional=True, max_age=3600)
 
 @app.route("/india.json")
 def get_india_json():
     """Serve India state boundaries JSON file"""
     try:
-        with open("india.json", 'r', encoding='utf-8') as f:
-            india_data = f.read()
-        return india_data, 200, {'Content-Type': 'application/json'}
-    except FileNotFoundError:
-        return jsonify({"error": "India JSON file not found"}), 404
+        return send_geo_file("india.json", "India JSON file not found")
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Incremental analysis manifest for the GAD_DLC_PINCODE_DATA workbooks
+Records each workbook's content hash next to its per-file key counts and the
+running totals, so a re-run only parses workbooks that are new or changed and
+can subtract the contribution of workbooks that were modified or removed.
+
+Layout (under CACHE_DIR/analysis):
+    manifest.json               name → size, mtime_ns, sha256, partial file, records
+    partials/<stem>-<sha>.parquet   key counts of one workbook version
+    totals.parquet              merged key counts of every workbook in the manifest
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from excel_cache import CACHE_DIR, PARQUET_AVAILABLE
+
+MANIFEST_VERSION = 1
+ANALYSIS_DIR = os.path.join(CACHE_DIR, 'analysis')
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(file_path):
+    """Content hash of a workbook, read in 1 MB chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _atomic_write_parquet(df, path):
+    tmp_path = f"{path}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+class AnalysisManifest:
+    """Per-workbook fingerprints and partial key counts stored on disk"""
+
+    def __init__(self, analysis_dir=ANALYSIS_DIR):
+        self.analysis_dir = analysis_dir
+        self.partials_dir = os.path.join(analysis_dir, 'partials')
+        self.manifest_path = os.path.join(analysis_dir, 'manifest.json')
+        self.totals_path = os.path.join(analysis_dir, 'totals.parquet')
+        self.files = self._load_entries()
+
+    def _load_entries(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get('version') != MANIFEST_VERSION:
+            return {}
+        return manifest.get('files', {})
+
+    def plan(self, file_paths):
+        """Split workbooks into (unchanged, changed_or_new, removed_names)
+
+        The size/mtime check avoids hashing untouched files; a file whose mtime
+        moved but whose content hash is the same still counts as unchanged.
+        Returns fingerprints for every current file, keyed by basename.
+        """
+        unchanged, changed, fingerprints = [], [], {}
+        for file_path in file_paths:
+            name = os.path.basename(file_path)
+            stat = os.stat(file_path)
+            entry = self.files.get(name)
+            fingerprint = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                fingerprint['sha256'] = entry['sha256']
+            else:
+                fingerprint['sha256'] = file_sha256(file_path)
+            fingerprints[name] = fingerprint
+
+            if entry and entry['sha256'] == fingerprint['sha256'] and self.has_partial(name):
+                unchanged.append(file_path)
+            else:
+                changed.append(file_path)
+
+        current = set(fingerprints)
+        removed = [name for name in self.files if name not in current]
+        return unchanged, changed, removed, fingerprints
+
+    def has_partial(self, name):
+        entry = self.files.get(name)
+        return bool(entry) and os.path.exists(os.path.join(self.partials_dir, entry['partial']))
+
+    def load_partial(self, name):
+        """Stored key counts of a workbook, or None if it is not in the manifest"""
+        if not self.has_partial(name):
+            return None
+        return pd.read_parquet(os.path.join(self.partials_dir, self.files[name]['partial']))
+
+    def load_totals(self):
+        """Stored running totals, or None if they have not been written yet"""
+        if not os.path.exists(self.totals_path):
+            return None
+        return pd.read_parquet(self.totals_path)
+
+    def record(self, name, fingerprint, key_counts):
+        """Store the key counts for the current version of a workbook"""
+        os.makedirs(self.partials_dir, exist_ok=True)
+        stem = os.path.splitext(name)[0]
+        partial = f"{stem}-{fingerprint['sha256'][:16]}.parquet"
+        _atomic_write_parquet(key_counts, os.path.join(self.partials_dir, partial))
+
+        previous = self.files.get(name)
+        self.files[name] = dict(fingerprint, partial=partial, records=int(key_counts['count'].sum()))
+        if previous and previous['partial'] != partial:
+            self._remove_partial(previous['partial'])
+
+    def touch(self, name, fingerprint):
+        """Refresh size/mtime for a workbook whose content hash did not change"""
+        self.files[name].update(fingerprint)
+
+    def forget(self, name):
+        """Drop a removed workbook and its stored key counts"""
+        entry = self.files.pop(name, None)
+        if entry:
+            self._remove_partial(entry['partial'])
+
+    def _remove_partial(self, partial):
+        try:
+            os.remove(os.path.join(self.partials_dir, partial))
+        except FileNotFoundError:
+            pass
+
+    def save(self, totals):
+        """Write the running totals, then the manifest that describes them"""
+        os.makedirs(self.analysis_dir, exist_ok=True)
+        _atomic_write_parquet(totals, self.totals_path)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'files': self.files}, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+
+def manifest_available():
+    """The manifest stores key counts as Parquet, so it needs pyarrow"""
+    return PARQUET_AVAILABLE
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Background refresh of the DLC bank-pincode analysis
+A daemon thread polls the XLSx data folder; when the set of workbooks (name,
+size, mtime) changes and then stays the same for one more poll, it re-runs
+the analysis off the request path, writes a new dlc_bank_analysis_*.dlcsnap
+snapshot and swaps it into the DlcAnalysisStore in one step. Requests keep
+being served from the previous snapshot until the swap.
+
+The workbook signature is stored in each snapshot's metadata, so a restart
+only re-runs the analysis if the workbooks changed while the server was down.
+An analysis without that metadata (a file written by hand-run scripts) is
+taken to match the workbooks present at the first poll; it is replaced once
+they change or a refresh is requested.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+
+from analysis_snapshot import SNAPSHOT_SUFFIX, save_analysis_snapshot
+from analysis_store import ANALYSIS_PREFIX
+from excel_cache import EXCEL_FOLDER, list_workbooks
+
+POLL_SECONDS = float(os.environ.get('DLC_ANALYSIS_POLL_SECONDS', 60))
+ANALYSIS_WORKERS = int(os.environ.get('DLC_ANALYSIS_WORKERS', 1))
+
+
+def workbook_signature(excel_folder=EXCEL_FOLDER):
+    """[[name, size, mtime_ns], ...] for the workbooks in a folder ([] when it is missing)"""
+    if not os.path.isdir(excel_folder):
+        return []
+    signature = []
+    for path in list_workbooks(excel_folder):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        signature.append([os.path.basename(path), stat.st_size, stat.st_mtime_ns])
+    return signature
+
+
+def run_bank_pincode_analysis(file_paths):
+    """Default job: the incremental dlc_bank_pincode_analyzer computation"""
+    from dlc_bank_pincode_analyzer import compute_bank_pincode_data
+    return compute_bank_pincode_data(file_paths, workers=ANALYSIS_WORKERS)
+
+
+class AnalysisScheduler:
+    """Watches the workbooks and refreshes the store's analysis snapshot in the background"""
+
+    def __init__(self, store, excel_folder=EXCEL_FOLDER, interval=POLL_SECONDS,
+                 analyze=run_bank_pincode_analysis, on_swap=None):
+        self.store = store
+        self.excel_folder = excel_folder
+        self.interval = interval
+        self.analyze = analyze
+        self.on_swap = on_swap
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._pending = None
+        self._baseline = None
+        self._force = threading.Event()  # set by trigger() on request threads
+        self._status_lock = threading.Lock()
+        self._status = {
+            'state': 'stopped',
+            'runs': 0,
+            'failures': 0,
+            'last_started': None,
+            'last_finished': None,
+            'last_duration_seconds': None,
+            'last_error': None,
+            'snapshot': None,
+            'workbooks': 0,
+        }
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='analysis-scheduler', daemon=True)
+        self._update(state='idle')
+        self._thread.start()
+        print(f"⏱️ Analysis scheduler watching {self.excel_folder} every {self.interval:g}s")
+        return self
+
+    def stop(self, timeout=None):
+        self._stopped.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._update(state='stopped')
+
+    def trigger(self):
+        """Re-run the analysis at the next opportunity, even if no workbook changed"""
+        self._force.set()
+        self._wake.set()
+
+    def status(self):
+        with self._status_lock:
+            return dict(self._status)
+
+    def _update(self, **changes):
+        with self._status_lock:
+            self._status.update(changes)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.check()
+            except Exception as e:
+                # check() records job failures itself; this only guards the loop
+                print(f"❌ Analysis scheduler error: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def _current_signature(self, signature):
+        """Workbook signature the served analysis was built from"""
+        snapshot = self.store.get()
+        if snapshot is None:
+            return None
+        recorded = snapshot.aggregates.meta.get('workbooks')
+        if recorded is not None:
+            return recorded
+        if self._baseline is None:
+            self._baseline = signature
+        return self._baseline
+
+    def check(self):
+        """One poll: run the job if forced or if the workbooks changed and have settled"""
+        signature = workbook_signature(self.excel_folder)
+        self._update(workbooks=len(signature))
+        if self._force.is_set():
+            # Cleared before the run starts, so a trigger() arriving during it runs again
+            self._force.clear()
+        elif not signature or signature == self._current_signature(signature):
+            self._pending = None
+            return False
+        elif signature != self._pending:
+            # Changed since the last poll: wait until copies in progress have finished
+            self._pending = signature
+            return False
+        self._pending = None
+        return self.refresh(signature)
+
+    def refresh(self, signature):
+        """Run the analysis, write its snapshot and swap it in; returns True on success"""
+        started = time.perf_counter()
+        self._update(state='running', last_started=datetime.now().isoformat(timespec='seconds'))
+        print("🔄 Refreshing DLC analysis in the background...")
+        try:
+            file_paths = [os.path.join(self.excel_folder, name) for name, _, _ in signature]
+            bank_data, total_processed = self.analyze(file_paths)
+            meta = {
+                'analysis_timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'total_records_processed': total_processed,
+                'total_bank_pincodes': len(bank_data),
+                'total_dlc_completed': sum(data['total_dlc_completed'] for data in bank_data.values()),
+                'workbooks': signature,
+            }
+            name = f"{ANALYSIS_PREFIX}{datetime.now().strftime('%Y%m%d_%H%M%S')}{SNAPSHOT_SUFFIX}"
+            path = save_analysis_snapshot(bank_data, meta, os.path.join(self.store.analysis_dir, name))
+            snapshot = self.store.swap(path)
+            if self.on_swap:
+                self.on_swap(snapshot)
+        except Exception as e:
+            duration = time.perf_counter() - started
+            print(f"❌ Background analysis failed after {duration:.1f}s: {e}")
+            with self._status_lock:
+                self._status.update(state='failed', last_error=str(e), last_duration_seconds=round(duration, 3),
+                                    last_finished=datetime.now().isoformat(timespec='seconds'))
+                self._status['failures'] += 1
+            return False
+
+        duration = time.perf_counter() - started
+        print(f"✅ Background analysis swapped in {name} ({duration:.1f}s)")
+        with self._status_lock:
+            self._status.update(state='idle', last_error=None, last_duration_seconds=round(duration, 3),
+                                last_finished=datetime.now().isoformat(timespec='seconds'), snapshot=name)
+            self._status['runs'] += 1
+        return True
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Binary snapshot format for DLC bank-pincode analysis results
+A .dlcsnap file holds one PincodeAggregates as fixed-width column sections
+that are memory-mapped and read in place, instead of a JSON document every
+consumer has to parse whole.
+
+Layout (little-endian, sections aligned to 64 bytes):
+
+    header      magic 'DLCSNAP\\0', format version (u16), section count (u16),
+                reserved (u32), file size (u64)
+    sections    one entry per section: name (16s), NumPy dtype (8s),
+                rows (u64), columns (u64, 0 for 1-D), offset (u64), bytes (u64)
+    'labels'    UTF-8 JSON: age/state/district labels, odd pincodes, metadata
+    arrays      pincodes, totals, unique_counts, bank_states, districts,
+                age_counts, state_counts (see pincode_aggregates.py)
+
+Readers reject other magics, newer format versions and truncated files.
+Old snapshots are pruned by prune_snapshots (keeping SNAPSHOT_RETENTION).
+
+Convert existing JSON results with:
+
+    python analysis_snapshot.py [--keep N] [--remove-json] [dlc_bank_analysis_*.json ...]
+"""
+
+import argparse
+import glob
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from pincode_aggregates import ARRAY_FIELDS, PincodeAggregates
+
+SNAPSHOT_MAGIC = b'DLCSNAP\x00'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = '.dlcsnap'
+SNAPSHOT_RETENTION = int(os.environ.get('DLC_SNAPSHOT_RETENTION', 3))
+
+HEADER = struct.Struct('<8sHHIQ')
+SECTION = struct.Struct('<16s8sQQQQ')
+ALIGNMENT = 64
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_snapshot(aggregates, path):
+    """Write aggregates to path atomically (via a temp file and rename)"""
+    labels = json.dumps({
+        'age_labels': aggregates.age_labels,
+        'state_labels': aggregates.state_labels,
+        'district_labels': aggregates.district_labels,
+        'odd_pincodes': aggregates.odd_pincodes,
+        'meta': aggregates.meta,
+    }).encode()
+    sections = [('labels', np.frombuffer(labels, dtype=np.uint8))]
+    sections += [(field, np.ascontiguousarray(getattr(aggregates, field))) for field in ARRAY_FIELDS]
+
+    offset = _aligned(HEADER.size + SECTION.size * len(sections))
+    entries = []
+    for name, array in sections:
+        columns = array.shape[1] if array.ndim == 2 else 0
+        entries.append(SECTION.pack(name.encode(), array.dtype.str.encode(), array.shape[0], columns,
+                                    offset, array.nbytes))
+        offset = _aligned(offset + array.nbytes)
+    file_size = offset
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(sections), 0, file_size))
+        f.write(b''.join(entries))
+        for entry, (_, array) in zip(entries, sections):
+            f.seek(SECTION.unpack(entry)[4])
+            f.write(array.tobytes())
+        f.truncate(file_size)
+    os.replace(temp_path, path)
+    return path
+
+
+def read_snapshot(path):
+    """PincodeAggregates whose arrays are read-only views into the memory-mapped file"""
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(buffer) < HEADER.size:
+        raise ValueError(f"{path} is not a DLC snapshot (too short)")
+    magic, version, section_count, _, file_size = HEADER.unpack_from(buffer, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} is not a DLC snapshot")
+    if version > SNAPSHOT_VERSION:
+        raise ValueError(f"{path} is snapshot format v{version}; this reader supports up to v{SNAPSHOT_VERSION}")
+    if len(buffer) != file_size:
+        raise ValueError(f"{path} is truncated ({len(buffer)} of {file_size} bytes)")
+
+    arrays = {}
+    for index in range(section_count):
+        name, dtype, rows, columns, offset, nbytes = SECTION.unpack_from(buffer, HEADER.size + index * SECTION.size)
+        dtype = np.dtype(dtype.rstrip(b'\x00').decode())
+        array = np.frombuffer(buffer, dtype=dtype, count=nbytes // dtype.itemsize, offset=offset)
+        arrays[name.rstrip(b'\x00').decode()] = array.reshape((rows, columns)) if columns else array
+
+    labels = json.loads(arrays.pop('labels').tobytes())
+    return PincodeAggregates(arrays, labels['age_labels'], labels['state_labels'], labels['district_labels'],
+                             labels['odd_pincodes'], labels['meta'])
+
+
+def snapshot_path_for(json_path):
+    return os.path.splitext(json_path)[0] + SNAPSHOT_SUFFIX
+
+
+def snapshot_prefix(path):
+    """'dlc_bank_analysis_' for dlc_bank_analysis_20250825_120946.dlcsnap (the run timestamp is dropped)"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    parts = stem.rsplit('_', 2)
+    return parts[0] + '_' if len(parts) == 3 and parts[1].isdigit() and parts[2].isdigit() else stem
+
+
+def prune_snapshots(directory, prefix, keep=SNAPSHOT_RETENTION):
+    """Delete all but the newest `keep` prefix*.dlcsnap files (names sort by run timestamp)"""
+    snapshots = sorted(glob.glob(os.path.join(glob.escape(directory), f"{prefix}*{SNAPSHOT_SUFFIX}")))
+    removed = snapshots[:-keep] if keep > 0 else snapshots
+    for path in removed:
+        os.remove(path)
+        print(f"🧹 Removed old snapshot {os.path.basename(path)}")
+    return removed
+
+
+def save_analysis_snapshot(bank_data, meta, path, keep=SNAPSHOT_RETENTION):
+    """Write an analysis run's snapshot and apply the retention policy to its siblings"""
+    write_snapshot(PincodeAggregates.from_bank_pincode_data(bank_data, meta), path)
+    prune_snapshots(os.path.dirname(os.path.abspath(path)), snapshot_prefix(path), keep)
+    return path
+
+
+def load_analysis_data(path):
+    """Analysis results in the JSON document shape, from either a .dlcsnap or a .json file"""
+    if path.endswith(SNAPSHOT_SUFFIX):
+        aggregates = read_snapshot(path)
+        return dict(aggregates.meta, bank_pincode_data=aggregates.to_bank_pincode_data())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def convert_json(json_path, remove_json=False):
+    """Write the snapshot for an existing analysis JSON file"""
+    path = write_snapshot(PincodeAggregates.from_analysis_file(json_path), snapshot_path_for(json_path))
+    json_size, snapshot_size = os.path.getsize(json_path), os.path.getsize(path)
+    print(f"✅ {os.path.basename(json_path)} → {os.path.basename(path)} "
+          f"({json_size / 1e6:.1f} MB → {snapshot_size / 1e6:.1f} MB)")
+    if remove_json:
+        os.remove(json_path)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert DLC analysis JSON files to binary snapshots")
+    parser.add_argument('files', nargs='*',
+                        help="analysis JSON files (default: every dlc_bank_analysis_*.json next to this script)")
+    parser.add_argument('--keep', type=int, default=SNAPSHOT_RETENTION,
+                        help=f"snapshots to keep per analysis type (default: {SNAPSHOT_RETENTION})")
+    parser.add_argument('--remove-json', action='store_true', help="delete each JSON file once converted")
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(os.path.join(BACKEND_DIR, 'dlc_bank_analysis_*.json')))
+    if not files:
+        print("⚠️ No analysis JSON files found")
+    converted = [convert_json(path, args.remove_json) for path in files]
+    for directory, prefix in sorted({(os.path.dirname(os.path.abspath(path)), snapshot_prefix(path))
+                                     for path in converted}):
+        prune_snapshots(directory, prefix, args.keep)
+    print(f"\n💾 {len(converted)} snapshot(s) written")
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+In-process store for the latest DLC bank-pincode analysis
+Opens the newest dlc_bank_analysis_* result once and keeps it in memory
+until a newer or rewritten analysis file shows up (detected by directory and
+file mtime). Binary .dlcsnap snapshots are memory-mapped in place; legacy
+.json results are parsed once into a PincodeAggregates cached as .npz under
+CACHE_DIR/aggregates. A snapshot wins over a JSON file from the same run.
+"""
+
+import os
+import tempfile
+import threading
+from collections import defaultdict
+
+from analysis_snapshot import SNAPSHOT_SUFFIX, read_snapshot
+from excel_cache import CACHE_DIR
+from pincode_aggregates import PincodeAggregates
+from pincode_lookup import INVALID_PINCODE, OTHER_STATE
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+ANALYSIS_PREFIX = 'dlc_bank_analysis_'
+AGGREGATES_DIR = os.path.join(CACHE_DIR, 'aggregates')
+
+
+def build_state_wise_data(bank_pincode_data):
+    """Redistribute each bank pincode's pensioners (and age groups, proportionally) to their residence states"""
+    state_wise_data = defaultdict(lambda: {
+        'total_pensioners': 0,
+        'age_groups': defaultdict(int),
+        'bank_locations': defaultdict(int),
+        'pincode_counts': defaultdict(int)
+    })
+
+    for data in bank_pincode_data.values():
+        bank_state = data['state']  # Where the bank is located
+        total_bank_dlc = data['total_dlc_completed']
+
+        for pensioner_state, pensioner_count in data.get('pensioner_states', {}).items():
+            if not pensioner_state or pensioner_state in (INVALID_PINCODE, OTHER_STATE):
+                continue
+            state_data = state_wise_data[pensioner_state]
+            state_data['total_pensioners'] += pensioner_count
+            # Track which bank processed their DLC (for reference)
+            state_data['bank_locations'][bank_state] += pensioner_count
+            if total_bank_dlc > 0:
+                for age_group, age_count in data['age_groups'].items():
+                    state_data['age_groups'][age_group] += int((age_count * pensioner_count) / total_bank_dlc)
+
+    return {
+        state: {
+            'total_pensioners': data['total_pensioners'],
+            'age_groups': dict(data['age_groups']),
+            'bank_locations': dict(data['bank_locations']),
+            'pincode_counts': dict(data['pincode_counts'])
+        }
+        for state, data in state_wise_data.items()
+    }
+
+
+def load_aggregates(path, mtime_ns, aggregates_dir=AGGREGATES_DIR):
+    """PincodeAggregates for an analysis file, from the .npz cache when it is current"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    cache_path = os.path.join(aggregates_dir, f"{stem}-{mtime_ns}.npz")
+    if os.path.exists(cache_path):
+        return PincodeAggregates.load(cache_path)
+
+    aggregates = PincodeAggregates.from_analysis_file(path)
+    try:
+        os.makedirs(aggregates_dir, exist_ok=True)
+        for name in os.listdir(aggregates_dir):
+            if name.startswith(f"{stem}-"):
+                os.remove(os.path.join(aggregates_dir, name))
+        # A unique temp name per writer, so concurrent loads never share a half-written file
+        fd, temp_path = tempfile.mkstemp(prefix=f".{stem}-", suffix='.tmp', dir=aggregates_dir)
+        try:
+            os.close(fd)
+            aggregates.save(temp_path)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            os.remove(temp_path)
+            raise
+    except OSError as e:
+        # Read-only deployments (e.g. serverless) cannot write the cache
+        print(f"⚠️ Aggregates cache unavailable for {path}: {e}")
+    return aggregates
+
+
+class AnalysisSnapshot:
+    """One loaded analysis file; the response payload is built from it on demand"""
+
+    def __init__(self, path, mtime_ns, aggregates):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.aggregates = aggregates
+
+    @property
+    def payload(self):
+        """The /api/dlc-bank-pincode-data body as Python objects (built once per response cache entry)"""
+        state_final = self.aggregates.state_wise_data()
+        return {
+            'state_wise_data': state_final,
+            'bank_pincode_data': self.aggregates.to_bank_pincode_data(),
+            'total_records': len(self.aggregates),
+            'total_states': len(state_final),
+            'processed_at': self.aggregates.meta.get('analysis_timestamp', 'Unknown')
+        }
+
+    @property
+    def version(self):
+        """Identifies this data version for response caching"""
+        return (self.path, self.mtime_ns)
+
+
+class DlcAnalysisStore:
+    """Thread-safe holder of the latest AnalysisSnapshot, reloaded when the files change"""
+
+    def __init__(self, analysis_dir=BACKEND_DIR):
+        self.analysis_dir = analysis_dir
+        self._lock = threading.Lock()
+        self._dir_mtime_ns = None
+        self._snapshot = None
+
+    def _latest_file(self):
+        names = [f for f in os.listdir(self.analysis_dir)
+                 if f.startswith(ANALYSIS_PREFIX) and f.endswith(('.json', SNAPSHOT_SUFFIX))]
+        if not names:
+            return None
+        latest = max(names, key=lambda name: (os.path.splitext(name)[0], name.endswith(SNAPSHOT_SUFFIX)))
+        return os.path.join(self.analysis_dir, latest)
+
+    def _is_current(self, dir_mtime_ns):
+        snapshot = self._snapshot
+        if snapshot is None or dir_mtime_ns != self._dir_mtime_ns:
+            return False
+        try:
+            return os.stat(snapshot.path).st_mtime_ns == snapshot.mtime_ns
+        except FileNotFoundError:
+            return False
+
+    def get(self):
+        """Current snapshot, or None when there is no analysis file"""
+        dir_mtime_ns = os.stat(self.analysis_dir).st_mtime_ns
+        if self._is_current(dir_mtime_ns):
+            return self._snapshot
+
+        with self._lock:
+            if self._is_current(dir_mtime_ns):
+                return self._snapshot
+            latest = self._latest_file()
+            if latest is None:
+                self._snapshot = None
+            else:
+                self._snapshot = self._load(latest)
+            self._dir_mtime_ns = dir_mtime_ns
+            return self._snapshot
+
+    def swap(self, path):
+        """Load an analysis file and make it current in one step (used by the background scheduler)"""
+        snapshot = self._load(path)
+        with self._lock:
+            self._snapshot = snapshot
+            self._dir_mtime_ns = os.stat(self.analysis_dir).st_mtime_ns
+        return snapshot
+
+    def _load(self, path):
+        mtime_ns = os.stat(path).st_mtime_ns
+        print(f"📊 Loading DLC analysis from: {os.path.basename(path)}")
+        if path.endswith(SNAPSHOT_SUFFIX):
+            aggregates = read_snapshot(path)
+        else:
+            aggregates = load_aggregates(path, mtime_ns)
+        print(f"🏦 Loaded {len(aggregates)} bank pincodes ({aggregates.nbytes / 1e6:.1f} MB of counts)")
+        return AnalysisSnapshot(path, mtime_ns, aggregates)
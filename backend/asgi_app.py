@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+ASGI serving mode for the pension dashboard API
+Serves the Flask app from app.py, so every route is the same, under an ASGI
+server instead of the single-threaded development servers:
+
+    uvicorn asgi_app:application --host 0.0.0.0 --port 5000
+
+a2wsgi's WSGIMiddleware runs each request's Flask handler (SQLite queries,
+Excel parsing, JSON encoding) on a bounded thread pool (DLC_ASGI_THREADS,
+default 16), so a slow /pensioners parse no longer holds up the other
+dashboard requests, and hands streamed responses to the event loop chunk by
+chunk.
+
+On startup the database is prepared as in `python app.py` and, unless
+DLC_ANALYSIS_SCHEDULER=0, the background analysis scheduler is started.
+"""
+
+import asyncio
+import os
+
+from a2wsgi import WSGIMiddleware
+
+ASGI_THREADS = int(os.environ.get('DLC_ASGI_THREADS', 16))
+
+
+class LifespanHooks:
+    """Runs blocking startup/shutdown hooks on ASGI lifespan events (WSGIMiddleware only acknowledges them)"""
+
+    def __init__(self, app, on_startup=None, on_shutdown=None):
+        self.app = app
+        self.on_startup = on_startup
+        self.on_shutdown = on_shutdown
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'lifespan':
+            return await self.app(scope, receive, send)
+
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await receive()
+            hook = self.on_startup if message['type'] == 'lifespan.startup' else self.on_shutdown
+            try:
+                if hook:
+                    await loop.run_in_executor(None, hook)
+            except Exception as e:
+                await send({'type': f"{message['type']}.failed", 'message': str(e)})
+                return
+            await send({'type': f"{message['type']}.complete"})
+            if message['type'] == 'lifespan.shutdown':
+                return
+
+
+def create_application():
+    import app as dashboard
+
+    def startup():
+        dashboard.prepare_data()
+        if dashboard.analysis_scheduler_enabled():
+            dashboard.analysis_scheduler.start()
+        print("🚀 Pension Management System ASGI backend started")
+
+    def shutdown():
+        dashboard.analysis_scheduler.stop(timeout=5)
+
+    return LifespanHooks(WSGIMiddleware(dashboard.app, workers=ASGI_THREADS),
+                         on_startup=startup, on_shutdown=shutdown)
+
+
+application = create_application()
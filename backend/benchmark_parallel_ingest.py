@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark: serial vs multi-process workbook ingestion
+Times collect_key_counts over the GAD_DLC_PINCODE_DATA workbooks with one
+process and with a worker pool, checks both produce the same analysis,
+and reports the speedup.
+
+Usage:
+    python benchmark_parallel_ingest.py --workers 4
+    python benchmark_parallel_ingest.py --workers 4 --copies 5   # repeat each workbook 5x
+"""
+
+import argparse
+import os
+import time
+
+from dlc_bank_pincode_analyzer import build_bank_pincode_data, collect_key_counts
+from excel_cache import EXCEL_FOLDER, list_workbooks
+
+
+def time_run(file_paths, workers):
+    """Wall-clock seconds and merged key counts for one ingestion pass"""
+    start = time.perf_counter()
+    key_counts = collect_key_counts(file_paths, workers=workers)
+    return time.perf_counter() - start, key_counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial vs parallel ingestion benchmark")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--copies', type=int, default=1,
+                        help="process every workbook this many times to simulate more files")
+    parser.add_argument('--folder', default=EXCEL_FOLDER)
+    args = parser.parse_args()
+
+    file_paths = list_workbooks(args.folder) * args.copies
+    if not file_paths:
+        print(f"❌ No workbooks found in {args.folder}")
+        return
+
+    print("⏱️  PARALLEL INGESTION BENCHMARK")
+    print("=" * 60)
+    print(f"📁 Workbooks: {len(file_paths)} | Workers: {args.workers}")
+
+    serial_seconds, serial_counts = time_run(file_paths, workers=1)
+    parallel_seconds, parallel_counts = time_run(file_paths, workers=args.workers)
+
+    # Partial counters are merged associatively, so completion order must not matter
+    same_result = build_bank_pincode_data(serial_counts) == build_bank_pincode_data(parallel_counts)
+
+    print("\n" + "=" * 60)
+    print(f"🐢 Serial:   {serial_seconds:8.2f}s")
+    print(f"🚀 Parallel: {parallel_seconds:8.2f}s ({args.workers} workers)")
+    print(f"📈 Speedup:  {serial_seconds / parallel_seconds:8.2f}x")
+    print(f"✅ Identical results: {same_result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+State-wise verification chart race
+Builds the month-by-month series served by /api/analytics/bar-chart-race-data
+and can render it to a video. Rendering needs the optional bar_chart_race
+package (and the matplotlib it pulls in); it is imported only by render_race,
+so the API never loads it.
+
+    python chart_race.py state_race.mp4
+"""
+
+import random
+import sys
+
+# Simulated 12 months of data
+RACE_MONTHS = ['2024-01', '2024-02', '2024-03', '2024-04', '2024-05', '2024-06',
+               '2024-07', '2024-08', '2024-09', '2024-10', '2024-11', '2024-12']
+RACE_TITLE = 'State-wise Pension Verifications Over Time'
+
+
+def race_data(results, months=RACE_MONTHS):
+    """{month: {state: verifications}} from (state, total, verified) rows, simulating growth over time"""
+    data = {}
+    for month in months:
+        data[month] = {}
+        for state, total, verified in results:
+            growth_factor = 1 + (months.index(month) * 0.1)
+            data[month][state] = int(verified * growth_factor * random.uniform(0.8, 1.2))
+    return data
+
+
+def render_race(data, filename, title=RACE_TITLE):
+    """Render a race_data() series to a video file with bar_chart_race"""
+    try:
+        import bar_chart_race as bcr
+    except ImportError:
+        raise ImportError("Rendering the chart race needs bar_chart_race: pip install bar-chart-race")
+    import pandas as pd
+
+    df = pd.DataFrame.from_dict(data, orient='index').fillna(0)
+    bcr.bar_chart_race(df=df, filename=filename, title=title)
+    return filename
+
+
+if __name__ == "__main__":
+    import dashboard_queries as q
+    from db_pool import connect
+
+    filename = sys.argv[1] if len(sys.argv) > 1 else 'state_race.mp4'
+    conn = connect('pension_data.db')
+    try:
+        results = conn.execute(q.BAR_CHART_RACE).fetchall()
+    finally:
+        conn.close()
+    print(f"🎬 Rendering {len(results)} states over {len(RACE_MONTHS)} months...")
+    print(f"✅ Saved {render_race(race_data(results), filename)}")
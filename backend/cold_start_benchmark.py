@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the serverless API
+Starts a fresh interpreter per run, as a new function instance would, and
+times importing api/index.py and answering one first request through Flask's
+test client. Also records which heavy modules that left imported: every
+route measured here answers from committed artifacts, so none of them may
+need pandas, and only /geo/pincodes may load NumPy (for its memory-mapped
+index).
+
+    python cold_start_benchmark.py                 # report
+    python cold_start_benchmark.py --check         # exit 1 if over budget
+
+Budgets default to IMPORT_BUDGET_MS / FIRST_RESPONSE_BUDGET_MS and can be
+overridden with DLC_COLD_IMPORT_BUDGET_MS / DLC_COLD_RESPONSE_BUDGET_MS.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+API_DIR = os.path.join(REPO_ROOT, 'api')
+
+# Routes a dashboard load hits first; all of them answer from committed artifacts
+COLD_START_PATHS = [
+    '/api/dashboard/stats',
+    '/api/dashboard/age-distribution',
+    '/api/dashboard/state-wise-data',
+    '/api/pensioners?page=1&per_page=50',
+    '/india.json',
+    '/Filtered_Pincode_Boundaries.geojson',
+    '/geo/pincodes?state=Delhi',
+    '/topo/india.json?zoom=5',
+]
+
+HEAVY_MODULES = ['pandas', 'numpy', 'openpyxl', 'pyarrow']
+
+# Heavy modules a route may import: the tile index is a memory-mapped .npy
+ALLOWED_HEAVY_MODULES = {'/geo/pincodes': ['numpy']}
+
+IMPORT_BUDGET_MS = float(os.environ.get('DLC_COLD_IMPORT_BUDGET_MS', 400))
+FIRST_RESPONSE_BUDGET_MS = float(os.environ.get('DLC_COLD_RESPONSE_BUDGET_MS', 100))
+# Importing NumPy alone takes most of the first-response budget
+ROUTE_RESPONSE_BUDGET_FACTORS = {'/geo/pincodes': 2.5}
+
+PROBE = """
+import hashlib, json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {api_dir!r})
+import index
+imported = time.perf_counter()
+response = index.app.test_client().get({path!r}, headers={headers!r})
+body = response.get_data()
+answered = time.perf_counter()
+print(json.dumps({{
+    'status': response.status_code,
+    'import_ms': (imported - started) * 1000,
+    'first_response_ms': (answered - imported) * 1000,
+    'heavy_modules': [name for name in {heavy!r} if name in sys.modules],
+    'headers': dict(response.headers),
+    'body_sha256': hashlib.sha256(body).hexdigest(),
+}}))
+"""
+
+
+def probe(path, headers=None):
+    """One cold start in a new interpreter: timings, heavy imports, status, headers and body hash"""
+    if headers is None:
+        headers = {'Accept-Encoding': 'gzip'}
+    code = PROBE.format(api_dir=API_DIR, path=path, headers=headers, heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(paths=COLD_START_PATHS, runs=5, summarize=statistics.median):
+    """{path: import_ms, first_response_ms (median of the runs by default), statuses and heavy modules seen}"""
+    results = {}
+    for path in paths:
+        samples = [probe(path) for _ in range(runs)]
+        results[path] = {
+            'import_ms': summarize([s['import_ms'] for s in samples]),
+            'first_response_ms': summarize([s['first_response_ms'] for s in samples]),
+            'statuses': sorted({s['status'] for s in samples}),
+            'heavy_modules': sorted({name for s in samples for name in s['heavy_modules']}),
+        }
+    return results
+
+
+def unexpected_heavy_modules(path, heavy_modules):
+    """Heavy modules a route imported beyond those ALLOWED_HEAVY_MODULES grants it"""
+    allowed = ALLOWED_HEAVY_MODULES.get(path.split('?')[0], [])
+    return [name for name in heavy_modules if name not in allowed]
+
+
+def budget_failures(results, import_budget=IMPORT_BUDGET_MS, response_budget=FIRST_RESPONSE_BUDGET_MS):
+    """Human-readable list of everything over budget (empty when the cold start is within it)"""
+    failures = []
+    for path, result in results.items():
+        unexpected = unexpected_heavy_modules(path, result['heavy_modules'])
+        route_budget = response_budget * ROUTE_RESPONSE_BUDGET_FACTORS.get(path.split('?')[0], 1)
+        if result['import_ms'] > import_budget:
+            failures.append(f"{path}: import {result['import_ms']:.0f} ms > {import_budget:.0f} ms")
+        if result['first_response_ms'] > route_budget:
+            failures.append(f"{path}: first response {result['first_response_ms']:.0f} ms > {route_budget:.0f} ms")
+        if unexpected:
+            failures.append(f"{path}: imported {', '.join(unexpected)}")
+        if result['statuses'] != [200]:
+            failures.append(f"{path}: status {result['statuses']}")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure serverless cold-start import and first-response time")
+    parser.add_argument('--runs', type=int, default=5, help="fresh interpreters per route (default: 5)")
+    parser.add_argument('--check', action='store_true', help="exit 1 if any route is over budget")
+    args = parser.parse_args()
+
+    results = run_benchmark(runs=args.runs)
+    print(f"\n{'route':40} {'import ms':>10} {'first resp ms':>14}  heavy imports")
+    print("-" * 84)
+    for path, result in results.items():
+        print(f"{path:40} {result['import_ms']:10.1f} {result['first_response_ms']:14.1f}  "
+              f"{', '.join(result['heavy_modules']) or '-'}")
+    print(f"\n🎯 Budget: import {IMPORT_BUDGET_MS:.0f} ms, first response {FIRST_RESPONSE_BUDGET_MS:.0f} ms")
+
+    failures = budget_failures(results)
+    for failure in failures:
+        print(f"❌ {failure}")
+    if args.check:
+        sys.exit(1 if failures else 0)
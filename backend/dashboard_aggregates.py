@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Precomputed dashboard aggregates for the serverless API
+Streams every row of every workbook once, offline, and writes the exact
+totals behind /api/dashboard/stats, /age-distribution and /state-wise-data
+to one small JSON artifact that is committed and deployed with api/index.py.
+A request then only reads that file (re-parsed when it changes), so the
+numbers cover all rows, never change between refreshes and can be cached
+by ETag. The artifact also holds the rows /api/pensioners pages through
+(the first PENSIONER_SAMPLE_ROWS of the first PENSIONER_SAMPLE_FILES
+workbooks), so that route does not parse a workbook either.
+
+Workbooks without a State column get each row's state from its
+PENSIONER_PINCODE. Status and Amount totals are counted only from those
+columns; where a workbook lacks them they stay 0 rather than being estimated.
+
+Rebuild after changing the workbooks with:
+    python dashboard_aggregates.py
+and check that the committed artifact still matches them with:
+    python dashboard_aggregates.py --check
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime
+
+# The read side is imported on serverless cold starts, so the build's pandas and
+# NumPy dependencies are only imported by the build functions
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+EXCEL_FOLDER = os.path.join(REPO_ROOT, 'XLSx data')
+
+DASHBOARD_AGGREGATES = os.environ.get('DLC_DASHBOARD_AGGREGATES', os.path.join(REPO_ROOT, 'dashboard_aggregates.json'))
+AGGREGATES_VERSION = 2
+
+AGGREGATE_COLUMNS = ['Age', 'YOB', 'State', 'PENSIONER_PINCODE', 'Status', 'Amount']
+
+# /api/pensioners pages through the first rows of the first workbooks
+PENSIONER_SAMPLE_FILES = 2
+PENSIONER_SAMPLE_ROWS = 1000
+PENSIONER_COLUMNS = ['Name', 'Age', 'State', 'Status', 'Amount']
+
+# Per-state accumulator slots
+TOTAL, VERIFIED, PENDING, AMOUNT_SUM, AMOUNT_COUNT = range(5)
+
+
+def workbook_fingerprint(file_path):
+    """Name, size and content hash of a workbook (stable across checkouts, unlike mtime)"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return {'name': os.path.basename(file_path), 'size': os.path.getsize(file_path), 'sha256': digest.hexdigest()}
+
+
+def source_fingerprints(excel_folder=EXCEL_FOLDER):
+    from excel_cache import list_workbooks
+    return [workbook_fingerprint(path) for path in list_workbooks(excel_folder)]
+
+
+def _batch_states(frame):
+    """State of each row: the State column when present, else derived from PENSIONER_PINCODE"""
+    if 'State' in frame.columns:
+        return frame['State'].astype(object).fillna('Unknown').to_numpy()
+    if 'PENSIONER_PINCODE' in frame.columns:
+        from pincode_lookup import states_for_pincodes
+        return states_for_pincodes(frame['PENSIONER_PINCODE'].to_numpy())
+    return None
+
+
+def _json_values(series):
+    """Column values as JSON scalars, with missing values as None"""
+    import pandas as pd
+
+    if series.name in ('Age', 'Amount'):
+        series = pd.to_numeric(series, errors='coerce')
+    return [None if pd.isna(value) else value for value in series.astype(object).tolist()]
+
+
+def pensioner_sample(file_paths):
+    """{'total': rows, 'columns': {column: values}} for the rows /api/pensioners pages through
+
+    Only the PENSIONER_COLUMNS a workbook has are stored; the route fills in the rest.
+    """
+    import pandas as pd
+
+    from excel_cache import iter_workbook_batches
+
+    frames = []
+    for path in file_paths[:PENSIONER_SAMPLE_FILES]:
+        batches = iter_workbook_batches(path, columns=PENSIONER_COLUMNS, batch_size=PENSIONER_SAMPLE_ROWS)
+        try:
+            frames.append(next(batches, pd.DataFrame()))
+        finally:
+            batches.close()
+    sample = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return {
+        'total': len(sample),
+        'columns': {column: _json_values(sample[column]) for column in PENSIONER_COLUMNS if column in sample.columns},
+    }
+
+
+def build_dashboard_aggregates(excel_folder=EXCEL_FOLDER, current_year=None):
+    """Exact dashboard totals over all rows of all workbooks in a folder"""
+    import numpy as np
+
+    from dataset_cache import AGE_GROUPS, prepare_frame
+    from excel_cache import iter_workbook_batches, list_workbooks
+
+    current_year = current_year or datetime.now().year
+    sources = []
+    total_rows = 0
+    totals = np.zeros(5)
+    age_counts = np.zeros(len(AGE_GROUPS), dtype=np.int64)
+    states = {}
+
+    for path in list_workbooks(excel_folder):
+        fingerprint = workbook_fingerprint(path)
+        rows = 0
+        for batch in iter_workbook_batches(path, columns=AGGREGATE_COLUMNS):
+            frame = prepare_frame(batch, current_year)
+            n = len(frame)
+            rows += n
+
+            verified = (frame['Status'] == 'Verified').to_numpy(dtype=bool) if 'Status' in frame.columns else np.zeros(n, dtype=bool)
+            pending = (frame['Status'] == 'Pending').to_numpy(dtype=bool) if 'Status' in frame.columns else np.zeros(n, dtype=bool)
+            amounts = frame['Amount'].to_numpy(dtype=float) if 'Amount' in frame.columns else np.full(n, np.nan)
+            has_amount = ~np.isnan(amounts)
+            values = np.column_stack([np.ones(n), verified, pending, np.where(has_amount, amounts, 0.0), has_amount])
+            totals += values.sum(axis=0)
+
+            age_counts += frame['age_group'].value_counts().reindex(AGE_GROUPS, fill_value=0).to_numpy()
+
+            row_states = _batch_states(frame)
+            if row_states is not None and n:
+                names, inverse = np.unique(row_states.astype(str), return_inverse=True)
+                sums = np.zeros((len(names), 5))
+                np.add.at(sums, inverse.ravel(), values)
+                for name, state_sums in zip(names.tolist(), sums):
+                    states[name] = states.get(name, np.zeros(5)) + state_sums
+
+        fingerprint['rows'] = rows
+        sources.append(fingerprint)
+        total_rows += rows
+        print(f"✅ {fingerprint['name']}: {rows:,} rows")
+
+    generated_at = datetime.now().isoformat(timespec='seconds')
+    state_wise = [
+        {
+            'state': name,
+            'totalPensioners': int(sums[TOTAL]),
+            'verified': int(sums[VERIFIED]),
+            'pending': int(sums[PENDING]),
+            'avgAmount': round(sums[AMOUNT_SUM] / sums[AMOUNT_COUNT], 2) if sums[AMOUNT_COUNT] else 0,
+        }
+        for name, sums in states.items()
+    ]
+    state_wise.sort(key=lambda item: (-item['totalPensioners'], item['state']))
+
+    return {
+        'version': AGGREGATES_VERSION,
+        'generated_at': generated_at,
+        'pensioners': pensioner_sample(list_workbooks(excel_folder)),
+        'reference_year': current_year,
+        'sources': sources,
+        'stats': {
+            'totalPensioners': int(total_rows),
+            'verifiedThisMonth': int(totals[VERIFIED]),
+            'pendingVerifications': int(totals[PENDING]),
+            'totalAmount': round(float(totals[AMOUNT_SUM]), 2),
+            'lastUpdated': generated_at,
+        },
+        'age_distribution': [{'ageGroup': group, 'count': int(count)} for group, count in zip(AGE_GROUPS, age_counts)],
+        'state_wise': state_wise,
+    }
+
+
+def write_dashboard_aggregates(aggregates, path=DASHBOARD_AGGREGATES):
+    """Write the artifact atomically, with sorted keys so rebuilds diff cleanly"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(aggregates, f, indent=1, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp_path, path)
+    return path
+
+
+class DashboardAggregates:
+    """Read side: the artifact's sections, re-read only when the file changes"""
+
+    def __init__(self, path=DASHBOARD_AGGREGATES, excel_folder=EXCEL_FOLDER):
+        self.path = path
+        self.excel_folder = excel_folder
+        self._lock = threading.Lock()
+        self._stat = None
+        self._data = None
+        self.etag = None
+
+    def _ensure_built(self):
+        if os.path.exists(self.path):
+            return
+        print(f"⚠️ {self.path} not found, building dashboard aggregates from {self.excel_folder}")
+        aggregates = build_dashboard_aggregates(self.excel_folder)
+        try:
+            write_dashboard_aggregates(aggregates, self.path)
+        except OSError:
+            # Read-only deployments (e.g. serverless) build into a temp directory instead
+            self.path = os.path.join(tempfile.gettempdir(), os.path.basename(self.path))
+            write_dashboard_aggregates(aggregates, self.path)
+
+    def get(self, section):
+        """One section of the artifact ('stats', 'age_distribution', 'state_wise', 'pensioners') and its ETag"""
+        with self._lock:
+            self._ensure_built()
+            stat = os.stat(self.path)
+            if (stat.st_size, stat.st_mtime_ns) != self._stat:
+                with open(self.path, 'rb') as f:
+                    raw = f.read()
+                data = json.loads(raw)
+                if data.get('version') != AGGREGATES_VERSION:
+                    raise ValueError(f"Unsupported dashboard aggregates version: {data.get('version')}")
+                self._data = data
+                self.etag = hashlib.sha256(raw).hexdigest()[:16]
+                self._stat = (stat.st_size, stat.st_mtime_ns)
+            return self._data[section], self.etag
+
+
+def is_current(path=DASHBOARD_AGGREGATES, excel_folder=EXCEL_FOLDER):
+    """Whether the artifact was built from exactly the workbooks in the folder"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return False
+    recorded = [{key: source[key] for key in ('name', 'size', 'sha256')} for source in data.get('sources', [])]
+    return data.get('version') == AGGREGATES_VERSION and recorded == source_fingerprints(excel_folder)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the dashboard aggregates artifact from the workbooks")
+    parser.add_argument('--excel-folder', default=EXCEL_FOLDER)
+    parser.add_argument('--output', default=DASHBOARD_AGGREGATES)
+    parser.add_argument('--check', action='store_true', help="exit 1 if the artifact is missing or out of date")
+    args = parser.parse_args()
+
+    if args.check:
+        if is_current(args.output, args.excel_folder):
+            print(f"✅ {args.output} matches the workbooks")
+            sys.exit(0)
+        print(f"❌ {args.output} is missing or out of date, rebuild with: python dashboard_aggregates.py")
+        sys.exit(1)
+
+    print("📊 DASHBOARD AGGREGATES BUILD")
+    print("=" * 60)
+    aggregates = build_dashboard_aggregates(args.excel_folder)
+    path = write_dashboard_aggregates(aggregates, args.output)
+    print(f"\n💾 {aggregates['stats']['totalPensioners']:,} rows, {len(aggregates['state_wise'])} states "
+          f"→ {path} ({os.path.getsize(path) / 1024:.1f} KB)")
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+SQL used by the dashboard and pensioner routes in app.py
+Kept in one place so the EXPLAIN QUERY PLAN regression test checks exactly
+the statements the API runs. Dashboard aggregates read the summary_* tables
+(see summary_tables.py); only pensioner listings touch the pensioners table.
+"""
+
+AGE_GROUP_CASE = """
+            CASE
+                WHEN age BETWEEN 60 AND 65 THEN '60-65'
+                WHEN age BETWEEN 66 AND 70 THEN '66-70'
+                WHEN age BETWEEN 71 AND 75 THEN '71-75'
+                WHEN age BETWEEN 76 AND 80 THEN '76-80'
+                ELSE '80+'
+            END"""
+
+STATS_TOTAL = "SELECT COALESCE(SUM(pensioners), 0) FROM summary_verification_daily"
+
+STATS_VERIFIED_THIS_MONTH = """
+        SELECT COALESCE(SUM(pensioners), 0) FROM summary_verification_daily
+        WHERE status = 'Verified' AND last_verification >= date('now', '-30 days')
+    """
+
+STATS_PENDING = "SELECT COALESCE(SUM(pensioners), 0) FROM summary_verification_daily WHERE status = 'Pending'"
+
+STATS_TOTAL_AMOUNT = "SELECT SUM(amount_total) FROM summary_verification_daily WHERE status = 'Verified'"
+
+AGE_DISTRIBUTION = f"""
+        SELECT {AGE_GROUP_CASE} as age_group,
+            SUM(pensioners) as count
+        FROM summary_auth_age
+        GROUP BY age_group
+        ORDER BY age_group
+    """
+
+STATE_WISE = """
+        SELECT
+            state,
+            SUM(pensioners) as total_pensioners,
+            SUM(CASE WHEN status = 'Verified' THEN pensioners ELSE 0 END) as verified,
+            SUM(CASE WHEN status = 'Pending' THEN pensioners ELSE 0 END) as pending,
+            ROUND(SUM(amount_total) / SUM(amount_count), 2) as avg_amount
+        FROM summary_state_status
+        GROUP BY state
+        ORDER BY total_pensioners DESC
+    """
+
+AUTH_METHODS_BASE = f"""
+        SELECT
+            authentication_method,
+            SUM(pensioners) as count,{AGE_GROUP_CASE} as age_group
+        FROM summary_auth_age
+        WHERE authentication_method IS NOT NULL
+    """
+
+# Extra WHERE clause for each ?age_group= value of /api/dashboard/authentication-methods
+AUTH_METHODS_AGE_FILTERS = {
+    '60-65': " AND age BETWEEN 60 AND 65",
+    '66-70': " AND age BETWEEN 66 AND 70",
+    '71-75': " AND age BETWEEN 71 AND 75",
+    '76-80': " AND age BETWEEN 76 AND 80",
+    '80+': " AND age > 80",
+}
+
+AUTH_METHODS_GROUP = " GROUP BY authentication_method, age_group ORDER BY authentication_method"
+
+AUTH_METHODS_TOTAL = "SELECT COALESCE(SUM(pensioners), 0) FROM summary_auth_age WHERE authentication_method IS NOT NULL"
+
+VERIFICATION_LOCATIONS = """
+        SELECT
+            district,
+            state,
+            SUM(pensioners) as total,
+            SUM(CASE WHEN status = 'Verified' THEN pensioners ELSE 0 END) as verified,
+            SUM(CASE WHEN status = 'Pending' THEN pensioners ELSE 0 END) as pending
+        FROM summary_district_status
+        GROUP BY district, state
+        HAVING total > 5
+        ORDER BY total DESC
+        LIMIT 50
+    """
+
+BAR_CHART_RACE = """
+        SELECT
+            state,
+            SUM(pensioners) as total_pensioners,
+            SUM(CASE WHEN status = 'Verified' THEN pensioners ELSE 0 END) as verified
+        FROM summary_state_status
+        GROUP BY state
+        ORDER BY total_pensioners DESC
+        LIMIT 10
+    """
+
+# /api/pensioners pages, newest first. id breaks created_at ties (a bulk load
+# stamps every row with the same timestamp) and, being the rowid, is already the
+# trailing key of idx_pensioners_created / idx_pensioners_status_created, so the
+# keyset (after=...) variants seek straight to the page without a sort.
+PENSIONERS_ORDER = " ORDER BY created_at DESC, id DESC LIMIT ?"
+
+PENSIONERS_PAGE = "SELECT * FROM pensioners" + PENSIONERS_ORDER + " OFFSET ?"
+
+PENSIONERS_PAGE_BY_STATUS = "SELECT * FROM pensioners WHERE status = ?" + PENSIONERS_ORDER + " OFFSET ?"
+
+PENSIONERS_AFTER = "SELECT * FROM pensioners WHERE (created_at, id) < (?, ?)" + PENSIONERS_ORDER
+
+PENSIONERS_AFTER_BY_STATUS = (
+    "SELECT * FROM pensioners WHERE status = ? AND (created_at, id) < (?, ?)" + PENSIONERS_ORDER
+)
+
+# Totals for /api/pensioners come from the summary counts rather than COUNT(*)
+PENSIONERS_TOTAL = STATS_TOTAL
+
+PENSIONERS_TOTAL_BY_STATUS = "SELECT COALESCE(SUM(pensioners), 0) FROM summary_verification_daily WHERE status = ?"
+
+
+def auth_methods_query(age_group=None):
+    """Authentication-method breakdown SQL, optionally limited to one age group"""
+    return AUTH_METHODS_BASE + AUTH_METHODS_AGE_FILTERS.get(age_group or '', '') + AUTH_METHODS_GROUP
+
+
+def dashboard_queries():
+    """name → (sql, sample params) for every statement the dashboard routes run"""
+    queries = {
+        'stats_total': (STATS_TOTAL, ()),
+        'stats_verified_this_month': (STATS_VERIFIED_THIS_MONTH, ()),
+        'stats_pending': (STATS_PENDING, ()),
+        'stats_total_amount': (STATS_TOTAL_AMOUNT, ()),
+        'age_distribution': (AGE_DISTRIBUTION, ()),
+        'state_wise': (STATE_WISE, ()),
+        'auth_methods': (auth_methods_query(), ()),
+        'auth_methods_total': (AUTH_METHODS_TOTAL, ()),
+        'verification_locations': (VERIFICATION_LOCATIONS, ()),
+        'bar_chart_race': (BAR_CHART_RACE, ()),
+        'pensioners_page': (PENSIONERS_PAGE, (50, 0)),
+        'pensioners_page_by_status': (PENSIONERS_PAGE_BY_STATUS, ('Verified', 50, 0)),
+        'pensioners_after': (PENSIONERS_AFTER, ('2025-01-01 00:00:00', 1000, 50)),
+        'pensioners_after_by_status': (PENSIONERS_AFTER_BY_STATUS, ('Verified', '2025-01-01 00:00:00', 1000, 50)),
+        'pensioners_total_by_status': (PENSIONERS_TOTAL_BY_STATUS, ('Verified',)),
+    }
+    for age_group in AUTH_METHODS_AGE_FILTERS:
+        queries[f"auth_methods_{age_group}"] = (auth_methods_query(age_group), ())
+    return queries
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Process-level cache of the pensioner workbooks for the serverless API
+Loads only the columns the api/index.py routes use, once per process, and
+keeps one typed DataFrame per workbook until that file's mtime (or the set
+of workbooks) changes. Text columns with few distinct values are stored as
+categoricals, and each row's age band is derived once at load time so routes
+can answer with vectorized group-bys instead of per-row Python loops.
+"""
+
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from excel_cache import load_workbook
+
+DATASET_COLUMNS = ['Name', 'Age', 'YOB', 'State', 'Status', 'Amount']
+CATEGORICAL_COLUMNS = ['State', 'Status']
+NUMERIC_COLUMNS = ['Age', 'YOB', 'Amount']
+
+AGE_GROUPS = ['60-65', '66-70', '71-75', '76-80', '80+']
+
+
+def age_group_column(ages):
+    """Age band of each age (same bounds as the dashboard's 60-65 ... 80+; NaN outside them)"""
+    codes = np.select(
+        [(ages >= 60) & (ages <= 65), (ages >= 66) & (ages <= 70), (ages >= 71) & (ages <= 75),
+         (ages >= 76) & (ages <= 80), ages > 80],
+        range(len(AGE_GROUPS)), default=-1)
+    return pd.Categorical.from_codes(codes, categories=AGE_GROUPS)
+
+
+def prepare_frame(df, current_year=None):
+    """Type the loaded columns and add the derived 'age_group' column"""
+    df = df.copy()
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    for column in NUMERIC_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors='coerce')
+
+    if 'Age' in df.columns:
+        ages = df['Age'].to_numpy(dtype=float)
+    elif 'YOB' in df.columns:
+        current_year = current_year or datetime.now().year
+        ages = current_year - np.trunc(df['YOB'].to_numpy(dtype=float))
+    else:
+        ages = np.full(len(df), np.nan)
+    df['age_group'] = age_group_column(ages)
+    return df
+
+
+class WorkbookDataset:
+    """Typed per-workbook frames for a folder of .xlsx files, reloaded by mtime"""
+
+    def __init__(self, folder, columns=DATASET_COLUMNS):
+        self.folder = folder
+        self.columns = columns
+        self._lock = threading.Lock()
+        self._frames = {}  # name -> (mtime_ns, DataFrame)
+
+    def _workbooks(self):
+        names = sorted(f for f in os.listdir(self.folder) if f.endswith('.xlsx') and not f.startswith('~$'))
+        return [(name, os.stat(os.path.join(self.folder, name)).st_mtime_ns) for name in names]
+
+    def frames(self):
+        """[(workbook name, DataFrame)] for every workbook, loading only new or modified ones"""
+        workbooks = self._workbooks()
+        if all(self._frames.get(name, (None,))[0] == mtime_ns for name, mtime_ns in workbooks) \
+                and len(workbooks) == len(self._frames):
+            return [(name, self._frames[name][1]) for name, _ in workbooks]
+
+        with self._lock:
+            frames = {}
+            for name, mtime_ns in workbooks:
+                cached = self._frames.get(name)
+                if cached is None or cached[0] != mtime_ns:
+                    df = load_workbook(os.path.join(self.folder, name), columns=self.columns)
+                    cached = (mtime_ns, prepare_frame(df))
+                frames[name] = cached
+            self._frames = frames
+            return [(name, frames[name][1]) for name, _ in workbooks]
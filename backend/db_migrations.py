@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations for pension_data.db
+Each migration runs once, inside a transaction, and is recorded in the
+schema_migrations table. Add new migrations to the end of MIGRATIONS with the
+next version number; never edit one that has shipped. A migration step is
+either a SQL statement or a callable that receives the connection.
+
+The source_data row records which workbooks (name, size, mtime) the
+pensioners table was loaded from and at which schema version, so a restart
+reuses the database unless the workbooks or the schema changed since.
+"""
+
+import json
+import os
+
+from summary_tables import SUMMARY_SCHEMA, rebuild_summaries
+
+# Secondary indexes on pensioners, by name. Migration 1 creates them; bulk_loader
+# drops them for a load and restores them from here afterwards, and startup
+# re-creates any that an interrupted load left missing
+PENSIONER_INDEXES = {
+    # /api/dashboard/stats: status filters, 30-day window and SUM(amount), index-only
+    'idx_pensioners_status_verification':
+        "CREATE INDEX IF NOT EXISTS idx_pensioners_status_verification "
+        "ON pensioners (status, last_verification, amount)",
+    # /api/dashboard/state-wise-data and bar-chart-race: GROUP BY state over status/amount
+    'idx_pensioners_state_status':
+        "CREATE INDEX IF NOT EXISTS idx_pensioners_state_status "
+        "ON pensioners (state, status, amount)",
+    # /api/dashboard/verification-locations: GROUP BY district, state over status
+    'idx_pensioners_district_state_status':
+        "CREATE INDEX IF NOT EXISTS idx_pensioners_district_state_status "
+        "ON pensioners (district, state, status)",
+    # /api/dashboard/authentication-methods: method x age band, optional age filter
+    'idx_pensioners_auth_age':
+        "CREATE INDEX IF NOT EXISTS idx_pensioners_auth_age "
+        "ON pensioners (authentication_method, age)",
+    # /api/dashboard/age-distribution and COUNT(*): smallest covering index
+    'idx_pensioners_age':
+        "CREATE INDEX IF NOT EXISTS idx_pensioners_age ON pensioners (age)",
+    # /api/pensioners: newest first, with and without a status filter
+    'idx_pensioners_created':
+        "CREATE INDEX IF NOT EXISTS idx_pensioners_created ON pensioners (created_at)",
+    'idx_pensioners_status_created':
+        "CREATE INDEX IF NOT EXISTS idx_pensioners_status_created ON pensioners (status, created_at)",
+}
+
+MIGRATIONS = [
+    (1, 'dashboard indexes', list(PENSIONER_INDEXES.values())),
+    (2, 'dashboard summary tables', SUMMARY_SCHEMA + [rebuild_summaries]),
+    (3, 'source data fingerprint', [
+        # One row: what the pensioners table currently holds
+        """
+        CREATE TABLE IF NOT EXISTS source_data (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            schema_version INTEGER NOT NULL,
+            workbooks TEXT NOT NULL,
+            row_count INTEGER NOT NULL,
+            loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+]
+
+
+def ensure_migrations_table(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def applied_versions(conn):
+    cursor = conn.cursor()
+    ensure_migrations_table(cursor)
+    return {row[0] for row in cursor.execute("SELECT version FROM schema_migrations")}
+
+
+def apply_migrations(conn):
+    """Run every migration that has not been applied yet, returning the versions applied"""
+    applied = applied_versions(conn)
+    conn.commit()
+
+    newly_applied = []
+    for version, name, statements in MIGRATIONS:
+        if version in applied:
+            continue
+        with conn:
+            for statement in statements:
+                if callable(statement):
+                    statement(conn)
+                else:
+                    conn.execute(statement)
+            conn.execute("INSERT INTO schema_migrations (version, name) VALUES (?, ?)", (version, name))
+        print(f"🔧 Applied migration {version}: {name}")
+        newly_applied.append(version)
+    return newly_applied
+
+
+def ensure_pensioner_indexes(conn):
+    """Create whichever PENSIONER_INDEXES are missing, returning their names"""
+    existing = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'pensioners'")}
+    missing = [name for name in PENSIONER_INDEXES if name not in existing]
+    with conn:
+        for name in missing:
+            conn.execute(PENSIONER_INDEXES[name])
+    return missing
+
+
+def schema_version(conn):
+    """Highest applied migration version (0 for a database without migrations)"""
+    return max(applied_versions(conn), default=0)
+
+
+def source_signature(file_paths):
+    """[[name, size, mtime_ns], ...] for the workbooks that exist (cheap: no file is read)"""
+    signature = []
+    for path in file_paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        signature.append([os.path.basename(path), stat.st_size, stat.st_mtime_ns])
+    return signature
+
+
+def loaded_source(conn):
+    """{'schema_version', 'workbooks', 'row_count', 'loaded_at'} of the last completed load, or None"""
+    row = conn.execute("SELECT schema_version, workbooks, row_count, loaded_at FROM source_data WHERE id = 1").fetchone()
+    if row is None:
+        return None
+    return {'schema_version': row[0], 'workbooks': json.loads(row[1]), 'row_count': row[2], 'loaded_at': row[3]}
+
+
+def reload_reason(conn, signature):
+    """Why the pensioners table must be reloaded from the workbooks, or None when it is current"""
+    loaded = loaded_source(conn)
+    if loaded is None:
+        return "no completed load recorded"
+    if loaded['schema_version'] != schema_version(conn):
+        return f"schema changed (v{loaded['schema_version']} → v{schema_version(conn)})"
+    if loaded['workbooks'] != signature:
+        return "source workbooks changed"
+    return None
+
+
+def clear_source(conn):
+    """Empty the pensioners table and forget its source, in one transaction"""
+    with conn:
+        conn.execute("DELETE FROM source_data")
+        conn.execute("DELETE FROM pensioners")
+        # Reloaded rows get ids from 1 again
+        conn.execute("DELETE FROM sqlite_sequence WHERE name = 'pensioners'")
+
+
+def record_source(conn, signature, row_count):
+    """Mark the pensioners table as loaded from these workbooks at the current schema version"""
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO source_data (id, schema_version, workbooks, row_count) VALUES (1, ?, ?, ?)",
+            (schema_version(conn), json.dumps(signature), row_count)
+        )
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Bounded SQLite connection pool for pension_data.db
+Requests check out one of a fixed number of long-lived connections per
+database file, so they skip the file open, schema parse and page-cache warmup
+and reuse the connection's prepared-statement cache, whichever thread serves
+them. Connections run in WAL mode so dashboard readers are not blocked by the
+loader's writes.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+# Prepared statements kept per connection, keyed by SQL text
+CACHED_STATEMENTS = 256
+
+# Connections per database file, and how long a request waits for one
+POOL_SIZE = int(os.environ.get('DLC_DB_POOL_SIZE', 8))
+POOL_TIMEOUT = float(os.environ.get('DLC_DB_POOL_TIMEOUT', 30))
+
+CONNECTION_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",  # durable at checkpoints; safe with WAL
+    "PRAGMA cache_size=-65536",  # 64 MB page cache
+    "PRAGMA mmap_size=268435456",  # 256 MB memory-mapped reads
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+]
+
+
+def connect(db_path, check_same_thread=True):
+    """Open a tuned connection (for one-off setup and load work; the caller closes it)"""
+    conn = sqlite3.connect(db_path, cached_statements=CACHED_STATEMENTS, check_same_thread=check_same_thread)
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class ConnectionPool:
+    """Up to max_size shared connections per database path, checked out one caller at a time
+
+    Connections are created on demand and handed between threads (hence
+    check_same_thread=False), so a server that starts a thread per request
+    still reuses them. acquire() waits up to timeout seconds when all of them
+    are checked out.
+    """
+
+    def __init__(self, max_size=POOL_SIZE, timeout=POOL_TIMEOUT):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._available = threading.Condition()
+        self._idle = {}  # db_path → idle connections, most recently used last
+        self._created = {}  # db_path → connections open, idle or checked out
+        self._checked_out = {}  # connection → (db_path, generation it was opened in)
+        self._generation = 0
+
+    def acquire(self, db_path):
+        """Check out a connection to db_path; give it back with release()"""
+        deadline = time.monotonic() + self.timeout
+        with self._available:
+            while True:
+                idle = self._idle.setdefault(db_path, [])
+                if idle:
+                    conn, generation = idle.pop()
+                    self._checked_out[conn] = (db_path, generation)
+                    return conn
+                if self._created.get(db_path, 0) < self.max_size:
+                    self._created[db_path] = self._created.get(db_path, 0) + 1
+                    generation = self._generation
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"All {self.max_size} connections to {db_path} are in use")
+                self._available.wait(remaining)
+
+        try:
+            conn = connect(db_path, check_same_thread=False)
+        except Exception:
+            self._forget(db_path)
+            raise
+        with self._available:
+            self._checked_out[conn] = (db_path, generation)
+        return conn
+
+    def release(self, conn):
+        """Return a checked-out connection, ending any transaction it left open"""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._available:
+            db_path, generation = self._checked_out.pop(conn)
+            if generation == self._generation:
+                self._idle.setdefault(db_path, []).append((conn, generation))
+                self._available.notify()
+                return
+        # Opened before close_all(): retire it instead
+        conn.close()
+        self._forget(db_path)
+
+    @contextmanager
+    def connection(self, db_path):
+        """with pool.connection(db_path) as conn: ... checks a connection out for the block"""
+        conn = self.acquire(db_path)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def _forget(self, db_path):
+        """A connection to db_path was closed: let a waiting caller open another"""
+        with self._available:
+            self._created[db_path] -= 1
+            self._available.notify()
+
+    def close_all(self):
+        """Close every idle connection now and checked-out ones as they are released
+        (e.g. before a database file is replaced)"""
+        with self._available:
+            self._generation += 1
+            idle, self._idle = self._idle, {}
+            for db_path, connections in idle.items():
+                self._created[db_path] -= len(connections)
+            self._available.notify_all()
+        for connections in idle.values():
+            for conn, _ in connections:
+                conn.close()
+
+    def size(self):
+        """Open connections across all database paths, idle or checked out"""
+        with self._available:
+            return sum(self._created.values())
+
+    def in_use(self):
+        """Connections currently checked out"""
+        with self._available:
+            return len(self._checked_out)
+
+
+pool = ConnectionPool()
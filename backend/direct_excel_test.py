@@ -1,29 +1,7 @@
 import pandas as pd
 import os
 from collections import defaultdict
-
-def get_state_from_pincode(pincode):
-    try:
-        pin_num = int(str(pincode)[:3])
-        
-        if 110 <= pin_num <= 140:
-            return 'Delhi'
-        elif 201 <= pin_num <= 285:
-            return 'Uttar Pradesh'
-        elif 400 <= pin_num <= 445:
-            return 'Maharashtra'
-        elif 560 <= pin_num <= 591:
-            return 'Karnataka'
-        elif 600 <= pin_num <= 643:
-            return 'Tamil Nadu'
-        elif 700 <= pin_num <= 743:
-            return 'West Bengal'
-        elif 800 <= pin_num <= 855:
-            return 'Bihar'
-        else:
-            return 'Other States'
-    except:
-        return 'Unknown'
+from pincode_lookup import state_for_pincode as get_state_from_pincode
 
 # Direct test
 excel_folder = "../XLSx data"
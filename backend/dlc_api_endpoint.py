@@ -1,7 +1,8 @@
 from flask import Flask, jsonify
-import json
 import os
 from collections import defaultdict
+from analysis_snapshot import SNAPSHOT_SUFFIX, load_analysis_data
+from pincode_lookup import district_for_pincode as get_district_from_pincode
 
 app = Flask(__name__)
 
@@ -9,16 +10,15 @@ def load_dlc_analysis_data():
     """Load the latest DLC bank pincode analysis data"""
     try:
         # Find the latest analysis file
-        analysis_files = [f for f in os.listdir('.') if f.startswith('dlc_bank_analysis_') and f.endswith('.json')]
+        analysis_files = [f for f in os.listdir('.')
+                          if f.startswith('dlc_bank_analysis_') and f.endswith(('.json', SNAPSHOT_SUFFIX))]
         if not analysis_files:
             return None
         
-        latest_file = sorted(analysis_files)[-1]
+        # Prefer the binary snapshot when a run has both
+        latest_file = max(analysis_files, key=lambda f: (os.path.splitext(f)[0], f.endswith(SNAPSHOT_SUFFIX)))
         
-        with open(latest_file, 'r') as f:
-            data = json.load(f)
-        
-        return data
+        return load_analysis_data(latest_file)
     except Exception as e:
         print(f"Error loading DLC analysis data: {e}")
         return None
@@ -111,51 +111,5 @@ def get_dlc_bank_pincode_data():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-def get_district_from_pincode(pincode):
-    """Get district from pincode (matching frontend logic)"""
-    try:
-        pin_num = int(str(pincode)[:3])
-        
-        # Gujarat districts
-        if 380 <= pin_num <= 382: return 'Ahmedabad'
-        elif 390 <= pin_num <= 396: return 'Vadodara'
-        elif 360 <= pin_num <= 370: return 'Rajkot'
-        elif 370 <= pin_num <= 375: return 'Jamnagar'
-        elif 383 <= pin_num <= 389: return 'Gandhinagar'
-        elif 362 <= pin_num <= 365: return 'Bhavnagar'
-        
-        # Rajasthan districts
-        elif 302 <= pin_num <= 303: return 'Jaipur'
-        elif 342 <= pin_num <= 344: return 'Jodhpur'
-        elif 313 <= pin_num <= 314: return 'Udaipur'
-        elif 334 <= pin_num <= 335: return 'Bikaner'
-        elif 301 <= pin_num <= 302: return 'Alwar'
-        elif 321 <= pin_num <= 322: return 'Bharatpur'
-        
-        # Maharashtra districts
-        elif 400 <= pin_num <= 421: return 'Mumbai'
-        elif 411 <= pin_num <= 414: return 'Pune'
-        elif 440 <= pin_num <= 445: return 'Nagpur'
-        elif 422 <= pin_num <= 425: return 'Nashik'
-        elif 431 <= pin_num <= 432: return 'Aurangabad'
-        
-        # Karnataka districts
-        elif 560 <= pin_num <= 562: return 'Bangalore'
-        elif 570 <= pin_num <= 571: return 'Mysore'
-        elif 580 <= pin_num <= 582: return 'Hubli'
-        elif 575 <= pin_num <= 576: return 'Mangalore'
-        
-        # Bihar districts
-        elif 800 <= pin_num <= 803: return 'Patna'
-        elif 834 <= pin_num <= 835: return 'Ranchi'
-        elif 831 <= pin_num <= 832: return 'Dhanbad'
-        
-        # Delhi
-        elif 110 <= pin_num <= 140: return 'Delhi'
-        
-        else: return 'Other District'
-    except:
-        return 'Unknown District'
-
 if __name__ == '__main__':
     app.run(debug=True, port=5001)
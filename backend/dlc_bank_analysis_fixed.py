@@ -3,6 +3,9 @@ import os
 from collections import defaultdict
 from datetime import datetime
 import json
+from analysis_snapshot import save_analysis_snapshot
+from excel_cache import iter_workbook_batches
+from pincode_lookup import state_for_pincode as get_state_from_pincode
 
 def get_age_group(birth_year):
     """Calculate age group from birth year"""
@@ -24,35 +27,6 @@ def get_age_group(birth_year):
     except:
         return 'Unknown'
 
-def get_state_from_pincode(pincode):
-    """Get state from pincode"""
-    try:
-        pin_str = str(pincode).replace('.0', '')
-        if len(pin_str) >= 3:
-            pin_num = int(pin_str[:3])
-            
-            if 110 <= pin_num <= 140: return 'Delhi'
-            elif 201 <= pin_num <= 285: return 'Uttar Pradesh'
-            elif 301 <= pin_num <= 345: return 'Rajasthan'
-            elif 360 <= pin_num <= 396: return 'Gujarat'
-            elif 400 <= pin_num <= 445: return 'Maharashtra'
-            elif 500 <= pin_num <= 509: return 'Telangana'
-            elif 510 <= pin_num <= 518: return 'Andhra Pradesh'
-            elif 560 <= pin_num <= 591: return 'Karnataka'
-            elif 600 <= pin_num <= 643: return 'Tamil Nadu'
-            elif 682 <= pin_num <= 695: return 'Kerala'
-            elif 700 <= pin_num <= 743: return 'West Bengal'
-            elif 751 <= pin_num <= 770: return 'Odisha'
-            elif 800 <= pin_num <= 855: return 'Bihar'
-            elif 781 <= pin_num <= 788: return 'Assam'
-            elif 160 <= pin_num <= 165: return 'Punjab'
-            elif 171 <= pin_num <= 177: return 'Himachal Pradesh'
-            elif 180 <= pin_num <= 194: return 'Jammu and Kashmir'
-            else: return 'Other State'
-        return 'Invalid Pincode'
-    except:
-        return 'Invalid Pincode'
-
 def analyze_dlc_by_bank_pincode():
     """Analyze DLC completion by bank pincode with age-wise distribution"""
     excel_folder = "../XLSx data"
@@ -80,15 +54,14 @@ def analyze_dlc_by_bank_pincode():
         print(f"📖 Processing File {file_index}/{len(excel_files)}: {excel_file}")
         
         try:
-            # Read Excel file
-            print(f"   📖 Loading file into memory...")
-            df = pd.read_excel(file_path)
-            print(f"   ✅ Loaded {len(df):,} records")
+            # Stream the needed columns in bounded batches instead of loading the whole file
+            print(f"   📖 Streaming file in batches...")
+            batches = iter_workbook_batches(file_path, columns=['BRANCH_PINCODE', 'PENSIONER_PINCODE', 'YOB'])
             
             file_records = 0
             
             # Process records
-            for index, row in df.iterrows():
+            for index, row in (item for batch in batches for item in batch.iterrows()):
                 try:
                     # Extract data
                     branch_pincode = str(row.get('BRANCH_PINCODE', '')).replace('.0', '') if pd.notna(row.get('BRANCH_PINCODE')) else ''
@@ -214,17 +187,14 @@ def save_dlc_analysis_data(bank_data, total_processed):
     """Save DLC analysis data to files"""
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     
-    # 1. Complete bank pincode analysis
-    complete_data = {
+    # 1. Complete bank pincode analysis, as a memory-mappable snapshot (older runs pruned)
+    meta = {
         'analysis_timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         'total_records_processed': total_processed,
         'total_bank_pincodes': len(bank_data),
-        'total_dlc_completed': sum(data['total_dlc_completed'] for data in bank_data.values()),
-        'bank_pincode_data': bank_data
+        'total_dlc_completed': sum(data['total_dlc_completed'] for data in bank_data.values())
     }
-    
-    with open(f'dlc_bank_analysis_{timestamp}.json', 'w') as f:
-        json.dump(complete_data, f, indent=2)
+    save_analysis_snapshot(bank_data, meta, f'dlc_bank_analysis_{timestamp}.dlcsnap')
     
     # 2. Top performing bank pincodes
     top_pincodes = sorted(bank_data.items(), key=lambda x: x[1]['total_dlc_completed'], reverse=True)[:50]
@@ -238,7 +208,7 @@ def save_dlc_analysis_data(bank_data, total_processed):
         json.dump(top_data, f, indent=2)
     
     print(f"\n💾 Analysis data saved:")
-    print(f"   📄 dlc_bank_analysis_{timestamp}.json (Complete data)")
+    print(f"   📄 dlc_bank_analysis_{timestamp}.dlcsnap (Complete data)")
     print(f"   🏆 top_bank_pincodes_{timestamp}.json (Top 50 performers)")
 
 if __name__ == "__main__":
@@ -1,8 +1,18 @@
+import argparse
 import pandas as pd
+import numpy as np
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from collections import defaultdict
 from datetime import datetime
 import json
+from analysis_manifest import AnalysisManifest, manifest_available
+from analysis_snapshot import save_analysis_snapshot
+from excel_cache import iter_workbook_batches
+from pincode_lookup import (
+    district_for_pincode as get_district_from_pincode, districts_for_pincodes,
+    state_for_pincode as get_state_from_pincode, states_for_pincodes
+)
 
 def get_age_group(birth_year):
     """Calculate age group from birth year"""
@@ -24,61 +34,224 @@ def get_age_group(birth_year):
     except:
         return 'Unknown'
 
-def get_state_from_pincode(pincode):
-    """Get state from pincode"""
-    try:
-        pin_str = str(pincode).replace('.0', '')
-        if len(pin_str) >= 3:
-            pin_num = int(pin_str[:3])
-            
-            # Comprehensive state mapping
-            if 110 <= pin_num <= 140: return 'Delhi'
-            elif 201 <= pin_num <= 285: return 'Uttar Pradesh'
-            elif 301 <= pin_num <= 345: return 'Rajasthan'
-            elif 360 <= pin_num <= 396: return 'Gujarat'
-            elif 400 <= pin_num <= 445: return 'Maharashtra'
-            elif 500 <= pin_num <= 509: return 'Telangana'
-            elif 510 <= pin_num <= 518: return 'Andhra Pradesh'
-            elif 560 <= pin_num <= 591: return 'Karnataka'
-            elif 600 <= pin_num <= 643: return 'Tamil Nadu'
-            elif 682 <= pin_num <= 695: return 'Kerala'
-            elif 700 <= pin_num <= 743: return 'West Bengal'
-            elif 751 <= pin_num <= 770: return 'Odisha'
-            elif 800 <= pin_num <= 855: return 'Bihar'
-            elif 781 <= pin_num <= 788: return 'Assam'
-            elif 160 <= pin_num <= 165: return 'Punjab'
-            elif 171 <= pin_num <= 177: return 'Himachal Pradesh'
-            elif 180 <= pin_num <= 194: return 'Jammu and Kashmir'
-            else: return 'Other State'
-        return 'Invalid Pincode'
-    except:
-        return 'Invalid Pincode'
+# Columnar aggregation engine
+#
+# The analysis is computed as a grouped count over whole columns instead of a
+# per-row loop. Rows are reduced to unique (bank pincode, pensioner pincode,
+# birth year) keys with an occurrence count; those key counts can be merged by
+# simple addition and are turned into the bank_pincode_data structure at the end.
 
-def get_district_from_pincode(pincode):
-    """Get district from pincode (major districts only)"""
-    try:
-        pin_str = str(pincode).replace('.0', '')
-        if len(pin_str) >= 3:
-            pin_num = int(pin_str[:3])
+INPUT_COLUMNS = ['BRANCH_PINCODE', 'PENSIONER_PINCODE', 'YOB']
+KEY_COLUMNS = ['branch_pincode', 'pensioner_pincode', 'birth_year']
+AGE_GROUP_LABELS = ['Below 60', '60-65', '66-70', '71-75', '76-80', '80+']
+AGE_GROUP_BIN_EDGES = np.array([60, 66, 71, 76, 81])
+DEFAULT_BIRTH_YEAR = 1960
+
+
+def normalize_pincode_column(series):
+    """Whole-column equivalent of str(pincode).replace('.0', ''), with '' for missing values"""
+    text = series.astype(str).str.replace('.0', '', regex=False)
+    return text.where(series.notna(), '').astype(object)
+
+
+def normalize_birth_year_column(series):
+    """Integer birth years (1960 when missing) plus a mask of rows whose YOB parses"""
+    numeric = pd.to_numeric(series, errors='coerce').astype(float).to_numpy()
+    missing = series.isna().to_numpy()
+    parsed = missing | np.isfinite(numeric)
+    years = np.where(missing | ~parsed, DEFAULT_BIRTH_YEAR, numeric)
+    return np.trunc(years).astype(np.int64), parsed
+
+
+def age_group_index(birth_years, current_year=None):
+    """Bin birth years into AGE_GROUP_LABELS indexes"""
+    current_year = current_year or datetime.now().year
+    return np.searchsorted(AGE_GROUP_BIN_EDGES, current_year - birth_years, side='right')
+
+
+def count_pensioner_keys(df):
+    """Grouped count of valid rows per (bank pincode, pensioner pincode, birth year)"""
+    empty = pd.Series([np.nan] * len(df), index=df.index, dtype=object)
+    branch = normalize_pincode_column(df.get('BRANCH_PINCODE', empty))
+    pensioner = normalize_pincode_column(df.get('PENSIONER_PINCODE', empty))
+    birth_years, parsed = normalize_birth_year_column(df.get('YOB', empty))
+
+    # Same filters as the row loop: unparseable YOB and short bank pincodes are skipped
+    valid = parsed & (branch.str.len() >= 6).to_numpy()
+    keys = pd.DataFrame({
+        'branch_pincode': branch.to_numpy()[valid],
+        'pensioner_pincode': pensioner.to_numpy()[valid],
+        'birth_year': birth_years[valid],
+    })
+    return keys.groupby(KEY_COLUMNS, sort=False).size().rename('count').reset_index()
+
+
+def merge_key_counts(partials):
+    """Merge key counts from several batches or workbooks (associative and order-free)"""
+    partials = [p for p in partials if len(p)]
+    if not partials:
+        return pd.DataFrame({'branch_pincode': [], 'pensioner_pincode': [], 'birth_year': [], 'count': []})
+    if len(partials) == 1:
+        return partials[0]
+    merged = pd.concat(partials, ignore_index=True)
+    return merged.groupby(KEY_COLUMNS, sort=False)['count'].sum().reset_index()
+
+
+def build_bank_pincode_data(key_counts, current_year=None):
+    """Turn merged key counts into the bank_pincode_data structure and the processed-row total"""
+    total_processed = int(key_counts['count'].sum()) if len(key_counts) else 0
+    if not len(key_counts):
+        return {}, total_processed
+
+    branch = key_counts['branch_pincode'].astype(object)
+    pensioner = key_counts['pensioner_pincode'].astype(object)
+    birth_years = key_counts['birth_year'].to_numpy(dtype=np.int64)
+
+    age_labels = np.array(AGE_GROUP_LABELS, dtype=object)
+
+    # Each key row is one unique pensioner at its bank pincode
+    unique_rows = pd.DataFrame({
+        'branch_pincode': branch.to_numpy(),
+        'age_group': age_labels[age_group_index(birth_years, current_year)],
+        'pensioner_state': states_for_pincodes(pensioner.to_numpy()),
+    })
+    totals = unique_rows.groupby('branch_pincode', sort=False).size()
+    age_counts = unique_rows.groupby(['branch_pincode', 'age_group'], sort=False).size()
+    state_counts = unique_rows.groupby(['branch_pincode', 'pensioner_state'], sort=False).size()
+
+    bank_pincodes = totals.index.to_numpy(dtype=object)
+    bank_states = states_for_pincodes(bank_pincodes)
+    bank_districts = districts_for_pincodes(bank_pincodes)
+
+    final_data = {}
+    for pincode, total, state, district in zip(totals.index, totals.to_numpy(), bank_states, bank_districts):
+        final_data[pincode] = {
+            'total_dlc_completed': int(total),
+            'age_groups': {},
+            'state': state,
+            'district': district,
+            'pensioner_states': {},
+            'unique_pensioner_count': int(total)
+        }
+    for (pincode, age_group), count in age_counts.items():
+        final_data[pincode]['age_groups'][age_group] = int(count)
+    for (pincode, state), count in state_counts.items():
+        final_data[pincode]['pensioner_states'][state] = int(count)
+
+    return final_data, total_processed
+
+def count_workbook_keys(file_path):
+    """Stream one workbook and reduce it to key counts (also the worker task for parallel runs)"""
+    batches = iter_workbook_batches(file_path, columns=INPUT_COLUMNS)
+    return merge_key_counts(count_pensioner_keys(batch) for batch in batches)
+
+
+def collect_workbook_partials(file_paths, workers=1):
+    """Key counts per input position, parsed serially or one workbook per worker process
+
+    Keyed by index rather than path, so a path listed twice is counted twice.
+    """
+    partials = {}
+    if workers > 1 and len(file_paths) > 1:
+        print(f"⚙️  Parallel ingestion with {workers} worker processes")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(count_workbook_keys, path): index for index, path in enumerate(file_paths)}
+            for future in as_completed(futures):
+                index = futures[future]
+                excel_file = os.path.basename(file_paths[index])
+                try:
+                    key_counts = future.result()
+                except Exception as e:
+                    print(f"   ❌ Error processing {excel_file}: {e}")
+                    continue
+                partials[index] = key_counts
+                print(f"   ✅ {excel_file}: {int(key_counts['count'].sum()):,} records processed")
+        return partials
+
+    # Process each Excel file
+    for index, file_path in enumerate(file_paths):
+        excel_file = os.path.basename(file_path)
+        print(f"📖 Processing File {index + 1}/{len(file_paths)}: {excel_file}")
+        
+        try:
+            # Stream the needed columns in bounded batches and reduce each batch to key counts
+            print(f"   📖 Streaming file in batches...")
+            key_counts = count_workbook_keys(file_path)
+            partials[index] = key_counts
+            print(f"   ✅ File completed: {int(key_counts['count'].sum()):,} records processed")
             
-            # Major district mappings
-            if pin_num >= 380 and pin_num <= 382: return 'Ahmedabad'
-            elif pin_num >= 390 and pin_num <= 396: return 'Vadodara'
-            elif pin_num >= 360 and pin_num <= 370: return 'Rajkot'
-            elif pin_num >= 302 and pin_num <= 303: return 'Jaipur'
-            elif pin_num >= 342 and pin_num <= 344: return 'Jodhpur'
-            elif pin_num >= 400 and pin_num <= 421: return 'Mumbai'
-            elif pin_num >= 411 and pin_num <= 414: return 'Pune'
-            elif pin_num >= 560 and pin_num <= 562: return 'Bangalore'
-            elif pin_num >= 600 and pin_num <= 603: return 'Chennai'
-            elif pin_num >= 700 and pin_num <= 711: return 'Kolkata'
-            elif pin_num >= 110 and pin_num <= 140: return 'Delhi'
-            else: return 'Other District'
-        return 'Unknown District'
-    except:
-        return 'Unknown District'
+        except Exception as e:
+            print(f"   ❌ Error processing {excel_file}: {e}")
+            continue
+    
+    return partials
+
+
+def collect_key_counts(file_paths, workers=1):
+    """Merged key counts for all workbooks"""
+    return merge_key_counts(collect_workbook_partials(file_paths, workers=workers).values())
+
+
+def subtract_key_counts(totals, partials):
+    """Remove previously merged key counts from totals (the inverse of merge_key_counts)"""
+    partials = [p for p in partials if p is not None and len(p)]
+    if not partials:
+        return totals
+    negated = [p.assign(count=-p['count']) for p in partials]
+    merged = merge_key_counts([totals] + negated)
+    return merged[merged['count'] != 0].reset_index(drop=True)
+
+
+def update_key_counts(file_paths, manifest, workers=1):
+    """Merged key counts for all workbooks, re-parsing only new or changed ones
+
+    Unchanged workbooks keep their stored contribution; a changed workbook has
+    its old key counts subtracted before the new ones are added, and a removed
+    workbook is subtracted entirely.
+    """
+    unchanged, changed, removed, fingerprints = manifest.plan(file_paths)
+    print(f"🧾 Manifest: {len(unchanged)} unchanged, {len(changed)} new/changed, {len(removed)} removed")
+
+    # Workbooks whose previous contribution is in the stored totals
+    stale = [os.path.basename(p) for p in changed if os.path.basename(p) in manifest.files] + removed
+    totals = manifest.load_totals()
+    if totals is None or not all(manifest.has_partial(name) for name in stale):
+        # A stale workbook's old key counts are missing, so they cannot be subtracted:
+        # rebuild the totals from the unchanged workbooks instead
+        totals = merge_key_counts(manifest.load_partial(os.path.basename(p)) for p in unchanged)
+    else:
+        totals = subtract_key_counts(totals, [manifest.load_partial(name) for name in stale])
+    for name in removed:
+        print(f"   🗑️ {name}: removed, contribution subtracted")
+        manifest.forget(name)
+
+    for file_path in unchanged:
+        manifest.touch(os.path.basename(file_path), fingerprints[os.path.basename(file_path)])
+
+    fresh = collect_workbook_partials(changed, workers=workers)
+    for index, key_counts in fresh.items():
+        name = os.path.basename(changed[index])
+        manifest.record(name, fingerprints[name], key_counts)
+    for index, file_path in enumerate(changed):
+        if index not in fresh:
+            # Failed to parse: drop the old entry so the next run retries it
+            manifest.forget(os.path.basename(file_path))
+    totals = merge_key_counts([totals] + list(fresh.values()))
+
+    manifest.save(totals)
+    return totals
+
+
+def compute_bank_pincode_data(file_paths, workers=1, incremental=True):
+    """bank_pincode_data and processed-row total for the workbooks (no reports or files written)"""
+    if incremental and manifest_available():
+        key_counts = update_key_counts(file_paths, AnalysisManifest(), workers=workers)
+    else:
+        key_counts = collect_key_counts(file_paths, workers=workers)
+    return build_bank_pincode_data(key_counts)
+
 
-def analyze_dlc_by_bank_pincode():
+def analyze_dlc_by_bank_pincode(workers=1, incremental=True):
     """Analyze DLC completion by bank pincode with age-wise distribution"""
     excel_folder = "../XLSx data"
     
@@ -88,111 +261,13 @@ def analyze_dlc_by_bank_pincode():
     print("🎯 Analyzing: Bank Pincode → Age Distribution → DLC Count")
     print("-" * 70)
     
-    # Initialize data structures
-    bank_pincode_data = defaultdict(lambda: {
-        'total_dlc_completed': 0,
-        'age_groups': defaultdict(int),
-        'state': '',
-        'district': '',
-        'pensioner_states': defaultdict(int),  # Where pensioners come from
-        'unique_pensioners': set()
-    })
-    
-    total_processed = 0
     excel_files = [f for f in os.listdir(excel_folder) if f.endswith('.xlsx')]
-    
-    # Process each Excel file
-    for file_index, excel_file in enumerate(excel_files, 1):
-        file_path = os.path.join(excel_folder, excel_file)
-        print(f"📖 Processing File {file_index}/{len(excel_files)}: {excel_file}")
-        
-        try:
-            # Read entire Excel file (pandas read_excel doesn't support chunksize)
-            print(f"   📖 Loading file into memory...")
-            df = pd.read_excel(file_path)
-            print(f"   ✅ Loaded {len(df):,} records")
-            
-            file_records = 0
-            
-            # Process in batches for progress tracking
-            batch_size = 50000
-            total_rows = len(df)
-            
-            for start_idx in range(0, total_rows, batch_size):
-                end_idx = min(start_idx + batch_size, total_rows)
-                batch_num = (start_idx // batch_size) + 1
-                print(f"   📦 Processing batch {batch_num} (rows {start_idx:,} to {end_idx:,})...")
-                
-                for index in range(start_idx, end_idx):
-                    row = df.iloc[index]
-                    try:
-                        # Extract data
-                        branch_pincode = str(row.get('BRANCH_PINCODE', '')).replace('.0', '') if pd.notna(row.get('BRANCH_PINCODE')) else ''
-                        pensioner_pincode = str(row.get('PENSIONER_PINCODE', '')).replace('.0', '') if pd.notna(row.get('PENSIONER_PINCODE')) else ''
-                        birth_year = int(float(row.get('YOB', 1960))) if pd.notna(row.get('YOB')) else 1960
-                        
-                        # Skip invalid data
-                        if not branch_pincode or len(branch_pincode) < 6:
-                            continue
-                        
-                        # Calculate age group
-                        age_group = get_age_group(birth_year)
-                        
-                        # Get locations
-                        bank_state = get_state_from_pincode(branch_pincode)
-                        bank_district = get_district_from_pincode(branch_pincode)
-                        pensioner_state = get_state_from_pincode(pensioner_pincode)
-                        
-                        # Create unique pensioner ID
-                        pensioner_id = f"{pensioner_pincode}_{birth_year}"
-                        
-                        # Update bank pincode data
-                        bank_data = bank_pincode_data[branch_pincode]
-                        
-                        # Only count unique pensioners
-                        if pensioner_id not in bank_data['unique_pensioners']:
-                            bank_data['unique_pensioners'].add(pensioner_id)
-                            bank_data['total_dlc_completed'] += 1
-                            bank_data['age_groups'][age_group] += 1
-                            bank_data['pensioner_states'][pensioner_state] += 1
-                            
-                            # Set location info (first time)
-                            if not bank_data['state']:
-                                bank_data['state'] = bank_state
-                                bank_data['district'] = bank_district
-                        
-                        file_records += 1
-                        total_processed += 1
-                        
-                        # Progress update every 100k records
-                        if total_processed % 100000 == 0:
-                            print(f"   ✅ Processed {total_processed:,} total records...")
-                        
-                    except Exception as e:
-                        continue  # Skip problematic records
-                
-            print(f"   ✅ File completed: {file_records:,} records processed")
-            
-        except Exception as e:
-            print(f"   ❌ Error processing {excel_file}: {e}")
-            continue
+    file_paths = [os.path.join(excel_folder, f) for f in excel_files]
+    final_data, total_processed = compute_bank_pincode_data(file_paths, workers=workers, incremental=incremental)
     
     print(f"\n🎯 Processing Complete!")
     print(f"📊 Total Records Processed: {total_processed:,}")
-    print(f"🏦 Unique Bank Pincodes Found: {len(bank_pincode_data):,}")
-    
-    # Convert sets to counts and clean data
-    final_data = {}
-    for pincode, data in bank_pincode_data.items():
-        if data['total_dlc_completed'] > 0:  # Only include pincodes with DLC completions
-            final_data[pincode] = {
-                'total_dlc_completed': data['total_dlc_completed'],
-                'age_groups': dict(data['age_groups']),
-                'state': data['state'],
-                'district': data['district'],
-                'pensioner_states': dict(data['pensioner_states']),
-                'unique_pensioner_count': len(data['unique_pensioners'])
-            }
+    print(f"🏦 Unique Bank Pincodes Found: {len(final_data):,}")
     
     # Generate analysis report
     generate_dlc_analysis_report(final_data, total_processed)
@@ -260,17 +335,14 @@ def save_dlc_analysis_data(bank_data, total_processed):
     """Save DLC analysis data to files"""
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     
-    # 1. Complete bank pincode analysis
-    complete_data = {
+    # 1. Complete bank pincode analysis, as a memory-mappable snapshot (older runs pruned)
+    meta = {
         'analysis_timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         'total_records_processed': total_processed,
         'total_bank_pincodes': len(bank_data),
-        'total_dlc_completed': sum(data['total_dlc_completed'] for data in bank_data.values()),
-        'bank_pincode_data': bank_data
+        'total_dlc_completed': sum(data['total_dlc_completed'] for data in bank_data.values())
     }
-    
-    with open(f'dlc_bank_pincode_analysis_{timestamp}.json', 'w') as f:
-        json.dump(complete_data, f, indent=2)
+    save_analysis_snapshot(bank_data, meta, f'dlc_bank_pincode_analysis_{timestamp}.dlcsnap')
     
     # 2. Top performing bank pincodes
     top_pincodes = sorted(bank_data.items(), key=lambda x: x[1]['total_dlc_completed'], reverse=True)[:100]
@@ -316,16 +388,23 @@ def save_dlc_analysis_data(bank_data, total_processed):
         json.dump(state_final, f, indent=2)
     
     print(f"\n💾 Analysis data saved:")
-    print(f"   📄 dlc_bank_pincode_analysis_{timestamp}.json (Complete data)")
+    print(f"   📄 dlc_bank_pincode_analysis_{timestamp}.dlcsnap (Complete data)")
     print(f"   🏆 top_bank_pincodes_{timestamp}.json (Top 100 performers)")
     print(f"   🗺️ state_wise_dlc_summary_{timestamp}.json (State summaries)")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DLC completion analysis by bank pincode")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="worker processes for parsing workbooks in parallel (default: 1, serial)")
+    parser.add_argument('--full', action='store_true',
+                        help="re-parse every workbook instead of only new or changed ones")
+    args = parser.parse_args()
+
     print("🚀 Starting DLC Bank Pincode Analysis...")
     print("⚠️  This will process 4+ million records - may take several minutes")
     
     try:
-        result = analyze_dlc_by_bank_pincode()
+        result = analyze_dlc_by_bank_pincode(workers=args.workers, incremental=not args.full)
         print(f"\n✅ Analysis Complete!")
         print(f"🎯 Found DLC completion data for {len(result):,} unique bank pincodes")
         
@@ -3,6 +3,8 @@ import os
 from collections import defaultdict
 from datetime import datetime
 import json
+from excel_cache import load_workbook
+from pincode_lookup import state_for_pincode as get_state_from_pincode
 
 def get_age_group(birth_year):
     """Calculate age group from birth year"""
@@ -24,37 +26,6 @@ def get_age_group(birth_year):
     except:
         return 'Unknown'
 
-def get_state_from_pincode(pincode):
-    """Get state from pincode"""
-    try:
-        pin_num = int(str(pincode)[:3])
-        
-        # State mappings based on pincode ranges
-        if 110 <= pin_num <= 140:
-            return 'Delhi'
-        elif 201 <= pin_num <= 285:
-            return 'Uttar Pradesh'
-        elif 301 <= pin_num <= 345:
-            return 'Rajasthan'
-        elif 360 <= pin_num <= 396:
-            return 'Gujarat'
-        elif 400 <= pin_num <= 445:
-            return 'Maharashtra'
-        elif 500 <= pin_num <= 509:
-            return 'Telangana'
-        elif 560 <= pin_num <= 591:
-            return 'Karnataka'
-        elif 600 <= pin_num <= 643:
-            return 'Tamil Nadu'
-        elif 700 <= pin_num <= 743:
-            return 'West Bengal'
-        elif 800 <= pin_num <= 855:
-            return 'Bihar'
-        else:
-            return 'Other State'
-    except:
-        return 'Unknown State'
-
 def analyze_excel_files():
     """Analyze all 5 Excel files and extract comprehensive data"""
     excel_folder = "../XLSx data"
@@ -90,7 +61,7 @@ def analyze_excel_files():
         
         try:
             # Read Excel file (limit rows for faster processing)
-            df = pd.read_excel(file_path, nrows=10000)  # Analyze first 10k rows per file
+            df = load_workbook(file_path, nrows=10000)  # Analyze first 10k rows per file
             print(f"📋 Columns: {list(df.columns)}")
             print(f"📊 Shape: {df.shape}")
             
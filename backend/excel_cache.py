@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Columnar ingest cache for the GAD_DLC_PINCODE_DATA workbooks
+Converts each Excel workbook to Parquet once so analyzers and API routes
+read typed columns instead of re-parsing the sheet XML on every run
+"""
+
+import hashlib
+import importlib.util
+import os
+import re
+
+from xlsx_stream import DEFAULT_BATCH_SIZE, iter_xlsx_batches
+
+# pandas and pyarrow are imported on first read, so importing this module for
+# its paths (as the API server does at startup) stays cheap
+PARQUET_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+EXCEL_FOLDER = os.path.normpath(os.path.join(BACKEND_DIR, '..', 'XLSx data'))
+CACHE_DIR = os.environ.get('DLC_CACHE_DIR', os.path.join(BACKEND_DIR, 'cache'))
+
+
+def list_workbooks(excel_folder=EXCEL_FOLDER):
+    """List the .xlsx workbooks in a folder, sorted for a stable processing order"""
+    return sorted(
+        os.path.join(excel_folder, f) for f in os.listdir(excel_folder)
+        if f.endswith('.xlsx') and not f.startswith('~$')
+    )
+
+
+def workbook_cache_key(file_path):
+    """Cache key derived from the workbook's absolute path, size and mtime"""
+    stat = os.stat(file_path)
+    identity = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.sha1(identity.encode('utf-8')).hexdigest()[:16]
+
+
+def cache_path_for(file_path):
+    """Location of the Parquet cache entry for the current version of a workbook"""
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(CACHE_DIR, f"{stem}-{workbook_cache_key(file_path)}.parquet")
+
+
+def _remove_stale_entries(file_path, keep_path):
+    """Delete cache entries left behind by older versions of the same workbook"""
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    # Exact match, so 'DATA' does not claim 'DATA-2-<key>.parquet' of another workbook
+    entry_name = re.compile(rf"^{re.escape(stem)}-[0-9a-f]{{16}}\.parquet$")
+    for name in os.listdir(CACHE_DIR):
+        entry = os.path.join(CACHE_DIR, name)
+        if entry_name.match(name) and entry != keep_path:
+            os.remove(entry)
+
+
+def _to_columnar(df):
+    """Store mixed-type object columns as text so they round-trip through Parquet"""
+    for column in df.columns:
+        if df[column].dtype == object:
+            df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+    return df
+
+
+def convert_workbook(file_path):
+    """Parse a workbook once and write it to the columnar cache, returning the cache path"""
+    cache_path = cache_path_for(file_path)
+    if os.path.exists(cache_path):
+        return cache_path
+
+    import pandas as pd
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    df = _to_columnar(pd.read_excel(file_path))
+
+    # Write to a temporary file first so readers never see a partial cache entry
+    tmp_path = f"{cache_path}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, cache_path)
+    _remove_stale_entries(file_path, cache_path)
+    return cache_path
+
+
+def load_workbook(file_path, columns=None, nrows=None):
+    """Load a workbook as a DataFrame, reading from the columnar cache when possible
+
+    Only full reads convert the workbook; an nrows read uses an existing cache
+    entry or a partial read_excel, so it never pays for parsing the whole sheet.
+    """
+    import pandas as pd
+
+    if PARQUET_AVAILABLE:
+        cache_path = cache_path_for(file_path)
+        if nrows is None and not os.path.exists(cache_path):
+            try:
+                convert_workbook(file_path)
+            except OSError as e:
+                # Read-only deployments (e.g. serverless) cannot write the cache
+                print(f"⚠️ Columnar cache unavailable for {file_path}: {e}")
+        if os.path.exists(cache_path):
+            if columns is not None:
+                # Missing columns are skipped, mirroring the analyzers' row.get() lookups
+                import pyarrow.parquet as pq
+                schema = pq.read_schema(cache_path).names
+                columns = [c for c in columns if c in schema]
+            df = pd.read_parquet(cache_path, columns=columns)
+            return df.head(nrows) if nrows is not None else df
+
+    usecols = (lambda c: c in columns) if columns is not None else None
+    return pd.read_excel(file_path, usecols=usecols, nrows=nrows)
+
+
+def iter_workbook_batches(file_path, columns=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield bounded-size DataFrame batches of a workbook
+
+    Reads row groups from an existing cache entry when there is one, otherwise
+    streams the sheet XML directly (without converting the whole workbook).
+    """
+    cache_path = cache_path_for(file_path) if PARQUET_AVAILABLE else None
+    if cache_path and os.path.exists(cache_path):
+        import pyarrow.parquet as pq
+        parquet = pq.ParquetFile(cache_path)
+        if columns is not None:
+            columns = [c for c in columns if c in parquet.schema_arrow.names]
+        for batch in parquet.iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    yield from iter_xlsx_batches(file_path, columns=columns, batch_size=batch_size)
+
+
+def convert_all(excel_folder=EXCEL_FOLDER):
+    """One-time conversion stage: build cache entries for every workbook in the folder"""
+    if not PARQUET_AVAILABLE:
+        print("❌ pyarrow is required for the columnar cache")
+        print("💡 Please install: pip install pyarrow")
+        return []
+
+    print("🗃️ COLUMNAR CACHE BUILD")
+    print("=" * 60)
+    converted = []
+    for file_path in list_workbooks(excel_folder):
+        name = os.path.basename(file_path)
+        if os.path.exists(cache_path_for(file_path)):
+            print(f"✅ {name}: cache is up to date")
+        else:
+            print(f"📖 {name}: converting to Parquet...")
+            convert_workbook(file_path)
+            print(f"✅ {name}: cached")
+        converted.append(cache_path_for(file_path))
+    print(f"\n💾 {len(converted)} workbook(s) cached in {CACHE_DIR}")
+    return converted
+
+
+if __name__ == "__main__":
+    convert_all()
@@ -9,56 +9,8 @@ import os
 import json
 from datetime import datetime
 from collections import defaultdict
-
-def get_state_from_pincode(pincode):
-    """Get state from pincode using first 3 digits"""
-    try:
-        pin_num = int(str(pincode)[:3])
-        
-        if 110 <= pin_num <= 140:
-            return 'Delhi'
-        elif 121 <= pin_num <= 136:
-            return 'Haryana'
-        elif 140 <= pin_num <= 160:
-            return 'Punjab'
-        elif 301 <= pin_num <= 345:
-            return 'Rajasthan'
-        elif 201 <= pin_num <= 285:
-            return 'Uttar Pradesh'
-        elif 800 <= pin_num <= 855:
-            return 'Bihar'
-        elif 700 <= pin_num <= 743:
-            return 'West Bengal'
-        elif 400 <= pin_num <= 445:
-            return 'Maharashtra'
-        elif 380 <= pin_num <= 396:
-            return 'Gujarat'
-        elif 560 <= pin_num <= 591:
-            return 'Karnataka'
-        elif 600 <= pin_num <= 643:
-            return 'Tamil Nadu'
-        elif 500 <= pin_num <= 509:
-            return 'Telangana'
-        elif 515 <= pin_num <= 535:
-            return 'Andhra Pradesh'
-        elif 450 <= pin_num <= 492:
-            return 'Madhya Pradesh'
-        elif 751 <= pin_num <= 770:
-            return 'Odisha'
-        elif 781 <= pin_num <= 788:
-            return 'Assam'
-        elif 682 <= pin_num <= 695:
-            return 'Kerala'
-        elif 831 <= pin_num <= 835:
-            return 'Jharkhand'
-        elif 248 <= pin_num <= 263:
-            return 'Uttarakhand'
-        elif 171 <= pin_num <= 177:
-            return 'Himachal Pradesh'
-        else:
-            return 'Other States'
-    except:
-        return 'Unknown'
+from excel_cache import iter_workbook_batches
+from pincode_lookup import state_for_pincode as get_state_from_pincode
 
 def get_age_group(birth_year):
     """Get age group from birth year"""
@@ -102,9 +54,10 @@ def process_excel_data():
         print(f"Processing {file_name}...")
         
         try:
-            # Read Excel file in chunks to handle large files
+            # Stream the workbook in bounded chunks (read_excel has no chunksize)
             chunk_size = 10000
-            for chunk in pd.read_excel(file_path, chunksize=chunk_size):
+            columns = ['PENSIONER_PINCODE', 'BRANCH_PINCODE', 'YOB']
+            for chunk in iter_workbook_batches(file_path, columns=columns, batch_size=chunk_size):
                 for _, row in chunk.iterrows():
                     try:
                         pensioner_pincode = str(row['PENSIONER_PINCODE']) if pd.notna(row['PENSIONER_PINCODE']) else ''
@@ -10,6 +10,8 @@ import json
 from typing import Dict, List, Any
 from datetime import datetime
 import sqlite3
+from excel_cache import load_workbook
+from pincode_lookup import state_for_pincode
 
 class ExcelDataProcessor:
     def __init__(self, excel_folder_path: str):
@@ -34,51 +36,7 @@ class ExcelDataProcessor:
         if pincode in self.state_pincode_mapping:
             return self.state_pincode_mapping[pincode]
         
-        # Comprehensive state detection based on pincode ranges
-        pincode_num = int(pincode[:3]) if pincode and len(pincode) >= 3 and pincode[:3].isdigit() else 0
-        
-        if 110000 <= pincode_num <= 140000:
-            return 'Delhi'
-        elif 121000 <= pincode_num <= 136000:
-            return 'Haryana'
-        elif 140000 <= pincode_num <= 160000:
-            return 'Punjab'
-        elif 301000 <= pincode_num <= 345000:
-            return 'Rajasthan'
-        elif 201000 <= pincode_num <= 285000:
-            return 'Uttar Pradesh'
-        elif 800000 <= pincode_num <= 855000:
-            return 'Bihar'
-        elif 700000 <= pincode_num <= 743000:
-            return 'West Bengal'
-        elif 400000 <= pincode_num <= 445000:
-            return 'Maharashtra'
-        elif 380000 <= pincode_num <= 396000:
-            return 'Gujarat'
-        elif 560000 <= pincode_num <= 591000:
-            return 'Karnataka'
-        elif 600000 <= pincode_num <= 643000:
-            return 'Tamil Nadu'
-        elif 500000 <= pincode_num <= 509000:
-            return 'Telangana'
-        elif 515000 <= pincode_num <= 535000:
-            return 'Andhra Pradesh'
-        elif 450000 <= pincode_num <= 492000:
-            return 'Madhya Pradesh'
-        elif 751000 <= pincode_num <= 770000:
-            return 'Odisha'
-        elif 781000 <= pincode_num <= 788000:
-            return 'Assam'
-        elif 682000 <= pincode_num <= 695000:
-            return 'Kerala'
-        elif 831000 <= pincode_num <= 835000:
-            return 'Jharkhand'
-        elif 248000 <= pincode_num <= 263000:
-            return 'Uttarakhand'
-        elif 171000 <= pincode_num <= 177000:
-            return 'Himachal Pradesh'
-        else:
-            return 'Other States'
+        return state_for_pincode(pincode)
     
     def categorize_age_group(self, birth_year: int) -> str:
         """Categorize pensioner into age groups based on birth year"""
@@ -112,8 +70,8 @@ class ExcelDataProcessor:
             print(f"Processing {file_name}...")
             
             try:
-                # Read Excel file
-                df = pd.read_excel(file_path)
+                # Read workbook through the columnar cache
+                df = load_workbook(file_path)
                 
                 # Print column names to understand structure
                 print(f"Columns in {file_name}: {list(df.columns)}")
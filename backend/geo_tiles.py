@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Pre-built pincode boundary tiles
+Preprocesses Filtered_Pincode_Boundaries.geojson into one pack file per zoom
+level holding every feature simplified for that zoom, grouped by state, plus
+a NumPy index of feature bounding boxes, states and byte spans. Packs and
+index are memory-mapped at serve time, so a request for one state or one
+viewport copies only the matching features out of the page cache.
+
+Layout (GEO_TILES_DIR, committed and deployed with the API):
+    meta.json                  source size and hash, zoom levels, state ranges
+    index-bbox.npy             (N, 4) float64 min_lon, min_lat, max_lon, max_lat
+    index-spans.npy            (Z, N, 2) int64 byte offset and length per zoom
+    pincodes-z<zoom>.bin       comma-separated Feature JSON, sorted by state
+
+Build ahead of time with:
+    python geo_tiles.py
+"""
+
+import json
+import math
+import mmap
+import os
+import re
+import tempfile
+import threading
+
+import numpy as np
+
+from pincode_lookup import CIRCLE_STATE_NAMES, REPO_ROOT
+
+SOURCE_GEOJSON = os.path.join(REPO_ROOT, 'Filtered_Pincode_Boundaries.geojson')
+GEO_TILES_DIR = os.environ.get('DLC_GEO_TILES_DIR', os.path.join(REPO_ROOT, 'geo_tiles'))
+TILES_VERSION = 2
+
+# Web-map zoom levels to pre-simplify for; each uses a tolerance of about one
+# pixel of a 256 px tile at that zoom, the last one keeps full detail
+ZOOM_LEVELS = [5, 8, 11, 14]
+FULL_DETAIL_ZOOM = 14
+VIEWPORT_PIXELS = 1024
+
+FEATURE_SEPARATOR = b','
+COLLECTION_HEAD = b'{"type":"FeatureCollection","features":['
+COLLECTION_TAIL = b']}'
+
+
+def tolerance_for_zoom(zoom):
+    """Degrees per pixel at a zoom level (0 = keep every vertex)"""
+    if zoom >= FULL_DETAIL_ZOOM:
+        return 0.0
+    return 360.0 / (256 * 2 ** zoom)
+
+
+def precision_for_tolerance(tolerance):
+    """Decimal places that keep rounding error well below the tolerance"""
+    if tolerance <= 0:
+        return 6
+    return min(6, max(1, math.ceil(-math.log10(tolerance)) + 1))
+
+
+def state_key(name):
+    """Lookup key for a state name: 'Tamil Nadu', 'tamilnadu' and 'TAMIL_NADU' all match"""
+    return re.sub(r'[^a-z0-9]', '', str(name).lower())
+
+
+def simplify_line(points, tolerance):
+    """Douglas-Peucker simplification of an (n, 2) coordinate array, keeping both ends"""
+    if tolerance <= 0 or len(points) <= 2:
+        return points
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment = points[end] - points[start]
+        offsets = points[start + 1:end] - points[start]
+        length = math.hypot(segment[0], segment[1])
+        if length == 0:
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            distances = np.abs(segment[0] * offsets[:, 1] - segment[1] * offsets[:, 0]) / length
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = start + 1 + farthest
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return points[keep]
+
+
+def simplify_ring(ring, tolerance):
+    """Simplified closed ring, or None when it collapses below a triangle"""
+    points = np.asarray(ring, dtype=float)
+    if tolerance <= 0:
+        return points
+    # Split the closed ring at its farthest vertex so neither end is degenerate
+    far = int(np.argmax(np.hypot(*(points - points[0]).T)))
+    if far == 0:
+        return None
+    first = simplify_line(points[:far + 1], tolerance)
+    second = simplify_line(points[far:], tolerance)
+    simplified = np.vstack([first, second[1:]])
+    return simplified if len(simplified) >= 4 else None
+
+
+def simplify_geometry(geometry, tolerance, precision):
+    """Simplified and rounded Polygon/MultiPolygon geometry, or None if nothing remains"""
+    polygons = [geometry['coordinates']] if geometry['type'] == 'Polygon' else geometry['coordinates']
+    simplified = []
+    for polygon in polygons:
+        rings = []
+        for index, ring in enumerate(polygon):
+            points = simplify_ring(ring, tolerance)
+            if points is None:
+                if index == 0:
+                    break  # outer ring collapsed: drop the polygon with its holes
+                continue
+            rings.append(np.round(points, precision).tolist())
+        if rings:
+            simplified.append(rings)
+    if not simplified:
+        return None
+    if geometry['type'] == 'Polygon':
+        return {'type': 'Polygon', 'coordinates': simplified[0]}
+    return {'type': 'MultiPolygon', 'coordinates': simplified}
+
+
+def geometry_bbox(geometry):
+    polygons = [geometry['coordinates']] if geometry['type'] == 'Polygon' else geometry['coordinates']
+    points = np.array([point[:2] for polygon in polygons for ring in polygon for point in ring], dtype=float)
+    return [points[:, 0].min(), points[:, 1].min(), points[:, 0].max(), points[:, 1].max()]
+
+
+def feature_state(properties):
+    circle = str(properties.get('Circle') or '').strip()
+    return CIRCLE_STATE_NAMES.get(circle, circle) or 'Unknown'
+
+
+def source_fingerprint(source_path):
+    """Name, size and content hash of the source (stable across checkouts, unlike mtime)"""
+    from dashboard_aggregates import workbook_fingerprint
+    return workbook_fingerprint(source_path)
+
+
+def read_meta(tiles_dir=GEO_TILES_DIR):
+    try:
+        with open(os.path.join(tiles_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def tiles_are_current(tiles_dir=GEO_TILES_DIR, source_path=SOURCE_GEOJSON):
+    """Whether the tiles in tiles_dir were built from exactly this source (hashes it)"""
+    meta = read_meta(tiles_dir)
+    return (meta is not None and meta.get('version') == TILES_VERSION
+            and meta.get('source') == source_fingerprint(source_path))
+
+
+def build_tiles(source_path=SOURCE_GEOJSON, tiles_dir=GEO_TILES_DIR):
+    """Offline step: simplify every feature per zoom level and write packs + index"""
+    with open(source_path, 'r', encoding='utf-8') as f:
+        features = [ft for ft in json.load(f).get('features', []) if ft.get('geometry')]
+
+    # Group features by state so each state is one contiguous byte range per pack
+    features.sort(key=lambda ft: (feature_state(ft.get('properties') or {}), str((ft.get('properties') or {}).get('Pincode', ''))))
+    states = [feature_state(ft.get('properties') or {}) for ft in features]
+
+    os.makedirs(tiles_dir, exist_ok=True)
+    spans = np.zeros((len(ZOOM_LEVELS), len(features), 2), dtype=np.int64)
+    for level, zoom in enumerate(ZOOM_LEVELS):
+        tolerance = tolerance_for_zoom(zoom)
+        precision = precision_for_tolerance(tolerance)
+        pack_path = os.path.join(tiles_dir, f"pincodes-z{zoom}.bin")
+        offset = 0
+        with open(f"{pack_path}.tmp", 'wb') as pack:
+            for index, feature in enumerate(features):
+                geometry = simplify_geometry(feature['geometry'], tolerance, precision)
+                if geometry is None:
+                    continue  # smaller than a pixel at this zoom
+                encoded = json.dumps({'type': 'Feature', 'properties': feature.get('properties') or {},
+                                      'geometry': geometry}, separators=(',', ':')).encode('utf-8')
+                pack.write(encoded + FEATURE_SEPARATOR)
+                spans[level, index] = (offset, len(encoded))
+                offset += len(encoded) + len(FEATURE_SEPARATOR)
+        os.replace(f"{pack_path}.tmp", pack_path)
+
+    np.save(os.path.join(tiles_dir, 'index-bbox.npy'),
+            np.array([geometry_bbox(ft['geometry']) for ft in features], dtype=np.float64).reshape(-1, 4))
+    np.save(os.path.join(tiles_dir, 'index-spans.npy'), spans)
+
+    state_ranges = {}
+    for index, state in enumerate(states):
+        start, _ = state_ranges.get(state, (index, index))
+        state_ranges[state] = (start, index + 1)
+
+    meta = {
+        'version': TILES_VERSION,
+        'source': source_fingerprint(source_path),
+        'zooms': ZOOM_LEVELS,
+        'feature_count': len(features),
+        'states': {state: list(bounds) for state, bounds in state_ranges.items()},
+    }
+    # meta.json is written last: its presence marks a complete build
+    tmp_path = os.path.join(tiles_dir, 'meta.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, os.path.join(tiles_dir, 'meta.json'))
+    return meta
+
+
+def zoom_for_bbox(bbox):
+    """Zoom level at which a bbox spans about one viewport"""
+    span = max(bbox[2] - bbox[0], bbox[3] - bbox[1], 1e-9)
+    return math.log2(360.0 * VIEWPORT_PIXELS / (256 * span))
+
+
+class GeoTileStore:
+    """Read side: memory-mapped packs and index, with per-state and bbox selection"""
+
+    def __init__(self, tiles_dir=GEO_TILES_DIR, source_path=SOURCE_GEOJSON):
+        self.tiles_dir = tiles_dir
+        self.source_path = source_path
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _is_built(self, tiles_dir):
+        """meta.json of a complete build whose source still has the recorded size (a stat, no read)"""
+        meta = read_meta(tiles_dir)
+        if meta is None or meta.get('version') != TILES_VERSION:
+            return None
+        source = meta.get('source') or {}
+        if source.get('name') != os.path.basename(self.source_path) or source.get('size') != os.path.getsize(self.source_path):
+            return None
+        return meta
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            meta = self._is_built(self.tiles_dir)
+            if meta is None:
+                try:
+                    meta = build_tiles(self.source_path, self.tiles_dir)
+                except OSError:
+                    # Read-only deployments (e.g. serverless) build into a temp directory instead
+                    self.tiles_dir = os.path.join(tempfile.gettempdir(), 'dlc_geo_tiles')
+                    meta = self._is_built(self.tiles_dir) or build_tiles(self.source_path, self.tiles_dir)
+
+            self.meta = meta
+            self.zooms = meta['zooms']
+            self.states = {state_key(name): (name, tuple(bounds)) for name, bounds in meta['states'].items()}
+            self.bboxes = np.load(os.path.join(self.tiles_dir, 'index-bbox.npy'), mmap_mode='r')
+            self.spans = np.load(os.path.join(self.tiles_dir, 'index-spans.npy'), mmap_mode='r')
+            self.packs = []
+            for zoom in self.zooms:
+                with open(os.path.join(self.tiles_dir, f"pincodes-z{zoom}.bin"), 'rb') as f:
+                    size = os.fstat(f.fileno()).st_size
+                    self.packs.append(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b'')
+            self.etag = f"{meta['source']['sha256'][:16]}-v{TILES_VERSION}"
+            self._loaded = True
+
+    def level_for_zoom(self, zoom):
+        """Index of the coarsest built level that is detailed enough for the zoom"""
+        for level, built_zoom in enumerate(self.zooms):
+            if zoom <= built_zoom:
+                return level
+        return len(self.zooms) - 1
+
+    def state_names(self):
+        self._ensure_loaded()
+        return sorted(name for name, _ in self.states.values())
+
+    def query(self, state=None, bbox=None, zoom=None):
+        """FeatureCollection bytes for the features of a state and/or intersecting a bbox
+
+        Raises KeyError for an unknown state.
+        """
+        self._ensure_loaded()
+        start, end = 0, len(self.bboxes)
+        if state:
+            start, end = self.states[state_key(state)][1]
+
+        if zoom is None:
+            zoom = zoom_for_bbox(bbox) if bbox else self.zooms[-1]
+        level = self.level_for_zoom(zoom)
+        spans = self.spans[level, start:end]
+        present = spans[:, 1] > 0
+
+        pack = self.packs[level]
+        if bbox is None and present.all() and end > start:
+            # Whole state (or everything): one contiguous slice of the pack
+            first, last = spans[0], spans[-1]
+            body = pack[int(first[0]):int(last[0] + last[1])]
+        else:
+            selected = present
+            if bbox is not None:
+                boxes = self.bboxes[start:end]
+                min_lon, min_lat, max_lon, max_lat = bbox
+                selected = selected & (boxes[:, 0] <= max_lon) & (boxes[:, 2] >= min_lon) \
+                    & (boxes[:, 1] <= max_lat) & (boxes[:, 3] >= min_lat)
+            body = FEATURE_SEPARATOR.join(pack[int(o):int(o + n)] for o, n in spans[selected])
+        return COLLECTION_HEAD + body + COLLECTION_TAIL
+
+
+def parse_bbox(text):
+    """'min_lon,min_lat,max_lon,max_lat' → tuple of floats (ValueError if malformed)"""
+    parts = [float(p) for p in text.split(',')]
+    if len(parts) != 4 or not all(map(math.isfinite, parts)) or parts[0] > parts[2] or parts[1] > parts[3]:
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat")
+    return tuple(parts)
+
+
+if __name__ == "__main__":
+    print("🗺️ PINCODE BOUNDARY TILE BUILD")
+    print("=" * 60)
+    meta = build_tiles()
+    for zoom in meta['zooms']:
+        size = os.path.getsize(os.path.join(GEO_TILES_DIR, f"pincodes-z{zoom}.bin"))
+        print(f"✅ z{zoom}: {size / 1024:,.0f} KB")
+    print(f"\n💾 {meta['feature_count']} features in {len(meta['states'])} states → {GEO_TILES_DIR}")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Concurrent load test for the dashboard API
+Runs N client threads, each with its own keep-alive connection, cycling
+through the dashboard endpoints for a fixed time, then reports p50/p99
+latency per endpoint and overall. Compare serving modes with e.g.
+
+    python app.py                                        # Flask dev server
+    uvicorn asgi_app:application --port 5000             # ASGI mode
+    python load_test.py --url http://localhost:5000 --clients 32 --duration 20
+
+Add --slow to mix a client hammering the Excel-backed /pensioners route in,
+which shows whether one slow route holds up the others.
+"""
+
+import argparse
+import http.client
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+DASHBOARD_PATHS = [
+    '/api/dashboard/stats',
+    '/api/dashboard/age-distribution',
+    '/api/dashboard/state-wise-data',
+    '/api/dashboard/authentication-methods',
+    '/api/dashboard/verification-locations',
+    '/api/pensioners?per_page=50',
+    '/api/dlc-bank-pincode-data',
+]
+
+SLOW_PATH = '/pensioners'
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return float('nan')
+    rank = max(1, int(round(fraction * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def run_client(url, paths, deadline, latencies, errors, lock, offset=0):
+    parts = urlsplit(url)
+    connection = None
+    position = offset
+    local = defaultdict(list)
+    local_errors = defaultdict(int)
+    while time.perf_counter() < deadline:
+        path = paths[position % len(paths)]
+        position += 1
+        if connection is None:
+            connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+        started = time.perf_counter()
+        try:
+            connection.request('GET', path, headers={'Accept-Encoding': 'gzip'})
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                local_errors[path] += 1
+            else:
+                local[path].append(time.perf_counter() - started)
+            if response.getheader('Connection', '').lower() == 'close':
+                connection.close()
+                connection = None
+        except (OSError, http.client.HTTPException):
+            local_errors[path] += 1
+            connection.close()
+            connection = None
+    if connection is not None:
+        connection.close()
+    with lock:
+        for path, values in local.items():
+            latencies[path].extend(values)
+        for path, count in local_errors.items():
+            errors[path] += count
+
+
+def run_load_test(url, clients, duration, paths=DASHBOARD_PATHS, slow=False):
+    """{path: sorted latencies in seconds}, {path: error count} and elapsed time"""
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    threads = [threading.Thread(target=run_client, args=(url, paths, deadline, latencies, errors, lock, index))
+               for index in range(clients)]
+    if slow:
+        threads.append(threading.Thread(target=run_client,
+                                        args=(url, [SLOW_PATH], deadline, latencies, errors, lock)))
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return {path: sorted(values) for path, values in latencies.items()}, dict(errors), elapsed
+
+
+def print_report(latencies, errors, elapsed):
+    print(f"\n{'endpoint':44} {'requests':>9} {'errors':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    print("-" * 92)
+    dashboard = []
+    for path in sorted(set(latencies) | set(errors)):
+        values = latencies.get(path, [])
+        if path != SLOW_PATH:
+            dashboard.extend(values)
+        print(f"{path:44} {len(values):9,} {errors.get(path, 0):7,} "
+              f"{percentile(values, 0.50) * 1000:9.1f} {percentile(values, 0.99) * 1000:9.1f} "
+              f"{(values[-1] if values else float('nan')) * 1000:9.1f}")
+    dashboard.sort()
+    print("-" * 92)
+    print(f"{'dashboard endpoints':44} {len(dashboard):9,} {sum(errors.values()):7,} "
+          f"{percentile(dashboard, 0.50) * 1000:9.1f} {percentile(dashboard, 0.99) * 1000:9.1f} "
+          f"{(dashboard[-1] if dashboard else float('nan')) * 1000:9.1f}")
+    print(f"\n🚀 {len(dashboard) / elapsed:,.0f} dashboard requests/sec over {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent latency test for the dashboard API")
+    parser.add_argument('--url', default='http://localhost:5000', help="server base URL")
+    parser.add_argument('--clients', type=int, default=16, help="concurrent dashboard clients (default: 16)")
+    parser.add_argument('--duration', type=float, default=10, help="seconds to run (default: 10)")
+    parser.add_argument('--slow', action='store_true', help=f"add one client requesting {SLOW_PATH} in a loop")
+    args = parser.parse_args()
+
+    print(f"📈 {args.clients} clients against {args.url} for {args.duration:g}s"
+          f"{' plus one ' + SLOW_PATH + ' client' if args.slow else ''}")
+    print_report(*run_load_test(args.url, args.clients, args.duration, slow=args.slow))
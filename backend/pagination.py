@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Opaque keyset cursors for /api/pensioners
+A cursor is the (created_at, id) of the last row on a page, packed as
+URL-safe base64 JSON. Clients pass it back as ?after= to get the rows that
+follow, which SQLite answers with an index seek however deep the page is.
+"""
+
+import base64
+import json
+
+
+def encode_after(created_at, row_id):
+    """Cursor pointing just past the row with this created_at and id"""
+    raw = json.dumps([created_at, row_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_after(token):
+    """(created_at, id) from a cursor; raises ValueError if it was not made by encode_after"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        created_at, row_id = json.loads(raw)
+    except Exception:
+        raise ValueError(f"Invalid pagination cursor: {token!r}")
+    if not isinstance(created_at, str) or not isinstance(row_id, int) or isinstance(row_id, bool):
+        raise ValueError(f"Invalid pagination cursor: {token!r}")
+    return created_at, row_id
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Compact container for the bank-pincode DLC aggregates
+The analysis output keeps one nested dict per bank pincode, keyed by the same
+few age-group and state strings over and over. PincodeAggregates holds the
+same numbers as flat NumPy arrays, with strings interned into label lists:
+
+    pincodes        int32[N]        sorted bank pincodes; malformed ones
+                                    (e.g. '      ') are -1, -2, ... into odd_pincodes
+    totals          int32[N]        total_dlc_completed
+    unique_counts   int32[N]        unique_pensioner_count, -1 when absent
+    bank_states     int16[N]        code into state_labels ('state')
+    districts       int16[N]        code into district_labels, -1 when absent
+    age_counts      int32[N, A]     pincode x age_labels ('age_groups')
+    state_counts    int32[N, S]     pincode x state_labels ('pensioner_states')
+
+Saved as an uncompressed .npz (no pickled objects), so a full analysis of
+~12k pincodes is about 1.4 MB and loads in a few milliseconds.
+"""
+
+import json
+
+import numpy as np
+
+from pincode_lookup import INVALID_PINCODE, OTHER_STATE
+
+AGE_GROUP_LABELS = ['Below 60', '60-65', '66-70', '71-75', '76-80', '80+']
+
+ARRAY_FIELDS = ['pincodes', 'totals', 'unique_counts', 'bank_states', 'districts', 'age_counts', 'state_counts']
+
+# Pensioner states that are not redistributed into the state-wise rollup
+EXCLUDED_STATES = ('', INVALID_PINCODE, OTHER_STATE)
+
+
+class LabelCodes:
+    """Interns strings into small integer codes, in first-seen order"""
+
+    def __init__(self, labels=()):
+        self.labels = list(labels)
+        self._codes = {label: code for code, label in enumerate(self.labels)}
+
+    def code(self, label):
+        code = self._codes.get(label)
+        if code is None:
+            code = self._codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+
+class PincodeAggregates:
+    """Per-bank-pincode DLC counts as dense arrays (see module docstring)"""
+
+    def __init__(self, arrays, age_labels, state_labels, district_labels, odd_pincodes=(), meta=None):
+        for field in ARRAY_FIELDS:
+            setattr(self, field, arrays[field])
+        self.odd_pincodes = list(odd_pincodes)
+        self.age_labels = list(age_labels)
+        self.state_labels = list(state_labels)
+        self.district_labels = list(district_labels)
+        self.meta = dict(meta or {})
+
+    def __len__(self):
+        return len(self.pincodes)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, field).nbytes for field in ARRAY_FIELDS)
+
+    @classmethod
+    def from_bank_pincode_data(cls, bank_pincode_data, meta=None):
+        """Build from the analysis 'bank_pincode_data' dict"""
+        odd_pincodes = [key for key in bank_pincode_data if _pincode_number(key) is None]
+        numbers = {key: _pincode_number(key) for key in bank_pincode_data}
+        numbers.update({key: -1 - code for code, key in enumerate(odd_pincodes)})
+        pincodes = sorted(bank_pincode_data, key=numbers.get)
+        rows = len(pincodes)
+        ages = LabelCodes(AGE_GROUP_LABELS)
+        states = LabelCodes()
+        districts = LabelCodes()
+
+        totals = np.zeros(rows, dtype=np.int32)
+        unique_counts = np.full(rows, -1, dtype=np.int32)
+        bank_states = np.zeros(rows, dtype=np.int16)
+        district_codes = np.full(rows, -1, dtype=np.int16)
+        age_cells = []
+        state_cells = []
+        for row, pincode in enumerate(pincodes):
+            data = bank_pincode_data[pincode]
+            totals[row] = data['total_dlc_completed']
+            unique_counts[row] = data.get('unique_pensioner_count', -1)
+            bank_states[row] = states.code(data['state'])
+            if 'district' in data:
+                district_codes[row] = districts.code(data['district'])
+            age_cells.extend((row, ages.code(group), count) for group, count in data['age_groups'].items())
+            state_cells.extend((row, states.code(state), count)
+                               for state, count in data.get('pensioner_states', {}).items())
+
+        arrays = {
+            'pincodes': np.array([numbers[pincode] for pincode in pincodes], dtype=np.int32),
+            'totals': totals,
+            'unique_counts': unique_counts,
+            'bank_states': bank_states,
+            'districts': district_codes,
+            'age_counts': _dense(age_cells, rows, len(ages.labels)),
+            'state_counts': _dense(state_cells, rows, len(states.labels)),
+        }
+        return cls(arrays, ages.labels, states.labels, districts.labels, odd_pincodes, meta)
+
+    @classmethod
+    def from_analysis_file(cls, path):
+        """Build from a dlc_bank_analysis_*.json file"""
+        with open(path, 'r') as f:
+            analysis_data = json.load(f)
+        meta = {key: value for key, value in analysis_data.items() if key != 'bank_pincode_data'}
+        return cls.from_bank_pincode_data(analysis_data.get('bank_pincode_data', {}), meta)
+
+    def key(self, row):
+        """bank_pincode_data key of a row"""
+        number = int(self.pincodes[row])
+        return str(number) if number >= 0 else self.odd_pincodes[-1 - number]
+
+    def row(self, pincode):
+        """Row index of a bank pincode, or None"""
+        number = _pincode_number(str(pincode))
+        if number is None:
+            if pincode not in self.odd_pincodes:
+                return None
+            number = -1 - self.odd_pincodes.index(pincode)
+        row = int(np.searchsorted(self.pincodes, number))
+        if row < len(self.pincodes) and self.pincodes[row] == number:
+            return row
+        return None
+
+    def record(self, row):
+        """One pincode's entry in the bank_pincode_data shape"""
+        record = {
+            'total_dlc_completed': int(self.totals[row]),
+            'age_groups': _nonzero(self.age_counts[row], self.age_labels),
+            'state': self.state_labels[self.bank_states[row]],
+            'pensioner_states': _nonzero(self.state_counts[row], self.state_labels),
+        }
+        if self.districts[row] >= 0:
+            record['district'] = self.district_labels[self.districts[row]]
+        if self.unique_counts[row] >= 0:
+            record['unique_pensioner_count'] = int(self.unique_counts[row])
+        return record
+
+    def to_bank_pincode_data(self):
+        return {self.key(row): self.record(row) for row in range(len(self))}
+
+    def state_wise_data(self):
+        """Vectorized analysis_store.build_state_wise_data over the matrices"""
+        state_counts = self.state_counts.astype(np.int64)
+        age_counts = self.age_counts.astype(np.int64)
+        totals = self.totals.astype(np.int64)
+        has_total = totals > 0
+
+        # Age groups are spread over pensioner states in proportion, truncated per pincode
+        products = age_counts[has_total, :, None] * state_counts[has_total, None, :]
+        age_totals = (products / totals[has_total, None, None]).astype(np.int64).sum(axis=0)
+        age_present = ((age_counts > 0)[:, :, None] & (state_counts > 0)[:, None, :]
+                       & has_total[:, None, None]).any(axis=0)
+
+        bank_locations = np.zeros((len(self.state_labels), len(self.state_labels)), dtype=np.int64)
+        np.add.at(bank_locations, self.bank_states, state_counts)
+
+        state_wise_data = {}
+        for code, state in enumerate(self.state_labels):
+            if state in EXCLUDED_STATES or not (state_counts[:, code] > 0).any():
+                continue
+            state_wise_data[state] = {
+                'total_pensioners': int(state_counts[:, code].sum()),
+                'age_groups': {self.age_labels[a]: int(age_totals[a, code])
+                               for a in np.flatnonzero(age_present[:, code])},
+                'bank_locations': _nonzero(bank_locations[:, code], self.state_labels),
+                'pincode_counts': {}
+            }
+        return state_wise_data
+
+    def save(self, path):
+        """Write an uncompressed .npz (labels and meta travel as a JSON string)"""
+        header = json.dumps({
+            'age_labels': self.age_labels,
+            'state_labels': self.state_labels,
+            'district_labels': self.district_labels,
+            'odd_pincodes': self.odd_pincodes,
+            'meta': self.meta,
+        })
+        with open(path, 'wb') as f:
+            np.savez(f, header=np.array(header), **{field: getattr(self, field) for field in ARRAY_FIELDS})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as npz:
+            header = json.loads(str(npz['header']))
+            arrays = {field: npz[field] for field in ARRAY_FIELDS}
+        return cls(arrays, header['age_labels'], header['state_labels'], header['district_labels'],
+                   header['odd_pincodes'], header['meta'])
+
+
+def _pincode_number(key):
+    """Integer value of a canonical numeric pincode key, else None"""
+    if key.isdigit() and str(int(key)) == key and int(key) < 2 ** 31:
+        return int(key)
+    return None
+
+
+def _dense(cells, rows, columns):
+    matrix = np.zeros((rows, columns), dtype=np.int32)
+    if cells:
+        row, column, count = np.array(cells, dtype=np.int64).T
+        matrix[row, column] = count
+    return matrix
+
+
+def _nonzero(counts, labels):
+    return {labels[code]: int(counts[code]) for code in np.flatnonzero(counts)}
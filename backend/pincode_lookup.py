@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Shared pincode → state/district lookup
+One canonical mapping used by every analyzer and API instead of per-module
+if/elif chains. States and districts are precomputed into 1000-entry tables
+indexed by the 3-digit pincode prefix, with exact 6-digit overrides taken
+from the Circle/Division properties of Filtered_Pincode_Boundaries.geojson.
+
+Scalar lookups are O(1); the array functions resolve millions of pincodes
+in one call by resolving each distinct value once and gathering with NumPy.
+"""
+
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+BOUNDARIES_GEOJSON = os.path.join(REPO_ROOT, 'Filtered_Pincode_Boundaries.geojson')
+
+OTHER_STATE = 'Other State'
+INVALID_PINCODE = 'Invalid Pincode'
+OTHER_DISTRICT = 'Other District'
+UNKNOWN_DISTRICT = 'Unknown District'
+
+# Table slots after the 1000 prefixes: non-numeric/short pincodes, and numeric
+# prefixes outside 000-999 (e.g. '-12')
+INVALID_PREFIX = 1000
+OUT_OF_RANGE_PREFIX = 1001
+
+# Canonical 3-digit prefix ranges (inclusive). Later entries override earlier
+# ones, so carve-outs such as Goa inside Maharashtra follow the broad range.
+STATE_PREFIX_RANGES = [
+    (110, 110, 'Delhi'),
+    (121, 136, 'Haryana'),
+    (140, 160, 'Punjab'),
+    (160, 160, 'Chandigarh'),
+    (171, 177, 'Himachal Pradesh'),
+    (180, 193, 'Jammu and Kashmir'),
+    (194, 194, 'Ladakh'),
+    (201, 285, 'Uttar Pradesh'),
+    (246, 246, 'Uttarakhand'),
+    (248, 249, 'Uttarakhand'),
+    (262, 263, 'Uttarakhand'),
+    (301, 345, 'Rajasthan'),
+    (360, 396, 'Gujarat'),
+    (400, 445, 'Maharashtra'),
+    (403, 403, 'Goa'),
+    (450, 488, 'Madhya Pradesh'),
+    (490, 497, 'Chhattisgarh'),
+    (500, 509, 'Telangana'),
+    (515, 535, 'Andhra Pradesh'),
+    (560, 591, 'Karnataka'),
+    (600, 643, 'Tamil Nadu'),
+    (605, 605, 'Puducherry'),
+    (670, 695, 'Kerala'),
+    (700, 743, 'West Bengal'),
+    (737, 737, 'Sikkim'),
+    (744, 744, 'Andaman and Nicobar Islands'),
+    (751, 770, 'Odisha'),
+    (781, 788, 'Assam'),
+    (790, 792, 'Arunachal Pradesh'),
+    (793, 794, 'Meghalaya'),
+    (795, 795, 'Manipur'),
+    (796, 796, 'Mizoram'),
+    (797, 798, 'Nagaland'),
+    (799, 799, 'Tripura'),
+    (800, 855, 'Bihar'),
+    (814, 816, 'Jharkhand'),
+    (822, 822, 'Jharkhand'),
+    (825, 829, 'Jharkhand'),
+    (831, 835, 'Jharkhand'),
+]
+
+DISTRICT_PREFIX_RANGES = [
+    (110, 110, 'Delhi'),
+    (208, 209, 'Kanpur'),
+    (221, 222, 'Varanasi'),
+    (226, 227, 'Lucknow'),
+    (282, 283, 'Agra'),
+    (301, 301, 'Alwar'),
+    (302, 303, 'Jaipur'),
+    (313, 313, 'Udaipur'),
+    (321, 321, 'Bharatpur'),
+    (324, 325, 'Kota'),
+    (334, 334, 'Bikaner'),
+    (342, 344, 'Jodhpur'),
+    (360, 360, 'Rajkot'),
+    (361, 361, 'Jamnagar'),
+    (364, 364, 'Bhavnagar'),
+    (380, 382, 'Ahmedabad'),
+    (383, 389, 'Gandhinagar'),
+    (390, 396, 'Vadodara'),
+    (400, 402, 'Mumbai'),
+    (421, 421, 'Mumbai'),
+    (410, 414, 'Pune'),
+    (422, 425, 'Nashik'),
+    (431, 431, 'Aurangabad'),
+    (440, 445, 'Nagpur'),
+    (500, 500, 'Hyderabad'),
+    (560, 562, 'Bangalore'),
+    (570, 571, 'Mysore'),
+    (575, 576, 'Mangalore'),
+    (580, 582, 'Hubli'),
+    (600, 603, 'Chennai'),
+    (620, 621, 'Tiruchirappalli'),
+    (625, 626, 'Madurai'),
+    (641, 642, 'Coimbatore'),
+    (700, 710, 'Kolkata'),
+    (711, 711, 'Howrah'),
+    (712, 712, 'Hooghly'),
+    (800, 801, 'Patna'),
+    (812, 813, 'Bhagalpur'),
+    (823, 824, 'Gaya'),
+    (826, 828, 'Dhanbad'),
+    (834, 835, 'Ranchi'),
+    (842, 843, 'Muzaffarpur'),
+]
+
+# Postal circle names in the boundary file that differ from the state names above
+CIRCLE_STATE_NAMES = {'Tamilnadu': 'Tamil Nadu'}
+
+
+def _build_prefix_table(ranges, default, invalid):
+    """Expand prefix ranges into a lookup array indexed by prefix (plus the two special slots)"""
+    table = np.full(1002, default, dtype=object)
+    for start, end, name in ranges:
+        table[start:end + 1] = name
+    table[INVALID_PREFIX] = invalid
+    return table
+
+
+STATE_BY_PREFIX = _build_prefix_table(STATE_PREFIX_RANGES, OTHER_STATE, INVALID_PINCODE)
+DISTRICT_BY_PREFIX = _build_prefix_table(DISTRICT_PREFIX_RANGES, OTHER_DISTRICT, UNKNOWN_DISTRICT)
+
+
+@lru_cache(maxsize=1)
+def exact_pincode_locations():
+    """6-digit pincode → (state, district) from the boundary GeoJSON, loaded on first use"""
+    try:
+        with open(BOUNDARIES_GEOJSON, 'r', encoding='utf-8') as f:
+            features = json.load(f).get('features', [])
+    except (OSError, ValueError):
+        return {}
+
+    locations = {}
+    for feature in features:
+        props = feature.get('properties') or {}
+        pincode = str(props.get('Pincode', '')).strip()
+        circle = str(props.get('Circle') or '').strip()
+        division = str(props.get('Division') or '').strip()
+        if len(pincode) == 6 and pincode.isdigit() and circle:
+            locations[pincode] = (CIRCLE_STATE_NAMES.get(circle, circle), division or None)
+    return locations
+
+
+def _prefix_index(pin_str):
+    """Lookup-table slot for an already cleaned pincode string"""
+    if len(pin_str) < 3:
+        return INVALID_PREFIX
+    try:
+        prefix = int(pin_str[:3])
+    except ValueError:
+        return INVALID_PREFIX
+    return prefix if 0 <= prefix <= 999 else OUT_OF_RANGE_PREFIX
+
+
+def _clean(pincode):
+    """Text form of a pincode with the float suffix from Excel removed"""
+    return str(pincode).replace('.0', '')
+
+
+def _state_for_text(pin_str):
+    exact = exact_pincode_locations().get(pin_str)
+    return exact[0] if exact else STATE_BY_PREFIX[_prefix_index(pin_str)]
+
+
+def _district_for_text(pin_str):
+    exact = exact_pincode_locations().get(pin_str)
+    if exact and exact[1]:
+        return exact[1]
+    return DISTRICT_BY_PREFIX[_prefix_index(pin_str)]
+
+
+def state_for_pincode(pincode):
+    """State for a single pincode (str, int or float from Excel)"""
+    return _state_for_text(_clean(pincode))
+
+
+def district_for_pincode(pincode):
+    """District for a single pincode (str, int or float from Excel)"""
+    return _district_for_text(_clean(pincode))
+
+
+@lru_cache(maxsize=1)
+def _exact_arrays():
+    """Sorted 6-digit override keys with their states and districts, for array lookups"""
+    locations = exact_pincode_locations()
+    keys = sorted(locations)
+    return (
+        np.array([int(k) for k in keys], dtype=np.int64),
+        np.array([locations[k][0] for k in keys], dtype=object),
+        np.array([locations[k][1] for k in keys], dtype=object),
+    )
+
+
+def _resolve_numeric(values, prefix_table, field):
+    """Gather lookups for whole-number 6-digit pincodes straight from their integer value"""
+    pins = values.astype(np.int64)
+    result = prefix_table[pins // 1000]
+    keys, states, districts = _exact_arrays()
+    if len(keys):
+        overrides = states if field == 0 else districts
+        slots = np.minimum(np.searchsorted(keys, pins), len(keys) - 1)
+        hit = keys[slots] == pins
+        replacement = overrides[slots]
+        hit &= replacement != None  # noqa: E711 (elementwise on an object array)
+        result[hit] = replacement[hit]
+    return result
+
+
+def _resolve_array(pincodes, resolve_text, prefix_table, field):
+    """Resolve an array of pincodes: integer arithmetic for plain 6-digit numbers,
+    and each distinct remaining value once via its text form"""
+    values = np.asarray(pincodes)
+    result = np.empty(values.shape, dtype=object)
+    if values.size == 0:
+        return result
+
+    if values.dtype.kind in 'iuf':
+        with np.errstate(invalid='ignore'):
+            numeric = (values >= 100000) & (values <= 999999) & (np.floor(values) == values)
+        result[numeric] = _resolve_numeric(values[numeric], prefix_table, field)
+        rest = ~numeric
+    else:
+        rest = np.ones(values.shape, dtype=bool)
+
+    if rest.any():
+        text = np.char.replace(values[rest].astype(str), '.0', '')
+        uniques, inverse = np.unique(text, return_inverse=True)
+        resolved = np.array([resolve_text(str(u)) for u in uniques], dtype=object)
+        result[rest] = resolved[inverse.ravel()]
+    return result
+
+
+def states_for_pincodes(pincodes):
+    """Vectorized state_for_pincode over an array, list or Series of pincodes"""
+    return _resolve_array(pincodes, _state_for_text, STATE_BY_PREFIX, 0)
+
+
+def districts_for_pincodes(pincodes):
+    """Vectorized district_for_pincode over an array, list or Series of pincodes"""
+    return _resolve_array(pincodes, _district_for_text, DISTRICT_BY_PREFIX, 1)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Cold-start bundle for the serverless API
+Builds every artifact api/index.py answers from, so a fresh function instance
+never parses a workbook or a multi-megabyte GeoJSON before its first response:
+
+    dashboard_aggregates.json      exact dashboard totals (dashboard_aggregates.py)
+    bundle/<geo file>.gz           boundary files, gzip -9, served as stored
+    bundle/geo_sources.json        size and hash of each boundary file when it was gzipped
+    geo_tiles/, topojson/          simplified boundaries (geo_tiles.py, topology_build.py)
+
+All of these are committed and deployed with the API, so no route parses a
+workbook or simplifies a boundary on a cold start. A gzipped copy whose
+source file no longer has the recorded size is not served; the raw file is
+sent instead. Build (or refresh after changing the
+workbooks or boundaries) with:
+    python serverless_bundle.py
+and check that the committed bundle still matches its sources with:
+    python serverless_bundle.py --check
+"""
+
+import argparse
+import gzip
+import json
+import os
+import shutil
+import sys
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+BUNDLE_DIR = os.environ.get('DLC_BUNDLE_DIR', os.path.join(REPO_ROOT, 'bundle'))
+
+# Boundary files served whole by api/index.py (missing ones are skipped)
+GEO_FILES = [
+    'india.json',
+    'Filtered_Pincode_Boundaries.geojson',
+    'All_India_pincode_Boundary.geojson',
+    'Real_Pensioner_Pincode_Boundaries.geojson',
+]
+
+
+def gzip_path(name, bundle_dir=BUNDLE_DIR):
+    return os.path.join(bundle_dir, f"{name}.gz")
+
+
+def sources_path(bundle_dir=BUNDLE_DIR):
+    return os.path.join(bundle_dir, 'geo_sources.json')
+
+
+def recorded_sources(bundle_dir=BUNDLE_DIR):
+    """{name: fingerprint} of the boundary files the bundle was built from"""
+    try:
+        with open(sources_path(bundle_dir), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def bundled_gzip(name, source_path=None, bundle_dir=BUNDLE_DIR):
+    """Pre-gzipped copy of a boundary file, or None when it is not in the bundle
+
+    When the source file is present, its gzipped copy is only used while the
+    source still has the size recorded at build time.
+    """
+    path = gzip_path(name, bundle_dir)
+    if not os.path.exists(path):
+        return None
+    if source_path and os.path.exists(source_path):
+        recorded = recorded_sources(bundle_dir).get(name)
+        if recorded is None or recorded['size'] != os.path.getsize(source_path):
+            return None
+    return path
+
+
+def gzip_file(source_path, out_path):
+    """Deterministic gzip -9 copy (no name or mtime in the header, so rebuilds are byte-identical)"""
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = f"{out_path}.tmp"
+    with open(source_path, 'rb') as src, open(tmp_path, 'wb') as raw:
+        with gzip.GzipFile(filename='', mode='wb', fileobj=raw, compresslevel=9, mtime=0) as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def build_geo_files(source_dir=REPO_ROOT, bundle_dir=BUNDLE_DIR):
+    """Gzip every boundary file present; returns {name: (raw bytes, gzipped bytes)}"""
+    from dashboard_aggregates import workbook_fingerprint
+
+    sizes = {}
+    sources = {}
+    for name in GEO_FILES:
+        source_path = os.path.join(source_dir, name)
+        if not os.path.exists(source_path):
+            continue
+        out_path = gzip_file(source_path, gzip_path(name, bundle_dir))
+        sizes[name] = (os.path.getsize(source_path), os.path.getsize(out_path))
+        sources[name] = workbook_fingerprint(source_path)
+
+    tmp_path = f"{sources_path(bundle_dir)}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(sources, f, indent=1, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp_path, sources_path(bundle_dir))
+    return sizes
+
+
+def stale_geo_files(source_dir=REPO_ROOT, bundle_dir=BUNDLE_DIR):
+    """Names of boundary files whose gzipped copy is missing or was built from different content"""
+    from dashboard_aggregates import workbook_fingerprint
+
+    recorded = recorded_sources(bundle_dir)
+    stale = []
+    for name in GEO_FILES:
+        source_path = os.path.join(source_dir, name)
+        if not os.path.exists(source_path):
+            continue
+        if not os.path.exists(gzip_path(name, bundle_dir)) or recorded.get(name) != workbook_fingerprint(source_path):
+            stale.append(name)
+    return stale
+
+
+def build_bundle():
+    from dashboard_aggregates import build_dashboard_aggregates, is_current, write_dashboard_aggregates
+    from geo_tiles import build_tiles
+    from topology_build import build_all
+
+    if is_current():
+        print("✅ dashboard_aggregates.json matches the workbooks")
+    else:
+        path = write_dashboard_aggregates(build_dashboard_aggregates())
+        print(f"✅ Rebuilt {path}")
+
+    for name, (raw_size, gz_size) in build_geo_files().items():
+        print(f"✅ {name}: {raw_size / 1024:,.0f} KB → {gz_size / 1024:,.0f} KB gzipped")
+
+    meta = build_tiles()
+    print(f"✅ {meta['feature_count']} pincode boundaries tiled")
+    build_all()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the serverless cold-start bundle")
+    parser.add_argument('--check', action='store_true', help="exit 1 if the committed bundle is out of date")
+    args = parser.parse_args()
+
+    if args.check:
+        from dashboard_aggregates import is_current
+        from geo_tiles import tiles_are_current
+        from topology_build import stale_topologies
+
+        stale = stale_geo_files()
+        if not is_current():
+            stale.insert(0, 'dashboard_aggregates.json')
+        if not tiles_are_current():
+            stale.append('geo_tiles/')
+        stale += [f"topojson/{name}" for name in stale_topologies()]
+        for name in stale:
+            print(f"❌ {name} is missing or out of date")
+        if stale:
+            print("💡 Rebuild with: python serverless_bundle.py")
+            sys.exit(1)
+        print("✅ Bundle matches its sources")
+        sys.exit(0)
+
+    print("📦 SERVERLESS BUNDLE BUILD")
+    print("=" * 60)
+    build_bundle()
+    print(f"\n💾 Bundle ready in {BUNDLE_DIR}")
@@ -3,6 +3,8 @@ import os
 from collections import defaultdict
 from datetime import datetime
 import json
+from excel_cache import load_workbook
+from pincode_lookup import states_for_pincodes
 
 def analyze_excel_sample():
     """Analyze Excel files with basic Python libraries"""
@@ -40,7 +42,7 @@ def analyze_excel_sample():
         
         # Get full row count (this might take time for large files)
         print(f"\nGetting row count...")
-        df_full = pd.read_excel(first_file)
+        df_full = load_workbook(first_file)
         print(f"Total rows in {excel_files[0]}: {len(df_full):,}")
         
         # Analyze key columns if they exist
@@ -77,27 +79,7 @@ def analyze_excel_sample():
         if 'BRANCH_PINCODE' in df_full.columns:
             print(f"\nState Analysis (based on BRANCH_PINCODE):")
             
-            def get_state_from_pincode(pincode):
-                try:
-                    pin_str = str(pincode).replace('.0', '')
-                    if len(pin_str) >= 3:
-                        pin_num = int(pin_str[:3])
-                        if 301 <= pin_num <= 345: return 'Rajasthan'
-                        elif 360 <= pin_num <= 396: return 'Gujarat'
-                        elif 400 <= pin_num <= 445: return 'Maharashtra'
-                        elif 560 <= pin_num <= 591: return 'Karnataka'
-                        elif 201 <= pin_num <= 285: return 'Uttar Pradesh'
-                        elif 110 <= pin_num <= 140: return 'Delhi'
-                        elif 600 <= pin_num <= 643: return 'Tamil Nadu'
-                        elif 700 <= pin_num <= 743: return 'West Bengal'
-                        elif 500 <= pin_num <= 509: return 'Telangana'
-                        elif 800 <= pin_num <= 855: return 'Bihar'
-                        else: return 'Other State'
-                    return 'Invalid Pincode'
-                except:
-                    return 'Invalid Pincode'
-            
-            df_full['BANK_STATE'] = df_full['BRANCH_PINCODE'].apply(get_state_from_pincode)
+            df_full['BANK_STATE'] = states_for_pincodes(df_full['BRANCH_PINCODE'])
             state_counts = df_full['BANK_STATE'].value_counts()
             
             print("  Top 10 states by bank verification count:")
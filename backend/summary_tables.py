@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Materialized dashboard summaries for pension_data.db
+Small pre-grouped tables that the dashboard routes read instead of scanning
+the pensioners table. They are rebuilt in one transaction after each load
+(load_excel_data, generate_sample_data) and when migration 2 creates them.
+
+    summary_verification_daily   status x last_verification: counts and amount
+    summary_state_status         state x status: counts and amount (for averages)
+    summary_district_status      district x state x status: counts
+    summary_auth_age             authentication method x exact age: counts
+"""
+
+SUMMARY_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS summary_verification_daily (
+        status TEXT,
+        last_verification DATE,
+        pensioners INTEGER NOT NULL,
+        amount_total REAL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS summary_state_status (
+        state TEXT,
+        status TEXT,
+        pensioners INTEGER NOT NULL,
+        amount_total REAL,
+        amount_count INTEGER NOT NULL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS summary_district_status (
+        district TEXT,
+        state TEXT,
+        status TEXT,
+        pensioners INTEGER NOT NULL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS summary_auth_age (
+        authentication_method TEXT,
+        age INTEGER,
+        pensioners INTEGER NOT NULL
+    )
+    ''',
+]
+
+# (table, SELECT that produces its rows from pensioners)
+SUMMARY_REFRESH = [
+    ('summary_verification_daily', '''
+        SELECT status, last_verification, COUNT(*), SUM(amount)
+        FROM pensioners GROUP BY status, last_verification
+    '''),
+    ('summary_state_status', '''
+        SELECT state, status, COUNT(*), SUM(amount), COUNT(amount)
+        FROM pensioners GROUP BY state, status
+    '''),
+    ('summary_district_status', '''
+        SELECT district, state, status, COUNT(*)
+        FROM pensioners GROUP BY district, state, status
+    '''),
+    ('summary_auth_age', '''
+        SELECT authentication_method, age, COUNT(*)
+        FROM pensioners GROUP BY authentication_method, age
+    '''),
+]
+
+
+def create_summary_tables(conn):
+    for statement in SUMMARY_SCHEMA:
+        conn.execute(statement)
+
+
+def rebuild_summaries(conn):
+    """Replace every summary table's rows (runs inside the caller's transaction)"""
+    for table, select in SUMMARY_REFRESH:
+        conn.execute(f"DELETE FROM {table}")
+        conn.execute(f"INSERT INTO {table} {select}")
+
+
+def refresh_summary_tables(conn):
+    """Rebuild the summaries from pensioners in one transaction"""
+    with conn:
+        create_summary_tables(conn)
+        rebuild_summaries(conn)
+    print("📊 Dashboard summary tables refreshed")
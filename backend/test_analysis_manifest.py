@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Incremental re-analysis test
+Adds, modifies and deletes small workbooks between runs and checks the
+manifest-backed totals always match a full re-parse of the folder
+"""
+
+import os
+import tempfile
+
+from analysis_manifest import AnalysisManifest
+from dlc_bank_pincode_analyzer import build_bank_pincode_data, collect_key_counts, update_key_counts
+from excel_cache import list_workbooks
+from workbook_fixtures import write_workbook
+
+
+def assert_matches_full_run(folder, manifest_dir):
+    file_paths = list_workbooks(folder)
+    incremental = update_key_counts(file_paths, AnalysisManifest(manifest_dir))
+    full = collect_key_counts(file_paths)
+    assert build_bank_pincode_data(incremental) == build_bank_pincode_data(full)
+    return AnalysisManifest(manifest_dir)
+
+
+def test_incremental_runs_match_full_runs():
+    with tempfile.TemporaryDirectory() as folder, tempfile.TemporaryDirectory() as manifest_dir:
+        write_workbook(folder, 'month_1.xlsx', [
+            [302001, 302012, 1950], [302001, 302012, 1950], [560001, 560034, 1945],
+        ])
+        write_workbook(folder, 'month_2.xlsx', [
+            [302001, 302013, 1958], [110001, 110085, 1962],
+        ])
+        manifest = assert_matches_full_run(folder, manifest_dir)
+        assert sorted(manifest.files) == ['month_1.xlsx', 'month_2.xlsx']
+
+        # New monthly file: only it is parsed, existing partials are reused
+        write_workbook(folder, 'month_3.xlsx', [[302001, 302012, 1950], [800001, 800020, 1940]])
+        unchanged, changed, removed, _ = manifest.plan(list_workbooks(folder))
+        assert [os.path.basename(p) for p in changed] == ['month_3.xlsx']
+        assert len(unchanged) == 2 and removed == []
+        manifest = assert_matches_full_run(folder, manifest_dir)
+
+        # Modified file: old contribution is replaced
+        write_workbook(folder, 'month_1.xlsx', [[560001, 560034, 1945]])
+        manifest = assert_matches_full_run(folder, manifest_dir)
+
+        # Deleted file: its contribution is subtracted
+        os.remove(os.path.join(folder, 'month_2.xlsx'))
+        manifest = assert_matches_full_run(folder, manifest_dir)
+        assert sorted(manifest.files) == ['month_1.xlsx', 'month_3.xlsx']
+        assert len(os.listdir(manifest.partials_dir)) == 2
+
+
+def test_missing_partial_rebuilds_totals():
+    with tempfile.TemporaryDirectory() as folder, tempfile.TemporaryDirectory() as manifest_dir:
+        write_workbook(folder, 'month_1.xlsx', [[302001, 302012, 1950], [560001, 560034, 1945]])
+        write_workbook(folder, 'month_2.xlsx', [[302001, 302013, 1958], [110001, 110085, 1962]])
+        manifest = assert_matches_full_run(folder, manifest_dir)
+
+        # The totals still hold month_1's counts, but its partial is gone
+        os.remove(os.path.join(manifest.partials_dir, manifest.files['month_1.xlsx']['partial']))
+        assert os.path.exists(manifest.totals_path)
+        assert_matches_full_run(folder, manifest_dir)
+
+        # Same for a removed workbook whose partial is missing
+        manifest = AnalysisManifest(manifest_dir)
+        os.remove(os.path.join(manifest.partials_dir, manifest.files['month_2.xlsx']['partial']))
+        os.remove(os.path.join(folder, 'month_2.xlsx'))
+        assert_matches_full_run(folder, manifest_dir)
+
+
+if __name__ == "__main__":
+    test_incremental_runs_match_full_runs()
+    test_missing_partial_rebuilds_totals()
+    print("✅ Incremental re-analysis matches a full re-parse")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Background analysis scheduler test
+Drives AnalysisScheduler with a stand-in analysis job and checks that it runs
+only after a workbook change has settled, swaps the new snapshot into the
+store, survives a restart without re-running, keeps serving the previous
+snapshot when a run fails and runs again for a trigger() from another thread
+that arrives mid-run
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from analysis_scheduler import AnalysisScheduler
+from analysis_store import DlcAnalysisStore
+from test_pincode_aggregates import sample_bank_pincode_data
+
+
+def write_workbook(folder, name, content):
+    with open(os.path.join(folder, name), 'w') as f:
+        f.write(content)
+
+
+def test_refresh_after_change_settles():
+    data = sample_bank_pincode_data(40)
+    calls = []
+
+    def analyze(file_paths):
+        calls.append(sorted(os.path.basename(path) for path in file_paths))
+        return data, 1234
+
+    with tempfile.TemporaryDirectory() as excel_folder, tempfile.TemporaryDirectory() as analysis_dir:
+        write_workbook(excel_folder, 'GAD_DLC_PINCODE_DATA_1.xlsx', 'one')
+        store = DlcAnalysisStore(analysis_dir)
+        swapped = []
+        scheduler = AnalysisScheduler(store, excel_folder, analyze=analyze, on_swap=swapped.append)
+
+        assert not scheduler.check()  # change seen, waiting for it to settle
+        assert scheduler.check()
+        assert calls == [['GAD_DLC_PINCODE_DATA_1.xlsx']]
+        assert store.get() is swapped[0]
+        assert store.get().payload['bank_pincode_data'] == data
+        status = scheduler.status()
+        assert status['runs'] == 1 and status['last_duration_seconds'] is not None
+        assert not scheduler.check()
+
+        # A restarted process sees the same workbooks recorded in the snapshot
+        assert not AnalysisScheduler(DlcAnalysisStore(analysis_dir), excel_folder, analyze=analyze).check()
+
+        write_workbook(excel_folder, 'GAD_DLC_PINCODE_DATA_2.xlsx', 'two')
+        assert not scheduler.check()
+        assert scheduler.check()
+        assert calls[-1] == ['GAD_DLC_PINCODE_DATA_1.xlsx', 'GAD_DLC_PINCODE_DATA_2.xlsx']
+
+
+def test_hand_written_analysis_kept_until_workbooks_change():
+    data = sample_bank_pincode_data(40)
+    with tempfile.TemporaryDirectory() as excel_folder, tempfile.TemporaryDirectory() as analysis_dir:
+        write_workbook(excel_folder, 'GAD_DLC_PINCODE_DATA_1.xlsx', 'one')
+        with open(os.path.join(analysis_dir, 'dlc_bank_analysis_20250825_120946.json'), 'w') as f:
+            json.dump({'analysis_timestamp': '2025-08-25 12:09:46', 'bank_pincode_data': data}, f)
+        scheduler = AnalysisScheduler(DlcAnalysisStore(analysis_dir), excel_folder, analyze=lambda paths: (data, 1))
+        assert not scheduler.check() and not scheduler.check()
+
+        write_workbook(excel_folder, 'GAD_DLC_PINCODE_DATA_2.xlsx', 'two')
+        assert not scheduler.check()
+        assert scheduler.check()
+
+
+def test_failed_run_keeps_previous_snapshot():
+    data = sample_bank_pincode_data(40)
+    results = [(data, 10)]
+
+    def analyze(file_paths):
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    with tempfile.TemporaryDirectory() as excel_folder, tempfile.TemporaryDirectory() as analysis_dir:
+        write_workbook(excel_folder, 'GAD_DLC_PINCODE_DATA_1.xlsx', 'one')
+        store = DlcAnalysisStore(analysis_dir)
+        scheduler = AnalysisScheduler(store, excel_folder, analyze=analyze)
+        scheduler.trigger()
+        assert scheduler.check()
+        previous = store.get()
+
+        results.append(RuntimeError('workbook is corrupt'))
+        scheduler.trigger()
+        assert not scheduler.check()
+        status = scheduler.status()
+        assert status['state'] == 'failed' and status['last_error'] == 'workbook is corrupt'
+        assert status['failures'] == 1
+        assert store.get().path == previous.path
+
+
+def test_trigger_during_run_is_kept():
+    data = sample_bank_pincode_data(40)
+    runs = []
+
+    with tempfile.TemporaryDirectory() as excel_folder, tempfile.TemporaryDirectory() as analysis_dir:
+        write_workbook(excel_folder, 'GAD_DLC_PINCODE_DATA_1.xlsx', 'one')
+        scheduler = AnalysisScheduler(DlcAnalysisStore(analysis_dir), excel_folder)
+
+        def analyze(file_paths):
+            runs.append(len(runs))
+            if len(runs) == 1:
+                # A request thread asks for a re-run while this one is in progress
+                request = threading.Thread(target=scheduler.trigger)
+                request.start()
+                request.join()
+            return data, 1
+
+        scheduler.analyze = analyze
+        scheduler.trigger()
+        assert scheduler.check()
+        assert scheduler.check()
+        assert not scheduler.check()
+        assert runs == [0, 1]
+
+
+def test_background_thread_runs_job():
+    data = sample_bank_pincode_data(40)
+    with tempfile.TemporaryDirectory() as excel_folder, tempfile.TemporaryDirectory() as analysis_dir:
+        write_workbook(excel_folder, 'GAD_DLC_PINCODE_DATA_1.xlsx', 'one')
+        store = DlcAnalysisStore(analysis_dir)
+        scheduler = AnalysisScheduler(store, excel_folder, interval=0.05, analyze=lambda paths: (data, 1)).start()
+        try:
+            deadline = time.time() + 5
+            while scheduler.status()['runs'] == 0 and time.time() < deadline:
+                time.sleep(0.02)
+            assert scheduler.status()['runs'] == 1
+            assert scheduler.status()['state'] == 'idle'
+        finally:
+            scheduler.stop(timeout=5)
+        assert scheduler.status()['state'] == 'stopped'
+
+
+if __name__ == "__main__":
+    test_refresh_after_change_settles()
+    test_hand_written_analysis_kept_until_workbooks_change()
+    test_failed_run_keeps_previous_snapshot()
+    test_trigger_during_run_is_kept()
+    test_background_thread_runs_job()
+    print("✅ Background analysis refreshes and swaps snapshots off the request path")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Binary analysis snapshot test
+Round-trips an analysis through a .dlcsnap file, checks that damaged or newer
+files are rejected, that retention keeps the newest runs and that the store
+prefers a snapshot over the JSON file of the same run
+"""
+
+import json
+import os
+import struct
+import tempfile
+
+from analysis_snapshot import (
+    HEADER, SNAPSHOT_VERSION, convert_json, load_analysis_data, prune_snapshots, read_snapshot,
+    save_analysis_snapshot
+)
+from analysis_store import DlcAnalysisStore
+from test_pincode_aggregates import sample_bank_pincode_data
+
+def assert_rejected(path, message):
+    try:
+        read_snapshot(path)
+    except ValueError as e:
+        assert message in str(e), e
+    else:
+        raise AssertionError(f"{path} was accepted")
+
+
+META = {'analysis_timestamp': '2025-08-25 12:09:46', 'total_records_processed': 1234}
+
+
+def test_snapshot_round_trip_and_query_in_place():
+    data = sample_bank_pincode_data()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = save_analysis_snapshot(data, META, os.path.join(tmp, 'dlc_bank_analysis_20250825_120946.dlcsnap'))
+        aggregates = read_snapshot(path)
+        assert not aggregates.age_counts.flags.writeable  # a view of the mapped file
+        some_pincode = next(iter(data))
+        assert aggregates.record(aggregates.row(some_pincode)) == data[some_pincode]
+        assert load_analysis_data(path) == dict(META, bank_pincode_data=data)
+
+
+def test_damaged_and_newer_snapshots_rejected():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = save_analysis_snapshot(sample_bank_pincode_data(), META, os.path.join(tmp, 'run.dlcsnap'))
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        with open(path, 'wb') as f:
+            f.write(content[:-100])
+        assert_rejected(path, 'truncated')
+
+        with open(path, 'wb') as f:
+            f.write(content[:8] + struct.pack('<H', SNAPSHOT_VERSION + 1) + content[10:])
+        assert_rejected(path, 'supports up to')
+
+        with open(path, 'wb') as f:
+            f.write(b'{"bank_pincode_data": {}}'.ljust(HEADER.size))
+        assert_rejected(path, 'not a DLC snapshot')
+
+
+def test_retention_and_store_preference():
+    data = sample_bank_pincode_data(50)
+    with tempfile.TemporaryDirectory() as tmp:
+        for run in ('20250101_000000', '20250201_000000', '20250301_000000'):
+            save_analysis_snapshot(data, META, os.path.join(tmp, f'dlc_bank_analysis_{run}.dlcsnap'), keep=2)
+        assert sorted(os.listdir(tmp)) == ['dlc_bank_analysis_20250201_000000.dlcsnap',
+                                           'dlc_bank_analysis_20250301_000000.dlcsnap']
+        assert prune_snapshots(tmp, 'dlc_bank_analysis_', keep=1) == [
+            os.path.join(tmp, 'dlc_bank_analysis_20250201_000000.dlcsnap')]
+
+        json_path = os.path.join(tmp, 'dlc_bank_analysis_20250401_000000.json')
+        with open(json_path, 'w') as f:
+            json.dump(dict(META, bank_pincode_data=data), f)
+        store = DlcAnalysisStore(tmp)
+        assert store.get().path == json_path
+
+        snapshot_path = convert_json(json_path)
+        assert store.get().path == snapshot_path
+        assert store.get().payload['bank_pincode_data'] == data
+
+
+if __name__ == "__main__":
+    test_snapshot_round_trip_and_query_in_place()
+    test_damaged_and_newer_snapshots_rejected()
+    test_retention_and_store_preference()
+    print("✅ Snapshots round-trip, reject bad files and rotate")
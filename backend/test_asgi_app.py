@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+ASGI serving mode test
+Calls the ASGI wrapper directly with ASGI messages and checks that responses
+match the Flask app byte for byte, that a slow handler does not hold up other
+requests, that a stream is still closed when its client disconnects and that
+the lifespan hooks run (and report failures)
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+from a2wsgi import WSGIMiddleware
+from flask import Flask, Response
+
+import app
+from asgi_app import ASGI_THREADS, LifespanHooks
+from summary_tables import refresh_summary_tables
+from test_dashboard_query_plans import build_database
+
+
+async def call(asgi_app, path, query=b'', disconnect_after=None):
+    """(status, headers, body) of one GET through an ASGI app"""
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': query, 'headers': [],
+             'http_version': '1.1', 'scheme': 'http', 'server': ('testserver', 80), 'client': ('127.0.0.1', 1)}
+    disconnect = asyncio.Event()
+    requested = []
+    sent = []
+
+    async def receive():
+        if not requested:
+            requested.append(True)
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await disconnect.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+        if disconnect_after is not None and len(sent) > disconnect_after:
+            disconnect.set()
+
+    await asgi_app(scope, receive, send)
+    start = sent[0]
+    return start['status'], dict(start['headers']), b''.join(m.get('body', b'') for m in sent[1:])
+
+
+def test_same_responses_as_flask():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'asgi.db')
+        conn = build_database(db_path)
+        refresh_summary_tables(conn)
+        default_path, app.DB_PATH = app.DB_PATH, db_path
+        try:
+            client = app.app.test_client()
+            asgi_app = WSGIMiddleware(app.app, workers=ASGI_THREADS)
+            for path, query in (('/api/dashboard/age-distribution', b''),
+                                ('/api/dashboard/state-wise-data', b''),
+                                ('/api/pensioners', b'per_page=20&status=Pending'),
+                                ('/api/pensioners/export', b'format=csv&min_age=80')):
+                status, headers, body = asyncio.run(call(asgi_app, path, query))
+                expected = client.get(f"{path}?{query.decode()}")
+                assert status == expected.status_code
+                assert headers[b'content-type'] == expected.headers['Content-Type'].encode()
+                assert body == expected.get_data()
+        finally:
+            app.DB_PATH = default_path
+            conn.close()
+
+
+def test_slow_request_does_not_block_others():
+    slow_app = Flask(__name__)
+    release = threading.Event()
+
+    @slow_app.route('/slow')
+    def slow():
+        release.wait(5)
+        return 'slow'
+
+    @slow_app.route('/fast')
+    def fast():
+        return 'fast'
+
+    async def scenario():
+        asgi_app = WSGIMiddleware(slow_app, workers=ASGI_THREADS)
+        slow_request = asyncio.ensure_future(call(asgi_app, '/slow'))
+        await asyncio.sleep(0.05)
+        started = time.perf_counter()
+        fast_response = await call(asgi_app, '/fast')
+        fast_elapsed = time.perf_counter() - started
+        release.set()
+        return fast_response, fast_elapsed, await slow_request
+
+    (status, _, body), fast_elapsed, slow_response = asyncio.run(scenario())
+    assert (status, body) == (200, b'fast')
+    assert fast_elapsed < 1
+    assert slow_response[2] == b'slow'
+
+
+def test_disconnect_closes_stream():
+    stream_app = Flask(__name__)
+    closed = threading.Event()
+
+    @stream_app.route('/stream')
+    def stream():
+        def generate():
+            try:
+                for _ in range(200):
+                    yield 'x' * 1024
+            finally:
+                closed.set()
+        return Response(generate())
+
+    # The server drops what is sent after a disconnect; the stream still runs to its
+    # end and is closed, releasing e.g. the export's cursor and pooled connection
+    asgi_app = WSGIMiddleware(stream_app, workers=ASGI_THREADS)
+    status, _, body = asyncio.run(call(asgi_app, '/stream', disconnect_after=3))
+    assert status == 200 and body
+    assert closed.wait(5)
+
+
+def test_lifespan_hooks():
+    calls = []
+
+    def failing_shutdown():
+        raise RuntimeError("scheduler did not stop")
+
+    async def run_lifespan(asgi_app):
+        messages = iter([{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}])
+        sent = []
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message)
+
+        await asgi_app({'type': 'lifespan'}, receive, send)
+        return sent
+
+    sent = asyncio.run(run_lifespan(LifespanHooks(None, on_startup=lambda: calls.append('startup'),
+                                                  on_shutdown=failing_shutdown)))
+    assert calls == ['startup']
+    assert sent == [{'type': 'lifespan.startup.complete'},
+                    {'type': 'lifespan.shutdown.failed', 'message': 'scheduler did not stop'}]
+
+
+if __name__ == "__main__":
+    test_same_responses_as_flask()
+    test_slow_request_does_not_block_others()
+    test_disconnect_closes_stream()
+    test_lifespan_hooks()
+    print("✅ ASGI mode serves the Flask routes without blocking on slow handlers")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Bulk loader test
+Checks the generated column arrays and that load_workbooks inserts every row
+and leaves every pensioners index from db_migrations in place, including
+after a load that was killed before it could rebuild them
+"""
+
+import os
+import sqlite3
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import bulk_loader
+from bulk_loader import build_pensioner_columns, drop_pensioner_indexes, load_workbooks
+from db_migrations import PENSIONER_INDEXES, ensure_pensioner_indexes
+
+
+def sample_sheet(rows):
+    return pd.DataFrame({
+        'BRANCH_PINCODE': np.full(rows, 110001.0),
+        'NAME': [f"Pensioner {i}" for i in range(rows)],
+        'STATE': ['DELHI'] * rows,
+        'DISTRICT': ['NEW DELHI'] * rows,
+        'AMOUNT': ['bad' if i % 10 == 0 else 12000 for i in range(rows)],
+    })
+
+
+def test_column_arrays():
+    rows = 500
+    columns = build_pensioner_columns(sample_sheet(rows), 41, np.random.default_rng(0), today='2026-01-31')
+    assert all(len(column) == rows for column in columns)
+    assert columns[0][0] == 'DLC00000041'
+    assert set(columns[2]) <= set(range(60, 86))
+    assert set(columns[10]) <= {'IRIS', 'Fingerprint', 'Face Auth'}
+    # Non-numeric amounts get a generated one
+    assert all(5000 <= amount <= 25000 for amount in columns[8][::10])
+    assert max(columns[9]) <= '2026-01-30' and min(columns[9]) >= '2025-01-31'
+
+
+def create_pensioners(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        CREATE TABLE pensioners (
+            id INTEGER PRIMARY KEY, pensioner_id TEXT UNIQUE, name TEXT, age INTEGER,
+            district TEXT, state TEXT, bank TEXT, account_number TEXT, status TEXT,
+            amount REAL, last_verification DATE, authentication_method TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute(PENSIONER_INDEXES['idx_pensioners_age'])
+    conn.execute("CREATE INDEX idx_pensioners_name ON pensioners (name)")
+    conn.commit()
+    return conn
+
+
+def index_names(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL")}
+
+
+def test_load_recreates_indexes():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = create_pensioners(os.path.join(tmp, 'load.db'))
+        workbook = os.path.join(tmp, 'sheet.xlsx')
+        open(workbook, 'w').close()
+        read_workbook, batch_size = bulk_loader.load_workbook, bulk_loader.INSERT_BATCH_SIZE
+        bulk_loader.load_workbook = lambda path: sample_sheet(1200)
+        bulk_loader.INSERT_BATCH_SIZE = 500
+        try:
+            loaded = load_workbooks(conn, [workbook, os.path.join(tmp, 'missing.xlsx'), workbook], seed=1)
+        finally:
+            bulk_loader.load_workbook, bulk_loader.INSERT_BATCH_SIZE = read_workbook, batch_size
+
+        assert loaded == 2400
+        assert conn.execute("SELECT COUNT(DISTINCT pensioner_id) FROM pensioners").fetchone()[0] == 2400
+        # Every defined index, whether or not it existed before; other indexes are left alone
+        assert index_names(conn) == set(PENSIONER_INDEXES) | {'idx_pensioners_name'}
+        conn.close()
+
+
+def test_indexes_restored_after_interrupted_load():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'load.db')
+        conn = create_pensioners(db_path)
+        ensure_pensioner_indexes(conn)
+        # The process dies after dropping the indexes, before the finally block runs
+        assert drop_pensioner_indexes(conn) == list(PENSIONER_INDEXES)
+        conn.close()
+
+        conn = sqlite3.connect(db_path)
+        assert index_names(conn) == {'idx_pensioners_name'}
+        assert ensure_pensioner_indexes(conn) == list(PENSIONER_INDEXES)
+        assert index_names(conn) == set(PENSIONER_INDEXES) | {'idx_pensioners_name'}
+        assert ensure_pensioner_indexes(conn) == []
+        conn.close()
+
+
+if __name__ == "__main__":
+    test_column_arrays()
+    test_load_recreates_indexes()
+    test_indexes_restored_after_interrupted_load()
+    print("✅ Bulk loader builds valid columns and restores indexes")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Serverless cold-start test
+Answers every cold-start route in a fresh interpreter and checks it succeeds
+without importing pandas (or NumPy outside /geo/pincodes), and that boundary
+files are served from their pre-gzipped bundle copies only while those still
+match their sources. Timings are left to cold_start_benchmark.py --check.
+"""
+
+import gzip
+import hashlib
+import os
+import tempfile
+
+from cold_start_benchmark import COLD_START_PATHS, REPO_ROOT, probe, unexpected_heavy_modules
+from serverless_bundle import build_geo_files, bundled_gzip, stale_geo_files
+
+
+def test_cold_start_routes_stay_light():
+    for path in COLD_START_PATHS:
+        result = probe(path)
+        assert result['status'] == 200, (path, result['status'])
+        assert unexpected_heavy_modules(path, result['heavy_modules']) == [], (path, result['heavy_modules'])
+
+
+def test_geo_files_served_pre_gzipped():
+    with open(os.path.join(REPO_ROOT, 'india.json'), 'rb') as f:
+        raw = f.read()
+    gz_path = bundled_gzip('india.json', os.path.join(REPO_ROOT, 'india.json'))
+    assert gz_path is not None
+    with open(gz_path, 'rb') as f:
+        compressed = f.read()
+    assert gzip.decompress(compressed) == raw
+
+    result = probe('/india.json', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert result['status'] == 200
+    assert result['headers']['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in result['headers']['Vary']
+    assert result['body_sha256'] == hashlib.sha256(compressed).hexdigest()
+
+    result = probe('/india.json', headers={})
+    assert 'Content-Encoding' not in result['headers']
+    assert result['body_sha256'] == hashlib.sha256(raw).hexdigest()
+
+
+def test_stale_gzip_not_served():
+    with tempfile.TemporaryDirectory() as source_dir, tempfile.TemporaryDirectory() as bundle_dir:
+        source_path = os.path.join(source_dir, 'india.json')
+        with open(source_path, 'w') as f:
+            f.write('{"type": "FeatureCollection", "features": []}')
+        assert stale_geo_files(source_dir, bundle_dir) == ['india.json']
+
+        build_geo_files(source_dir, bundle_dir)
+        assert stale_geo_files(source_dir, bundle_dir) == []
+        assert bundled_gzip('india.json', source_path, bundle_dir) is not None
+        # Deployed without the raw file: the bundled copy is all there is
+        assert bundled_gzip('india.json', os.path.join(source_dir, 'missing.json'), bundle_dir) is not None
+
+        with open(source_path, 'w') as f:
+            f.write('{"type": "FeatureCollection", "features": [{}]}')
+        assert bundled_gzip('india.json', source_path, bundle_dir) is None
+        assert stale_geo_files(source_dir, bundle_dir) == ['india.json']
+
+        # Same size, different content: only the hash check catches it
+        with open(source_path, 'w') as f:
+            f.write('{"type": "FeatureCollection", "features": [[]]}')
+        build_geo_files(source_dir, bundle_dir)
+        with open(source_path, 'w') as f:
+            f.write('{"type": "FeatureCollection", "features": [{}]}')
+        assert stale_geo_files(source_dir, bundle_dir) == ['india.json']
+
+
+if __name__ == "__main__":
+    test_cold_start_routes_stay_light()
+    test_geo_files_served_pre_gzipped()
+    test_stale_gzip_not_served()
+    print("✅ Serverless cold-start routes answer from prebuilt artifacts")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Dashboard aggregates test
+Checks that the artifact holds exact totals over every row (no estimates for
+missing columns), that states fall back to the pincode lookup, that the
+/api/pensioners sample keeps only the first rows of the first workbooks, and
+that the read side re-reads the file only when it changes
+"""
+
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+from dashboard_aggregates import (DashboardAggregates, build_dashboard_aggregates, is_current,
+                                  write_dashboard_aggregates)
+
+
+def test_exact_totals_over_all_rows():
+    with tempfile.TemporaryDirectory() as folder:
+        pd.DataFrame({
+            'YOB': [1960, 1955, 1940, 1990],
+            'State': ['Bihar', 'Kerala', 'Bihar', 'Bihar'],
+            'Status': ['Verified', 'Pending', 'Verified', 'Rejected'],
+            'Amount': [12000, None, 9000, 3000],
+        }).to_excel(os.path.join(folder, 'a.xlsx'), index=False)
+        pd.DataFrame({'YOB': [1950] * 20000, 'State': ['Kerala'] * 20000}).to_excel(
+            os.path.join(folder, 'b.xlsx'), index=False)
+
+        aggregates = build_dashboard_aggregates(folder, current_year=2025)
+        stats = aggregates['stats']
+        assert stats['totalPensioners'] == 20004
+        assert (stats['verifiedThisMonth'], stats['pendingVerifications']) == (2, 1)
+        assert stats['totalAmount'] == 24000
+        assert [item['count'] for item in aggregates['age_distribution']] == [1, 1, 20000, 0, 1]
+        assert aggregates['state_wise'] == [
+            {'state': 'Kerala', 'totalPensioners': 20001, 'verified': 0, 'pending': 1, 'avgAmount': 0},
+            {'state': 'Bihar', 'totalPensioners': 3, 'verified': 2, 'pending': 0, 'avgAmount': 8000.0},
+        ]
+        assert [source['rows'] for source in aggregates['sources']] == [4, 20000]
+
+
+def test_states_from_pincodes():
+    with tempfile.TemporaryDirectory() as folder:
+        pd.DataFrame({'PENSIONER_PINCODE': [110001, 110002, 560001], 'YOB': [1950, 1950, 1950]}).to_excel(
+            os.path.join(folder, 'a.xlsx'), index=False)
+        aggregates = build_dashboard_aggregates(folder, current_year=2025)
+        assert [(item['state'], item['totalPensioners']) for item in aggregates['state_wise']] == \
+            [('Delhi', 2), ('Karnataka', 1)]
+        assert aggregates['stats']['totalAmount'] == 0
+
+
+def test_state_with_only_null_statuses():
+    with tempfile.TemporaryDirectory() as folder:
+        pd.DataFrame({
+            'YOB': [1950, 1950, 1960],
+            'State': ['Goa', 'Goa', 'Bihar'],
+            'Status': [None, None, 'Verified'],
+        }).to_excel(os.path.join(folder, 'a.xlsx'), index=False)
+        aggregates = build_dashboard_aggregates(folder, current_year=2025)
+        assert [(item['state'], item['verified'], item['pending']) for item in aggregates['state_wise']] == \
+            [('Goa', 0, 0), ('Bihar', 1, 0)]
+
+
+def test_pensioner_sample():
+    with tempfile.TemporaryDirectory() as folder:
+        pd.DataFrame({
+            'YOB': [1960, 1955],
+            'State': ['Bihar', 'Kerala'],
+            'Status': ['Verified', 'Pending'],
+            'Amount': [12000, None],
+        }).to_excel(os.path.join(folder, 'a.xlsx'), index=False)
+        pd.DataFrame({'YOB': [1950] * 1500, 'State': ['Goa'] * 1500}).to_excel(
+            os.path.join(folder, 'b.xlsx'), index=False)
+        pd.DataFrame({'YOB': [1950], 'State': ['Bihar']}).to_excel(os.path.join(folder, 'c.xlsx'), index=False)
+
+        sample = build_dashboard_aggregates(folder, current_year=2025)['pensioners']
+        assert sample['total'] == 1002
+        assert sorted(sample['columns']) == ['Amount', 'State', 'Status']
+        assert all(len(values) == 1002 for values in sample['columns'].values())
+        assert sample['columns']['State'][:3] == ['Bihar', 'Kerala', 'Goa']
+        assert sample['columns']['Status'][1:3] == ['Pending', None]
+        assert sample['columns']['Amount'][:2] == [12000, None]
+
+
+def test_reader_reloads_on_change_and_check_detects_stale_artifact():
+    with tempfile.TemporaryDirectory() as folder:
+        workbook = os.path.join(folder, 'a.xlsx')
+        pd.DataFrame({'YOB': [1950, 1960], 'State': ['Goa', 'Goa']}).to_excel(workbook, index=False)
+        path = write_dashboard_aggregates(build_dashboard_aggregates(folder), os.path.join(folder, 'agg.json'))
+        assert is_current(path, folder)
+
+        reader = DashboardAggregates(path, folder)
+        stats, etag = reader.get('stats')
+        assert stats['totalPensioners'] == 2
+        assert reader.get('state_wise') == ([{'state': 'Goa', 'totalPensioners': 2, 'verified': 0,
+                                              'pending': 0, 'avgAmount': 0}], etag)
+
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data['stats']['totalPensioners'] = 3
+        write_dashboard_aggregates(data, path)
+        stats, new_etag = reader.get('stats')
+        assert stats['totalPensioners'] == 3 and new_etag != etag
+
+        pd.DataFrame({'YOB': [1950], 'State': ['Goa']}).to_excel(workbook, index=False)
+        assert not is_current(path, folder)
+
+
+def test_reader_builds_missing_artifact():
+    with tempfile.TemporaryDirectory() as folder:
+        pd.DataFrame({'YOB': [1950], 'State': ['Goa']}).to_excel(os.path.join(folder, 'a.xlsx'), index=False)
+        reader = DashboardAggregates(os.path.join(folder, 'agg.json'), folder)
+        assert reader.get('stats')[0]['totalPensioners'] == 1
+        assert os.path.exists(os.path.join(folder, 'agg.json'))
+
+
+if __name__ == "__main__":
+    test_exact_totals_over_all_rows()
+    test_states_from_pincodes()
+    test_state_with_only_null_statuses()
+    test_pensioner_sample()
+    test_reader_reloads_on_change_and_check_detects_stale_artifact()
+    test_reader_builds_missing_artifact()
+    print("✅ Dashboard aggregates are exact, bundled and reloaded on change")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Database reuse test
+Checks that prepare_data() loads the workbooks once, reuses the database on
+the next start, and reloads only when a workbook or the schema version changes
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import app
+import bulk_loader
+import db_migrations
+from db_migrations import loaded_source
+
+
+def write_workbook(path, rows):
+    pd.DataFrame({
+        'BRANCH_PINCODE': np.full(rows, 110001.0),
+        'PENSIONER_PINCODE': np.full(rows, 110002.0),
+        'YOB': np.full(rows, 1955.0),
+    }).to_excel(path, index=False)
+
+
+def test_restart_reuses_database_until_sources_or_schema_change():
+    loads = []
+    real_load = bulk_loader.load_workbooks
+
+    def counting_load(conn, file_paths, seed=None):
+        loads.append(len(file_paths))
+        return real_load(conn, file_paths, seed=seed)
+
+    saved = app.DB_PATH, app.EXCEL_FILES, list(db_migrations.MIGRATIONS)
+    with tempfile.TemporaryDirectory() as tmp:
+        workbook = os.path.join(tmp, 'GAD_DLC_PINCODE_DATA_1.xlsx')
+        write_workbook(workbook, 30)
+        app.DB_PATH = os.path.join(tmp, 'pension_data.db')
+        app.EXCEL_FILES = [workbook, os.path.join(tmp, 'missing.xlsx')]
+        bulk_loader.load_workbooks = counting_load
+        try:
+            app.prepare_data()
+            app.prepare_data()
+            assert len(loads) == 1
+
+            conn = app.connect(app.DB_PATH)
+            loaded = loaded_source(conn)
+            assert loaded['row_count'] == 30
+            assert loaded['schema_version'] == db_migrations.schema_version(conn)
+            assert [name for name, _, _ in loaded['workbooks']] == ['GAD_DLC_PINCODE_DATA_1.xlsx']
+            conn.close()
+
+            # A changed workbook replaces the rows instead of adding to them
+            write_workbook(workbook, 20)
+            stat = os.stat(workbook)
+            os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+            app.prepare_data()
+            assert len(loads) == 2
+            conn = app.connect(app.DB_PATH)
+            assert conn.execute("SELECT COUNT(*), MIN(id) FROM pensioners").fetchone() == (20, 1)
+            conn.close()
+
+            # A new migration reloads once, then the database is reused again
+            db_migrations.MIGRATIONS.append((99, 'test migration', ["CREATE TABLE test_table (x INTEGER)"]))
+            app.prepare_data()
+            app.prepare_data()
+            assert len(loads) == 3
+        finally:
+            app.DB_PATH, app.EXCEL_FILES, db_migrations.MIGRATIONS[:] = saved
+            bulk_loader.load_workbooks = real_load
+
+
+if __name__ == "__main__":
+    test_restart_reuses_database_until_sources_or_schema_change()
+    print("✅ The database is reused across restarts and reloaded only on change")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Serverless dataset cache test
+Checks column typing and age bands, and that workbooks are loaded once and
+reloaded only when their mtime changes
+"""
+
+import os
+import tempfile
+
+import pandas as pd
+
+import dataset_cache
+from dataset_cache import WorkbookDataset, prepare_frame
+
+
+def test_typed_columns_and_age_bands():
+    df = prepare_frame(pd.DataFrame({
+        'YOB': [1960.0, 1955.9, 1940.0, None, 1980.0],
+        'State': ['Bihar', 'Kerala', 'Bihar', None, 'Kerala'],
+        'Amount': ['12000', 'n/a', 9000, 8000, 7000],
+    }), current_year=2025)
+    assert isinstance(df['State'].dtype, pd.CategoricalDtype)
+    assert df['Amount'].isna().tolist() == [False, True, False, False, False]
+    assert df['age_group'].astype(object).tolist()[:3] == ['60-65', '66-70', '80+']
+    assert df['age_group'].isna().tolist()[3:] == [True, True]  # missing YOB, under 60
+
+
+def test_workbooks_reload_on_mtime_change():
+    loads = []
+    real_load = dataset_cache.load_workbook
+
+    def counting_load(path, columns=None):
+        loads.append(os.path.basename(path))
+        return real_load(path, columns=columns)
+
+    with tempfile.TemporaryDirectory() as folder:
+        for name in ('a.xlsx', 'b.xlsx'):
+            pd.DataFrame({'YOB': [1950.0, 1960.0], 'Extra': [1, 2]}).to_excel(os.path.join(folder, name), index=False)
+        dataset = WorkbookDataset(folder)
+        dataset_cache.load_workbook = counting_load
+        try:
+            frames = dataset.frames()
+            assert [name for name, _ in frames] == ['a.xlsx', 'b.xlsx']
+            assert 'Extra' not in frames[0][1].columns
+            assert dataset.frames()[1][1] is frames[1][1]
+            assert loads == ['a.xlsx', 'b.xlsx']
+
+            path = os.path.join(folder, 'b.xlsx')
+            pd.DataFrame({'YOB': [1950.0]}).to_excel(path, index=False)
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+            frames = dataset.frames()
+            assert loads == ['a.xlsx', 'b.xlsx', 'b.xlsx']
+            assert len(frames[1][1]) == 1
+        finally:
+            dataset_cache.load_workbook = real_load
+
+
+if __name__ == "__main__":
+    test_typed_columns_and_age_bands()
+    test_workbooks_reload_on_mtime_change()
+    print("✅ Workbook frames are typed, cached and reloaded on change")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Connection pool test
+Checks that a thread per request still reuses the pooled connections, that
+the pool never opens more than max_size and makes callers wait (then time
+out) beyond that, that released connections come back without an open
+transaction, and that readers see the last committed data while a writer
+holds an open transaction (WAL mode)
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+from db_pool import ConnectionPool, connect
+
+
+def test_threads_share_connections():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'pool.db')
+        pool = ConnectionPool(max_size=4)
+        with pool.connection(db_path) as main:
+            assert main.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+        # A new thread per request, as app.run(debug=True) serves them
+        seen = []
+        for _ in range(5):
+            worker = threading.Thread(target=lambda: seen.append(pool.acquire(db_path)))
+            worker.start()
+            worker.join()
+            pool.release(seen[-1])
+        assert all(conn is main for conn in seen)
+        assert pool.size() == 1
+        pool.close_all()
+        assert pool.size() == 0
+
+
+def test_bounded_under_concurrency():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'pool.db')
+        pool = ConnectionPool(max_size=3, timeout=5)
+        counts, peak, lock = [], [0], threading.Lock()
+
+        def request():
+            with pool.connection(db_path) as conn:
+                with lock:
+                    peak[0] = max(peak[0], pool.in_use())
+                counts.append(conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0])
+                time.sleep(0.01)
+
+        workers = [threading.Thread(target=request) for _ in range(20)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        assert counts == [0] * 20
+        assert pool.size() <= 3 and peak[0] <= 3
+        assert pool.in_use() == 0
+        pool.close_all()
+
+
+def test_waits_then_times_out():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'pool.db')
+        pool = ConnectionPool(max_size=1, timeout=0.1)
+        conn = pool.acquire(db_path)
+        try:
+            pool.acquire(db_path)
+        except TimeoutError:
+            pass
+        else:
+            raise AssertionError("acquired more than max_size connections")
+
+        # Released by another thread while this one waits
+        pool.timeout = 5
+        releaser = threading.Timer(0.05, pool.release, args=(conn,))
+        releaser.start()
+        assert pool.acquire(db_path) is conn
+        releaser.join()
+        pool.release(conn)
+        pool.close_all()
+
+
+def test_release_ends_transaction_and_close_all_retires_checked_out():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'pool.db')
+        pool = ConnectionPool(max_size=2)
+        with pool.connection(db_path) as conn:
+            conn.execute("CREATE TABLE pensioners (id INTEGER PRIMARY KEY)")
+            conn.execute("INSERT INTO pensioners DEFAULT VALUES")
+            assert conn.in_transaction
+        with pool.connection(db_path) as again:
+            assert again is conn and not again.in_transaction
+            assert again.execute("SELECT COUNT(*) FROM pensioners").fetchone()[0] == 0
+
+            pool.close_all()
+            assert pool.size() == 1  # still checked out
+        assert pool.size() == 0
+        with pool.connection(db_path) as fresh:
+            assert fresh is not conn
+        pool.close_all()
+
+
+def test_readers_not_blocked_by_writer():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'pool.db')
+        writer = connect(db_path)
+        writer.execute("CREATE TABLE pensioners (id INTEGER PRIMARY KEY, status TEXT)")
+        writer.executemany("INSERT INTO pensioners (status) VALUES (?)", [('Verified',)] * 100)
+        writer.commit()
+
+        # Uncommitted bulk write in progress
+        writer.execute("BEGIN IMMEDIATE")
+        writer.executemany("INSERT INTO pensioners (status) VALUES (?)", [('Pending',)] * 1000)
+
+        pool = ConnectionPool()
+
+        def count():
+            with pool.connection(db_path) as conn:
+                return conn.execute("SELECT COUNT(*) FROM pensioners").fetchone()[0]
+
+        counts = []
+        reader = threading.Thread(target=lambda: counts.append(count()))
+        reader.start()
+        reader.join(timeout=2)
+        assert counts == [100]
+
+        writer.commit()
+        assert count() == 1100
+        pool.close_all()
+        writer.close()
+
+
+if __name__ == "__main__":
+    test_threads_share_connections()
+    test_bounded_under_concurrency()
+    test_waits_then_times_out()
+    test_release_ends_transaction_and_close_all_retires_checked_out()
+    test_readers_not_blocked_by_writer()
+    print("✅ Pooled connections are shared, bounded and readers don't wait for writers")
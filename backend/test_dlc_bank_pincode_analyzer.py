@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Parity test for the columnar bank-pincode aggregation engine
+Compares count_pensioner_keys/build_bank_pincode_data against the original
+row-by-row analysis loop on synthetic edge cases and on the real workbooks,
+and parallel ingestion against serial ingestion (counting a repeated
+workbook once per listing)
+"""
+
+import os
+import tempfile
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dlc_bank_pincode_analyzer import (
+    build_bank_pincode_data, collect_key_counts, collect_workbook_partials, count_pensioner_keys,
+    get_age_group, get_district_from_pincode, get_state_from_pincode, merge_key_counts
+)
+from excel_cache import EXCEL_FOLDER, list_workbooks, load_workbook
+from workbook_fixtures import write_workbook
+
+
+def reference_bank_pincode_data(frames):
+    """The original iterrows-style analysis loop, kept as the parity oracle"""
+    bank_pincode_data = defaultdict(lambda: {
+        'total_dlc_completed': 0,
+        'age_groups': defaultdict(int),
+        'state': '',
+        'district': '',
+        'pensioner_states': defaultdict(int),
+        'unique_pensioners': set()
+    })
+    total_processed = 0
+
+    for df in frames:
+        for index in range(len(df)):
+            row = df.iloc[index]
+            try:
+                branch_pincode = str(row.get('BRANCH_PINCODE', '')).replace('.0', '') if pd.notna(row.get('BRANCH_PINCODE')) else ''
+                pensioner_pincode = str(row.get('PENSIONER_PINCODE', '')).replace('.0', '') if pd.notna(row.get('PENSIONER_PINCODE')) else ''
+                birth_year = int(float(row.get('YOB', 1960))) if pd.notna(row.get('YOB')) else 1960
+
+                if not branch_pincode or len(branch_pincode) < 6:
+                    continue
+
+                age_group = get_age_group(birth_year)
+                bank_state = get_state_from_pincode(branch_pincode)
+                bank_district = get_district_from_pincode(branch_pincode)
+                pensioner_state = get_state_from_pincode(pensioner_pincode)
+                pensioner_id = f"{pensioner_pincode}_{birth_year}"
+
+                bank_data = bank_pincode_data[branch_pincode]
+                if pensioner_id not in bank_data['unique_pensioners']:
+                    bank_data['unique_pensioners'].add(pensioner_id)
+                    bank_data['total_dlc_completed'] += 1
+                    bank_data['age_groups'][age_group] += 1
+                    bank_data['pensioner_states'][pensioner_state] += 1
+                    if not bank_data['state']:
+                        bank_data['state'] = bank_state
+                        bank_data['district'] = bank_district
+
+                total_processed += 1
+            except Exception:
+                continue
+
+    final_data = {}
+    for pincode, data in bank_pincode_data.items():
+        if data['total_dlc_completed'] > 0:
+            final_data[pincode] = {
+                'total_dlc_completed': data['total_dlc_completed'],
+                'age_groups': dict(data['age_groups']),
+                'state': data['state'],
+                'district': data['district'],
+                'pensioner_states': dict(data['pensioner_states']),
+                'unique_pensioner_count': len(data['unique_pensioners'])
+            }
+    return final_data, total_processed
+
+
+def vectorized_bank_pincode_data(frames):
+    return build_bank_pincode_data(merge_key_counts([count_pensioner_keys(df) for df in frames]))
+
+
+def synthetic_frames():
+    """Two 'workbooks' covering missing values, mixed types and duplicate pensioners"""
+    first = pd.DataFrame({
+        'BRANCH_PINCODE': [302001.0, 302001.0, 302001.0, 560001.0, np.nan, 12345.0, 110001.0, 400001.0],
+        'PENSIONER_PINCODE': [302012, 302012, '      ', 'V3T 3H', 302001, 302001, np.nan, 411001.0],
+        'YOB': [1950.0, 1950.0, np.nan, 1940.0, 1950.0, 1950.0, 1985.0, 90319780000.0],
+    })
+    second = pd.DataFrame({
+        'BRANCH_PINCODE': ['302001', '302001.0', 'ABCDEF', '800001'],
+        'PENSIONER_PINCODE': ['302012', 302013, '302012', '-12345'],
+        'YOB': [1950, 'not a year', 1962.7, 1958],
+    }, dtype=object)
+    return [first, second]
+
+
+def test_parity_on_synthetic_rows():
+    frames = synthetic_frames()
+    assert vectorized_bank_pincode_data(frames) == reference_bank_pincode_data(frames)
+
+
+def test_merge_is_order_independent():
+    frames = synthetic_frames()
+    forward = vectorized_bank_pincode_data(frames)
+    backward = vectorized_bank_pincode_data(frames[::-1])
+    assert forward == backward
+
+
+def test_parity_on_workbooks():
+    if not os.path.isdir(EXCEL_FOLDER) or not list_workbooks():
+        pytest.skip("no workbooks in XLSx data")
+    columns = ['BRANCH_PINCODE', 'PENSIONER_PINCODE', 'YOB']
+    frames = [load_workbook(path, columns=columns, nrows=20000) for path in list_workbooks()]
+    assert vectorized_bank_pincode_data(frames) == reference_bank_pincode_data(frames)
+
+
+def test_parallel_ingestion_matches_serial():
+    with tempfile.TemporaryDirectory() as folder:
+        write_workbook(folder, 'month_1.xlsx', [[302001, 302012, 1950], [302001, 302012, 1950], [560001, 560034, 1945]])
+        write_workbook(folder, 'month_2.xlsx', [[302001, 302012, 1950], [110001, 110085, 1962], [560001, '', None]])
+        write_workbook(folder, 'month_3.xlsx', [[800001, 800014, 1938], [302001, 302013, 1958]])
+        with open(os.path.join(folder, 'month_4.xlsx'), 'wb') as f:
+            f.write(b'not a workbook')
+        file_paths = list_workbooks(folder)
+
+        # The unreadable workbook is reported and skipped by both paths
+        partials = collect_workbook_partials(file_paths, workers=2)
+        assert sorted(partials) == [0, 1, 2]
+        serial = build_bank_pincode_data(collect_key_counts(file_paths, workers=1))
+        assert build_bank_pincode_data(collect_key_counts(file_paths, workers=2)) == serial
+        assert build_bank_pincode_data(collect_key_counts(file_paths[:3], workers=3)) == serial
+        assert serial[1] == 8
+
+        # A path listed twice is ingested twice, as benchmark_parallel_ingest.py --copies relies on
+        for workers in (1, 2):
+            twice = collect_workbook_partials(file_paths[:3] * 2, workers=workers)
+            assert sorted(twice) == list(range(6))
+            assert build_bank_pincode_data(collect_key_counts(file_paths[:3] * 2, workers=workers))[1] == 16
+
+
+if __name__ == "__main__":
+    test_parity_on_synthetic_rows()
+    test_merge_is_order_independent()
+    test_parity_on_workbooks()
+    test_parallel_ingestion_matches_serial()
+    print("✅ Vectorized aggregation matches the row-by-row analysis")
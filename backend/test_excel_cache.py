@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Columnar cache test
+Checks that only full reads convert a workbook (nrows reads stay on
+read_excel until a cache entry exists, then use it), and that replacing a
+workbook's entry leaves other workbooks' entries alone even when one name
+extends the other
+"""
+
+import os
+import tempfile
+
+import pandas as pd
+import pytest
+
+import excel_cache
+from excel_cache import PARQUET_AVAILABLE, cache_path_for, convert_workbook, load_workbook
+
+
+def write_workbook(folder, name, rows):
+    path = os.path.join(folder, name)
+    pd.DataFrame({'YOB': [1930 + i % 35 for i in range(rows)],
+                  'PENSIONER_PINCODE': [110001 + i for i in range(rows)]}).to_excel(path, index=False)
+    return path
+
+
+def with_cache_dir(check):
+    original = excel_cache.CACHE_DIR
+    with tempfile.TemporaryDirectory() as cache_dir:
+        excel_cache.CACHE_DIR = cache_dir
+        try:
+            check()
+        finally:
+            excel_cache.CACHE_DIR = original
+
+
+def test_partial_reads_do_not_convert():
+    if not PARQUET_AVAILABLE:
+        pytest.skip("pyarrow is not installed")
+
+    def check():
+        with tempfile.TemporaryDirectory() as folder:
+            path = write_workbook(folder, 'GAD_DLC_PINCODE_DATA_1.xlsx', 300)
+            expected = pd.read_excel(path)
+
+            df = load_workbook(path, columns=['YOB', 'MISSING_COLUMN'], nrows=100)
+            pd.testing.assert_frame_equal(df, expected[['YOB']].head(100))
+            assert os.listdir(excel_cache.CACHE_DIR) == []
+
+            pd.testing.assert_frame_equal(load_workbook(path), expected)
+            assert os.path.exists(cache_path_for(path))
+
+            original = pd.read_excel
+            pd.read_excel = None  # the cache entry now answers partial reads too
+            try:
+                df = load_workbook(path, columns=['YOB'], nrows=100)
+            finally:
+                pd.read_excel = original
+            pd.testing.assert_frame_equal(df, expected[['YOB']].head(100))
+
+    with_cache_dir(check)
+
+
+def test_stale_entries_of_other_workbooks_kept():
+    if not PARQUET_AVAILABLE:
+        pytest.skip("pyarrow is not installed")
+
+    def check():
+        with tempfile.TemporaryDirectory() as folder:
+            data = write_workbook(folder, 'DATA.xlsx', 10)
+            data_2 = write_workbook(folder, 'DATA-2.xlsx', 10)
+            data_2_entry = convert_workbook(data_2)
+            old_data_entry = convert_workbook(data)
+
+            write_workbook(folder, 'DATA.xlsx', 20)
+            new_data_entry = convert_workbook(data)
+            assert new_data_entry != old_data_entry
+            assert sorted(os.listdir(excel_cache.CACHE_DIR)) == \
+                sorted(os.path.basename(entry) for entry in (data_2_entry, new_data_entry))
+
+    with_cache_dir(check)
+
+
+if __name__ == "__main__":
+    test_partial_reads_do_not_convert()
+    test_stale_entries_of_other_workbooks_kept()
+    print("✅ Only full reads convert workbooks and stale entries stay per workbook")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Pincode boundary tiles test
+Builds tiles from a small synthetic FeatureCollection and checks the level
+chosen per zoom, bbox and state selection through the index, parse_bbox
+validation and the /geo/pincodes route's 400 and 404 answers
+"""
+
+import json
+import math
+import os
+import sys
+import tempfile
+
+from cold_start_benchmark import API_DIR
+from geo_tiles import GeoTileStore, parse_bbox
+
+
+def square(lon, lat, size):
+    return [[lon, lat], [lon + size, lat], [lon + size, lat + size], [lon, lat + size], [lon, lat]]
+
+
+def circle(lon, lat, radius, points=64):
+    ring = [[lon + radius * math.cos(2 * math.pi * i / points), lat + radius * math.sin(2 * math.pi * i / points)]
+            for i in range(points)]
+    return ring + [ring[0]]
+
+
+def feature(pincode, circle_name, ring):
+    return {'type': 'Feature', 'properties': {'Pincode': pincode, 'Circle': circle_name},
+            'geometry': {'type': 'Polygon', 'coordinates': [ring]}}
+
+
+FEATURES = [
+    feature('600001', 'Tamilnadu', circle(80.0, 13.0, 0.5)),
+    feature('600002', 'Tamilnadu', square(80.0, 12.0, 0.0005)),  # under a pixel below zoom 11
+    feature('641001', 'Tamilnadu', square(77.0, 11.0, 0.2)),
+    feature('682001', 'Kerala', square(76.0, 10.0, 0.2)),
+]
+
+
+def build_store(folder):
+    source = os.path.join(folder, 'boundaries.geojson')
+    with open(source, 'w', encoding='utf-8') as f:
+        json.dump({'type': 'FeatureCollection', 'features': FEATURES}, f)
+    return GeoTileStore(os.path.join(folder, 'tiles'), source)
+
+
+def pincodes(body):
+    return sorted(ft['properties']['Pincode'] for ft in json.loads(body)['features'])
+
+
+def vertex_count(body, pincode):
+    [ft] = [ft for ft in json.loads(body)['features'] if ft['properties']['Pincode'] == pincode]
+    return len(ft['geometry']['coordinates'][0])
+
+
+def test_level_per_zoom():
+    with tempfile.TemporaryDirectory() as folder:
+        store = build_store(folder)
+        assert store.state_names() == ['Kerala', 'Tamil Nadu']
+        assert [store.level_for_zoom(z) for z in (2, 5, 6, 8, 10.5, 11, 14, 18)] == [0, 0, 1, 1, 2, 2, 3, 3]
+
+        coarse, full = store.query(zoom=5), store.query(zoom=14)
+        assert pincodes(coarse) == ['600001', '641001', '682001']
+        assert pincodes(full) == ['600001', '600002', '641001', '682001']
+        assert vertex_count(coarse, '600001') < vertex_count(full, '600001') == 65
+        [detailed] = [ft for ft in json.loads(full)['features'] if ft['properties']['Pincode'] == '600001']
+        assert detailed['geometry']['coordinates'][0] == [[round(x, 6), round(y, 6)] for x, y in circle(80.0, 13.0, 0.5)]
+
+
+def test_bbox_and_state_selection():
+    with tempfile.TemporaryDirectory() as folder:
+        store = build_store(folder)
+        # Without a zoom the level follows the bbox size, too coarse for the tiny square
+        assert pincodes(store.query(bbox=(79.0, 11.5, 81.0, 14.0))) == ['600001']
+        assert pincodes(store.query(bbox=(79.0, 11.5, 81.0, 14.0), zoom=14)) == ['600001', '600002']
+        assert pincodes(store.query(bbox=(76.1, 10.1, 77.1, 11.1), zoom=14)) == ['641001', '682001']
+        assert pincodes(store.query(bbox=(60.0, 30.0, 61.0, 31.0))) == []
+
+        assert pincodes(store.query(state='tamil nadu', zoom=14)) == ['600001', '600002', '641001']
+        assert pincodes(store.query(state='KERALA')) == ['682001']
+        assert pincodes(store.query(state='Tamil Nadu', bbox=(75.0, 9.0, 78.0, 12.0))) == ['641001']
+        try:
+            store.query(state='Atlantis')
+        except KeyError:
+            pass
+        else:
+            raise AssertionError("unknown state was accepted")
+
+
+def test_parse_bbox():
+    assert parse_bbox('76.5,10,77.25,11') == (76.5, 10.0, 77.25, 11.0)
+    for text in ('76,10,77', '76,10,77,11,12', 'a,b,c,d', '', '77,10,76,11', '76,11,77,10', 'nan,10,77,11',
+                 '76,10,inf,11'):
+        try:
+            parse_bbox(text)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{text!r} was accepted")
+
+
+def test_route_errors():
+    sys.path.insert(0, API_DIR)
+    try:
+        import index
+    finally:
+        sys.path.remove(API_DIR)
+
+    original = index.pincode_tiles
+    with tempfile.TemporaryDirectory() as folder:
+        store = build_store(folder)
+        index.pincode_tiles = lambda: store
+        try:
+            client = index.app.test_client()
+            for query in ('bbox=76,10,77', 'bbox=77,10,76,11', 'bbox=a,b,c,d', 'zoom=high'):
+                response = client.get(f'/geo/pincodes?{query}')
+                assert response.status_code == 400, query
+                assert 'Invalid query' in response.get_json()['error']
+
+            response = client.get('/geo/pincodes?state=Atlantis')
+            assert response.status_code == 404
+            assert response.get_json()['states'] == ['Kerala', 'Tamil Nadu']
+
+            response = client.get('/geo/pincodes?state=Kerala&bbox=75,9,77,11')
+            assert response.status_code == 200
+            assert pincodes(response.get_data()) == ['682001']
+        finally:
+            index.pincode_tiles = original
+
+
+if __name__ == "__main__":
+    test_level_per_zoom()
+    test_bbox_and_state_selection()
+    test_parse_bbox()
+    test_route_errors()
+    print("✅ Boundary tiles pick the zoom level and filter by state and bbox")
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+API import-time test
+Imports app.py in fresh interpreters under `python -X importtime` and checks
+that the import stays under budget and leaves the heavy, first-use-only
+dependencies (pandas, pyarrow, openpyxl, bar_chart_race/matplotlib) unloaded
+"""
+
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Budget for `import app`, best of IMPORT_RUNS (overridable for slow CI machines)
+IMPORT_BUDGET_MS = float(os.environ.get('DLC_APP_IMPORT_BUDGET_MS', 400))
+IMPORT_RUNS = 3
+
+LAZY_MODULES = ['pandas', 'pyarrow', 'openpyxl', 'matplotlib', 'bar_chart_race']
+
+
+def import_times(module):
+    """{imported module: cumulative microseconds} from one `python -X importtime -c 'import <module>'`"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                            cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_app_import_within_budget():
+    runs = [import_times('app') for _ in range(IMPORT_RUNS)]
+    best_ms = min(times['app'] for times in runs) / 1000
+    assert best_ms < IMPORT_BUDGET_MS, f"import app took {best_ms:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)"
+
+
+def test_heavy_dependencies_load_on_first_use():
+    times = import_times('app')
+    assert [name for name in LAZY_MODULES if name in times] == []
+
+
+if __name__ == "__main__":
+    test_app_import_within_budget()
+    test_heavy_dependencies_load_on_first_use()
+    print("✅ app.py imports within budget without its heavy dependencies")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Compact aggregate container test
+Round-trips bank_pincode_data through PincodeAggregates and .npz, checks
+the vectorized state-wise rollup against build_state_wise_data and that an
+unwritable .npz cache does not fail the load
+"""
+
+import json
+import os
+import random
+import tempfile
+
+from analysis_store import build_state_wise_data, load_aggregates
+from pincode_aggregates import PincodeAggregates
+
+STATES = ['Uttar Pradesh', 'Bihar', 'Kerala', 'Other State', 'Invalid Pincode']
+AGE_GROUPS = ['Below 60', '60-65', '66-70', '71-75', '76-80', '80+']
+
+
+def sample_bank_pincode_data(pincodes=300):
+    rng = random.Random(3)
+    data = {}
+    for pincode in rng.sample(range(110001, 855000), pincodes) + ['      ', '.     ']:
+        age_groups = {group: rng.randint(1, 400) for group in rng.sample(AGE_GROUPS, rng.randint(1, 6))}
+        total = sum(age_groups.values())
+        split = rng.randint(0, total)
+        home, away = rng.sample(STATES, 2)
+        pensioner_states = {home: split, away: total - split}
+        data[str(pincode)] = {
+            'total_dlc_completed': total,
+            'age_groups': age_groups,
+            'state': rng.choice(STATES),
+            'district': f"District {rng.randint(1, 40)}",
+            'pensioner_states': {state: count for state, count in pensioner_states.items() if count},
+            'unique_pensioner_count': total,
+        }
+    return data
+
+
+def test_round_trip_through_npz():
+    data = sample_bank_pincode_data()
+    aggregates = PincodeAggregates.from_bank_pincode_data(data, {'analysis_timestamp': '2025-08-25 12:09:46'})
+    assert list(aggregates.pincodes) == sorted(aggregates.pincodes)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'aggregates.npz')
+        aggregates.save(path)
+        loaded = PincodeAggregates.load(path)
+    assert loaded.to_bank_pincode_data() == data
+    assert loaded.meta == {'analysis_timestamp': '2025-08-25 12:09:46'}
+    some_pincode = next(iter(data))
+    assert loaded.record(loaded.row(some_pincode)) == data[some_pincode]
+    assert loaded.record(loaded.row('      ')) == data['      ']
+    assert loaded.row('999999') is None
+
+
+def test_state_wise_matches_dict_rollup():
+    data = sample_bank_pincode_data()
+    assert PincodeAggregates.from_bank_pincode_data(data).state_wise_data() == build_state_wise_data(data)
+
+
+def test_load_aggregates_without_writable_cache():
+    data = sample_bank_pincode_data(50)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'dlc_bank_analysis_20250825_120946.json')
+        with open(path, 'w') as f:
+            json.dump({'bank_pincode_data': data}, f)
+        mtime_ns = os.stat(path).st_mtime_ns
+
+        cache_dir = os.path.join(tmp, 'aggregates')
+        assert load_aggregates(path, mtime_ns, cache_dir).to_bank_pincode_data() == data
+        assert os.listdir(cache_dir) == [f'dlc_bank_analysis_20250825_120946-{mtime_ns}.npz']
+
+        # A cache directory that cannot be created (a file is in the way) still loads
+        assert load_aggregates(path, mtime_ns, os.path.join(path, 'aggregates')).to_bank_pincode_data() == data
+
+
+if __name__ == "__main__":
+    test_round_trip_through_npz()
+    test_state_wise_matches_dict_rollup()
+    test_load_aggregates_without_writable_cache()
+    print("✅ Compact aggregates round-trip and roll up like the dict version")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Shared pincode lookup test
+Checks that the scalar and vectorized lookups agree on mixed Excel-style
+input, that exact GeoJSON pincodes win over the prefix table and that the
+110-160 block follows the canonical Delhi, Haryana, Punjab and Chandigarh ranges
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+
+import pincode_lookup
+from pincode_lookup import (INVALID_PINCODE, OTHER_STATE, district_for_pincode, districts_for_pincodes,
+                            state_for_pincode, states_for_pincodes)
+
+MIXED_PINCODES = [
+    110001, 302012.0, '560034', '560034.0', ' 600001', float('nan'), None,
+    12345, '01234', 1234567, '1234567', 1, '000123', 999999, '999', 'abc', '', 302012.5, -12,
+]
+
+
+def use_boundaries(path):
+    """Point the exact-pincode overrides at another boundary file"""
+    pincode_lookup.BOUNDARIES_GEOJSON = path
+    pincode_lookup.exact_pincode_locations.cache_clear()
+    pincode_lookup._exact_arrays.cache_clear()
+
+
+def with_boundaries(features, check):
+    original = pincode_lookup.BOUNDARIES_GEOJSON
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'boundaries.geojson')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'type': 'FeatureCollection', 'features': features}, f)
+        use_boundaries(path)
+        try:
+            check()
+        finally:
+            use_boundaries(original)
+
+
+def feature(pincode, circle, division=None):
+    return {'type': 'Feature', 'geometry': None,
+            'properties': {'Pincode': pincode, 'Circle': circle, 'Division': division}}
+
+
+def test_scalar_and_vectorized_agree():
+    def check():
+        for values in (MIXED_PINCODES, np.array(MIXED_PINCODES, dtype=object),
+                       np.array([110001, 302012, 560034.0, np.nan, 12345.0, 1234567, 0, 999999, 302012.5]),
+                       np.array([110001, 999001, 5, 7000000], dtype=np.int64)):
+            assert list(states_for_pincodes(values)) == [state_for_pincode(p) for p in values], values
+            assert list(districts_for_pincodes(values)) == [district_for_pincode(p) for p in values], values
+
+    with_boundaries([feature('560034', 'Karnataka', 'Bangalore East'), feature(302012, 'Rajasthan')], check)
+
+    assert state_for_pincode('abc') == state_for_pincode('') == INVALID_PINCODE
+    assert state_for_pincode('000123') == state_for_pincode(999999) == OTHER_STATE
+    assert len(states_for_pincodes([])) == 0
+
+
+def test_exact_overrides_win():
+    def check():
+        for pincode in ('403001', 403001, 403001.0):
+            assert state_for_pincode(pincode) == 'Maharashtra'
+            assert district_for_pincode(pincode) == 'Panaji'
+        assert state_for_pincode(600001) == 'Tamil Nadu'
+        # No Division: the district still comes from the prefix table
+        assert district_for_pincode(600001) == 'Chennai'
+        assert list(states_for_pincodes(np.array([403001, 403002, 600001]))) == ['Maharashtra', 'Goa', 'Tamil Nadu']
+        assert list(districts_for_pincodes(['403001', '403002'])) == ['Panaji', 'Other District']
+
+    with_boundaries([feature('403001', 'Maharashtra', 'Panaji'), feature('600001', 'Tamilnadu')], check)
+
+
+def canonical_state(prefix):
+    if prefix == 110:
+        return 'Delhi'
+    if 121 <= prefix <= 136:
+        return 'Haryana'
+    if 140 <= prefix <= 159:
+        return 'Punjab'
+    if prefix == 160:
+        return 'Chandigarh'
+    return OTHER_STATE
+
+
+def test_delhi_haryana_punjab_ranges():
+    def check():
+        pincodes = [prefix * 1000 + 1 for prefix in range(110, 162)]
+        expected = [canonical_state(p // 1000) for p in pincodes]
+        assert [state_for_pincode(p) for p in pincodes] == expected
+        assert list(states_for_pincodes(pincodes)) == expected
+        assert (state_for_pincode(110001), state_for_pincode(122001), state_for_pincode(140001),
+                state_for_pincode(160017)) == ('Delhi', 'Haryana', 'Punjab', 'Chandigarh')
+        assert state_for_pincode(115001) == state_for_pincode(137001) == OTHER_STATE
+
+    with_boundaries([], check)
+
+
+if __name__ == "__main__":
+    test_scalar_and_vectorized_agree()
+    test_exact_overrides_win()
+    test_delhi_haryana_punjab_ranges()
+    print("✅ Pincode lookups agree and follow the canonical ranges")
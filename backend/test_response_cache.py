@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Response cache test
+Checks Accept-Encoding negotiation (br > gzip > identity, honouring q=0),
+304s on If-None-Match for any encoding's tag or *, the Vary and
+Cache-Control headers on both, the identity/gzip-only path without brotli
+and that ResponseCache rebuilds an entry when its data version changes
+"""
+
+import gzip
+import json
+
+import pytest
+from flask import Flask, Response, request
+
+import response_cache
+from response_cache import CachedResponse, ResponseCache, cached_response
+
+BODY = json.dumps({'rows': [{'pincode': 110001 + i, 'count': i} for i in range(500)]}).encode()
+
+
+def make_app(cached):
+    app = Flask(__name__)
+
+    @app.route('/data')
+    def data():
+        return cached_response(cached, request, Response)
+
+    return app.test_client()
+
+
+def get(client, accept_encoding=None, if_none_match=None):
+    headers = {}
+    if accept_encoding is not None:
+        headers['Accept-Encoding'] = accept_encoding
+    if if_none_match is not None:
+        headers['If-None-Match'] = if_none_match
+    return client.get('/data', headers=headers)
+
+
+def assert_cache_headers(response):
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert response.headers['Cache-Control'] == 'no-cache'
+
+
+def test_encoding_negotiation():
+    if not response_cache.BROTLI_AVAILABLE:
+        pytest.skip("brotli is not installed")
+    cached = CachedResponse(BODY)
+    client = make_app(cached)
+    cases = {
+        'br, gzip': 'br',
+        'gzip, br': 'br',
+        'gzip, deflate': 'gzip',
+        'br;q=0, gzip': 'gzip',
+        'br;q=0, gzip;q=0': 'identity',
+        'gzip;q=0.5, br;q=0.2': 'gzip',
+        'deflate': 'identity',
+        None: 'identity',
+    }
+    for accept_encoding, expected in cases.items():
+        response = get(client, accept_encoding)
+        assert response.status_code == 200, accept_encoding
+        assert response.headers.get('Content-Encoding', 'identity') == expected, accept_encoding
+        assert response.get_data() == cached.variants[expected]
+        assert response.headers['ETag'] == f'"{cached.etag_for(expected)}"'
+        assert_cache_headers(response)
+
+    assert gzip.decompress(cached.variants['gzip']) == BODY
+    assert response_cache.brotli.decompress(cached.variants['br']) == BODY
+
+
+def test_not_modified():
+    cached = CachedResponse(BODY)
+    client = make_app(cached)
+    for if_none_match in (f'"{cached.etag}"', f'"{cached.etag}-gzip"', f'"other", "{cached.etag}"',
+                          f'W/"{cached.etag}"', '*'):
+        response = get(client, 'gzip', if_none_match)
+        assert response.status_code == 304, if_none_match
+        assert response.get_data() == b''
+        # The 304 carries the tag of the representation this client would get
+        assert response.headers['ETag'] == f'"{cached.etag}-gzip"'
+        assert_cache_headers(response)
+
+    response = get(client, 'gzip', '"0123456789abcdef"')
+    assert response.status_code == 200 and response.headers['Content-Encoding'] == 'gzip'
+
+
+def test_without_brotli():
+    original = response_cache.BROTLI_AVAILABLE
+    response_cache.BROTLI_AVAILABLE = False
+    try:
+        cached = CachedResponse(BODY)
+    finally:
+        response_cache.BROTLI_AVAILABLE = original
+    assert sorted(cached.variants) == ['gzip', 'identity']
+
+    client = make_app(cached)
+    assert get(client, 'br').headers.get('Content-Encoding') is None
+    assert get(client, 'br').get_data() == BODY
+    assert get(client, 'br, gzip').headers['Content-Encoding'] == 'gzip'
+    assert get(client, 'br', f'"{cached.etag}-br"').status_code == 200
+
+
+def test_rebuilds_on_version_change():
+    cache = ResponseCache()
+    builds = []
+
+    def build(body):
+        def build_body():
+            builds.append(body)
+            return body
+        return build_body
+
+    first = cache.get('pensioners', ('a.db', 1), build(b'[1]'))
+    assert cache.get('pensioners', ('a.db', 1), build(b'[ignored]')) is first
+    second = cache.get('pensioners', ('a.db', 2), build(b'[1, 2]'))
+    assert second.variants['identity'] == b'[1, 2]' and second.etag != first.etag
+    assert cache.get('other', ('a.db', 2), build(b'[3]')).variants['identity'] == b'[3]'
+    assert builds == [b'[1]', b'[1, 2]', b'[3]']
+
+    cache.clear()
+    cache.get('pensioners', ('a.db', 2), build(b'[1, 2]'))
+    assert len(builds) == 4
+
+
+if __name__ == "__main__":
+    test_encoding_negotiation()
+    test_not_modified()
+    test_without_brotli()
+    test_rebuilds_on_version_change()
+    print("✅ Cached responses negotiate encodings and revalidate by ETag")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Summary table parity test
+Checks that every dashboard query answered from the summary_* tables returns
+the same rows as the original aggregate over the pensioners table
+"""
+
+import os
+import tempfile
+
+import dashboard_queries as q
+from summary_tables import refresh_summary_tables
+from test_dashboard_query_plans import build_database
+
+AGE_GROUP_CASE = q.AGE_GROUP_CASE
+
+# The pre-summary statements, kept as the parity oracle
+RAW_QUERIES = {
+    'stats_total': "SELECT COUNT(*) FROM pensioners",
+    'stats_verified_this_month': """
+        SELECT COUNT(*) FROM pensioners
+        WHERE status = 'Verified' AND last_verification >= date('now', '-30 days')""",
+    'stats_pending': "SELECT COUNT(*) FROM pensioners WHERE status = 'Pending'",
+    'stats_total_amount': "SELECT ROUND(SUM(amount), 4) FROM pensioners WHERE status = 'Verified'",
+    'age_distribution': f"""
+        SELECT {AGE_GROUP_CASE} as age_group, COUNT(*) FROM pensioners
+        GROUP BY age_group ORDER BY age_group""",
+    'state_wise': """
+        SELECT state, COUNT(*) as total_pensioners,
+            SUM(CASE WHEN status = 'Verified' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN status = 'Pending' THEN 1 ELSE 0 END),
+            ROUND(AVG(amount), 2)
+        FROM pensioners GROUP BY state ORDER BY total_pensioners DESC, state""",
+    'auth_methods_total': "SELECT COUNT(*) FROM pensioners WHERE authentication_method IS NOT NULL",
+    'verification_locations': """
+        SELECT district, state, COUNT(*) as total,
+            SUM(CASE WHEN status = 'Verified' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN status = 'Pending' THEN 1 ELSE 0 END)
+        FROM pensioners GROUP BY district, state HAVING total > 5
+        ORDER BY total DESC, district, state LIMIT 50""",
+    'bar_chart_race': """
+        SELECT state, COUNT(*) as total_pensioners,
+            SUM(CASE WHEN status = 'Verified' THEN 1 ELSE 0 END)
+        FROM pensioners GROUP BY state ORDER BY total_pensioners DESC, state LIMIT 10""",
+}
+for age_group, clause in [(None, '')] + list(q.AUTH_METHODS_AGE_FILTERS.items()):
+    RAW_QUERIES[f"auth_methods_{age_group}" if age_group else 'auth_methods'] = f"""
+        SELECT authentication_method, COUNT(*), {AGE_GROUP_CASE} as age_group
+        FROM pensioners WHERE authentication_method IS NOT NULL{clause}
+        GROUP BY authentication_method, age_group ORDER BY authentication_method, age_group"""
+
+
+def canonical(rows):
+    """Rows with float sums rounded and ties in ORDER BY made deterministic"""
+    return sorted(tuple(round(v, 4) if isinstance(v, float) else v for v in row) for row in rows)
+
+
+def test_summary_queries_match_raw_aggregates():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = build_database(os.path.join(tmp, 'summary.db'))
+        refresh_summary_tables(conn)
+        for name, (sql, params) in q.dashboard_queries().items():
+            if name not in RAW_QUERIES:
+                continue
+            expected = canonical(conn.execute(RAW_QUERIES[name]).fetchall())
+            actual = canonical(conn.execute(sql, params).fetchall())
+            assert actual == expected, name
+        conn.close()
+
+
+def test_summaries_follow_reload():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = build_database(os.path.join(tmp, 'summary.db'))
+        refresh_summary_tables(conn)
+        conn.execute("DELETE FROM pensioners WHERE state = 'Bihar'")
+        conn.commit()
+        refresh_summary_tables(conn)
+        states = {row[0] for row in conn.execute(q.STATE_WISE)}
+        assert 'Bihar' not in states
+        assert conn.execute(q.STATS_TOTAL).fetchone() == conn.execute("SELECT COUNT(*) FROM pensioners").fetchone()
+        conn.close()
+
+
+if __name__ == "__main__":
+    test_summary_queries_match_raw_aggregates()
+    test_summaries_follow_reload()
+    print("✅ Dashboard summaries match the raw pensioners aggregates")
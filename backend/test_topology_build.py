@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+TopoJSON build test
+Decodes the built levels back to rings and checks that neighbouring shapes
+still share identical borders after simplification and that shapes stay close
+to the source polygons
+"""
+
+import json
+
+import numpy as np
+
+from topology_build import INDIA_GEOJSON, TOPOLOGY_ZOOMS, build_topology, encode_level
+
+
+def decode_arcs(topology):
+    """Absolute coordinates of every arc"""
+    scale = np.array(topology['transform']['scale'])
+    translate = np.array(topology['transform']['translate'])
+    return [np.cumsum(np.array(arc, dtype=float), axis=0) * scale + translate for arc in topology['arcs']]
+
+
+def decode_ring(arc_refs, arcs):
+    points = []
+    for ref in arc_refs:
+        arc = arcs[ref] if ref >= 0 else arcs[~ref][::-1]
+        points.extend(map(tuple, arc if not points else arc[1:]))
+    return points
+
+
+def decode_polygons(topology, name):
+    """Per feature: list of polygons, each a list of rings of (lon, lat)"""
+    arcs = decode_arcs(topology)
+    shapes = []
+    for geometry in topology['objects'][name]['geometries']:
+        polygons = [geometry['arcs']] if geometry['type'] == 'Polygon' else geometry['arcs']
+        shapes.append([[decode_ring(ring, arcs) for ring in polygon] for polygon in polygons])
+    return shapes
+
+
+def ring_area(ring):
+    points = np.array(ring)
+    x, y = points[:, 0], points[:, 1]
+    return abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2
+
+
+def jagged_neighbours():
+    """Two squares sharing a wiggly border that simplification will flatten"""
+    border = [(1.0, y / 10) for y in range(11)]
+    border = [(x + (0.001 if i % 2 else 0), y) for i, (x, y) in enumerate(border)]
+    left = [(0.0, 0.0)] + border + [(0.0, 1.0), (0.0, 0.0)]
+    right = [(2.0, 0.0), (2.0, 1.0)] + border[::-1] + [(2.0, 0.0)]
+    return {'type': 'FeatureCollection', 'features': [
+        {'type': 'Feature', 'properties': {'name': 'left'}, 'geometry': {'type': 'Polygon', 'coordinates': [left]}},
+        {'type': 'Feature', 'properties': {'name': 'right'}, 'geometry': {'type': 'Polygon', 'coordinates': [right]}},
+    ]}
+
+
+def test_shared_border_survives_simplification():
+    arcs, geometries = build_topology(jagged_neighbours())
+    for zoom in TOPOLOGY_ZOOMS:
+        left, right = decode_polygons(encode_level('test', arcs, geometries, zoom), 'test')
+        left_points = {p for p in left[0][0] if 0.5 < p[0] < 1.5}
+        right_points = {p for p in right[0][0] if 0.5 < p[0] < 1.5}
+        assert left_points and left_points == right_points
+
+
+def test_india_levels_close_to_source():
+    with open(INDIA_GEOJSON, 'r', encoding='utf-8') as f:
+        source = json.load(f)
+    arcs, geometries = build_topology(source)
+    finest = decode_polygons(encode_level('india', arcs, geometries, TOPOLOGY_ZOOMS[-1]), 'india')
+    assert len(finest) == len(source['features'])
+
+    for feature, polygons in zip(source['features'], finest):
+        geometry = feature['geometry']
+        original = [geometry['coordinates']] if geometry['type'] == 'Polygon' else geometry['coordinates']
+        expected = sum(ring_area(polygon[0]) for polygon in original)
+        actual = sum(ring_area(polygon[0]) for polygon in polygons)
+        assert all(ring[0] == ring[-1] for polygon in polygons for ring in polygon)
+        assert abs(actual - expected) <= 0.02 * expected + 1e-4
+
+
+if __name__ == "__main__":
+    test_shared_border_survives_simplification()
+    test_india_levels_close_to_source()
+    print("✅ TopoJSON levels keep shared borders and stay close to the sources")
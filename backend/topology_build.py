@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Simplified, quantized TopoJSON build for the state and district boundary maps
+Converts india.json and states/*.json (GeoJSON FeatureCollections) into
+TopoJSON at several zoom-dependent tolerance levels. Rings are cut into arcs
+at junctions so a border shared by two regions is stored and simplified once,
+which keeps neighbouring shapes gap-free however coarse the level is.
+
+Output (TOPOJSON_DIR, committed and deployed with the API):
+    india-z<zoom>.json, <state>-z<zoom>.json   one file per source and level
+    sources.json                               size and hash of each source when it was built
+
+A level is served while its source still has the recorded size; otherwise it
+is rebuilt (into a temporary directory on read-only deployments). Build ahead
+of time with:
+    python topology_build.py
+"""
+
+import glob
+import json
+import os
+import tempfile
+
+# The read side (topology_path) runs on serverless requests, so NumPy and the
+# simplifier are only imported by the build functions
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+INDIA_GEOJSON = os.path.join(REPO_ROOT, 'india.json')
+STATES_DIR = os.path.join(REPO_ROOT, 'states')
+TOPOJSON_DIR = os.environ.get('DLC_TOPOJSON_DIR', os.path.join(REPO_ROOT, 'topojson'))
+
+# Country-wide and state-level map zooms; the map requests the nearest level
+TOPOLOGY_ZOOMS = [4, 6, 8, 10]
+
+# Grid used to detect shared vertices (about 0.1 m), and the quantization step
+# of each level relative to its simplification tolerance
+FINE_GRID = 1e-6
+QUANTIZE_FRACTION = 0.25
+
+
+def source_paths():
+    """name → GeoJSON path for india.json and every states/*.json"""
+    paths = {'india': INDIA_GEOJSON}
+    for path in sorted(glob.glob(os.path.join(STATES_DIR, '*.json'))):
+        paths[os.path.splitext(os.path.basename(path))[0]] = path
+    return paths
+
+
+def output_path(name, zoom, out_dir=TOPOJSON_DIR):
+    return os.path.join(out_dir, f"{name}-z{zoom}.json")
+
+
+def recorded_sources(out_dir=TOPOJSON_DIR):
+    """{name: fingerprint} of the sources the levels in out_dir were built from"""
+    try:
+        with open(os.path.join(out_dir, 'sources.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _record_source(name, source_path, out_dir):
+    from dashboard_aggregates import workbook_fingerprint
+
+    sources = recorded_sources(out_dir)
+    sources[name] = workbook_fingerprint(source_path)
+    path = os.path.join(out_dir, 'sources.json')
+    with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(sources, f, indent=1, sort_keys=True)
+        f.write('\n')
+    os.replace(f"{path}.tmp", path)
+
+
+def _geometry_polygons(geometry):
+    if geometry['type'] == 'Polygon':
+        return [geometry['coordinates']]
+    if geometry['type'] == 'MultiPolygon':
+        return geometry['coordinates']
+    return []
+
+
+def _fine_ring(ring):
+    """Ring as open list of fine-grid integer points with repeated vertices removed"""
+    points = []
+    for lon, lat in (point[:2] for point in ring):
+        point = (int(round(lon / FINE_GRID)), int(round(lat / FINE_GRID)))
+        if not points or points[-1] != point:
+            points.append(point)
+    if len(points) > 1 and points[0] == points[-1]:
+        points.pop()
+    return points
+
+
+def _junctions(rings):
+    """Vertices where rings meet or part ways: seen with different neighbours in different rings"""
+    neighbours = {}
+    junctions = set()
+    for ring in rings:
+        count = len(ring)
+        for index, point in enumerate(ring):
+            pair = frozenset((ring[index - 1], ring[(index + 1) % count]))
+            seen = neighbours.setdefault(point, pair)
+            if seen != pair:
+                junctions.add(point)
+    return junctions
+
+
+class _ArcTable:
+    """Deduplicated arcs; a shared border is stored once and referenced as i or ~i"""
+
+    def __init__(self):
+        self.arcs = []
+        self._index = {}
+
+    def add(self, points):
+        key = tuple(points)
+        if key in self._index:
+            return self._index[key]
+        reverse = key[::-1]
+        if reverse in self._index:
+            return ~self._index[reverse]
+        self._index[key] = len(self.arcs)
+        self.arcs.append(key)
+        return len(self.arcs) - 1
+
+
+def _ring_arcs(ring, junctions, table):
+    """Cut one ring at its junctions and return the arc references that rebuild it"""
+    cuts = [index for index, point in enumerate(ring) if point in junctions]
+    if not cuts:
+        # Closed arc: rotate to its smallest vertex so an identical ring (in either
+        # direction, e.g. an enclave and the hole around it) maps to the same arc
+        start = ring.index(min(ring))
+        rotated = ring[start:] + ring[:start]
+        return [table.add(rotated + [rotated[0]])]
+
+    rotated = ring[cuts[0]:] + ring[:cuts[0]]
+    cuts = [index - cuts[0] for index in cuts]
+    bounds = cuts + [len(rotated)]
+    closed = rotated + [rotated[0]]
+    return [table.add(closed[start:end + 1]) for start, end in zip(bounds, bounds[1:])]
+
+
+def build_topology(geojson):
+    """Arc table plus per-feature polygon → ring → arc reference lists"""
+    features = [f for f in geojson.get('features', []) if f.get('geometry')]
+    shapes = []
+    for feature in features:
+        polygons = [[_fine_ring(ring) for ring in polygon] for polygon in _geometry_polygons(feature['geometry'])]
+        shapes.append([[ring for ring in polygon if len(ring) >= 3] for polygon in polygons])
+
+    junctions = _junctions(ring for polygons in shapes for polygon in polygons for ring in polygon)
+    table = _ArcTable()
+    geometries = []
+    for feature, polygons in zip(features, shapes):
+        arcs = [[_ring_arcs(ring, junctions, table) for ring in polygon] for polygon in polygons if polygon]
+        geometries.append((feature, arcs))
+    return table.arcs, geometries
+
+
+def _simplify_arc(arc, tolerance):
+    """Simplify one arc in fine-grid units; closed arcs keep at least a triangle"""
+    import numpy as np
+
+    from geo_tiles import simplify_line
+
+    points = np.array(arc, dtype=float)
+    if tolerance <= 0 or len(points) <= 2:
+        return points
+    if arc[0] != arc[-1]:
+        return simplify_line(points, tolerance)
+
+    far = int(np.argmax(np.hypot(*(points - points[0]).T)))
+    while True:
+        simplified = np.vstack([simplify_line(points[:far + 1], tolerance),
+                                simplify_line(points[far:], tolerance)[1:]])
+        if len(simplified) >= 4 or tolerance < 1:
+            return simplified
+        tolerance /= 4
+
+
+def encode_level(name, arcs, geometries, zoom):
+    """TopoJSON dict for one level: simplified, quantized and delta-encoded arcs"""
+    import numpy as np
+
+    from geo_tiles import tolerance_for_zoom
+
+    tolerance = tolerance_for_zoom(zoom)
+    step = max(FINE_GRID, tolerance * QUANTIZE_FRACTION)
+    every_point = np.array([point for arc in arcs for point in arc], dtype=float) * FINE_GRID
+    translate = every_point.min(axis=0) if len(every_point) else np.zeros(2)
+
+    encoded_arcs = []
+    for arc in arcs:
+        simplified = _simplify_arc(arc, tolerance / FINE_GRID) * FINE_GRID
+        quantized = np.round((simplified - translate) / step).astype(np.int64)
+        # Drop vertices that collapse onto their predecessor at this step, keeping both ends
+        moved = np.any(np.diff(quantized, axis=0) != 0, axis=1)
+        keep = np.concatenate([[True], moved])
+        keep[-1] = True
+        quantized = quantized[keep]
+        deltas = np.vstack([quantized[:1], np.diff(quantized, axis=0)])
+        encoded_arcs.append(deltas.tolist())
+
+    objects = []
+    for feature, polygons in geometries:
+        geometry = {'properties': feature.get('properties') or {}}
+        if feature['geometry']['type'] == 'Polygon' and len(polygons) == 1:
+            geometry.update(type='Polygon', arcs=polygons[0])
+        else:
+            geometry.update(type='MultiPolygon', arcs=polygons)
+        objects.append(geometry)
+
+    return {
+        'type': 'Topology',
+        'transform': {'scale': [step, step], 'translate': translate.tolist()},
+        'objects': {name: {'type': 'GeometryCollection', 'geometries': objects}},
+        'arcs': encoded_arcs,
+    }
+
+
+def build_source(name, source_path, out_dir=TOPOJSON_DIR):
+    """Build every level of one source file, returning {zoom: bytes written}"""
+    with open(source_path, 'r', encoding='utf-8') as f:
+        arcs, geometries = build_topology(json.load(f))
+
+    os.makedirs(out_dir, exist_ok=True)
+    sizes = {}
+    for zoom in TOPOLOGY_ZOOMS:
+        body = json.dumps(encode_level(name, arcs, geometries, zoom), separators=(',', ':')).encode('utf-8')
+        path = output_path(name, zoom, out_dir)
+        with open(f"{path}.tmp", 'wb') as f:
+            f.write(body)
+        os.replace(f"{path}.tmp", path)
+        sizes[zoom] = len(body)
+    # Recorded last: levels without a matching record are rebuilt
+    _record_source(name, source_path, out_dir)
+    return sizes
+
+
+def zoom_level(zoom):
+    """Coarsest built level detailed enough for a map zoom"""
+    for level in TOPOLOGY_ZOOMS:
+        if zoom <= level:
+            return level
+    return TOPOLOGY_ZOOMS[-1]
+
+
+def _is_current(name, path, source_path, out_dir):
+    """Whether a built level exists and its source still has the recorded size (a stat, no read)"""
+    recorded = recorded_sources(out_dir).get(name)
+    try:
+        return recorded is not None and os.path.exists(path) and recorded['size'] == os.path.getsize(source_path)
+    except OSError:
+        return False
+
+
+def stale_topologies(out_dir=TOPOJSON_DIR):
+    """Names whose levels are missing or were built from different content"""
+    from dashboard_aggregates import workbook_fingerprint
+
+    recorded = recorded_sources(out_dir)
+    return [
+        name for name, source_path in source_paths().items()
+        if recorded.get(name) != workbook_fingerprint(source_path)
+        or not all(os.path.exists(output_path(name, zoom, out_dir)) for zoom in TOPOLOGY_ZOOMS)
+    ]
+
+
+def topology_path(name, zoom, out_dir=TOPOJSON_DIR):
+    """Path of the built level for a map zoom, building it first if missing or stale
+
+    Raises KeyError for an unknown name. Read-only deployments build into a
+    temporary directory instead.
+    """
+    source_path = source_paths()[name]
+    level = zoom_level(zoom)
+    for directory in (out_dir, os.path.join(tempfile.gettempdir(), 'dlc_topojson')):
+        path = output_path(name, level, directory)
+        if _is_current(name, path, source_path, directory):
+            return path
+        try:
+            build_source(name, source_path, directory)
+            return path
+        except OSError:
+            continue
+    raise OSError(f"Cannot write TopoJSON for {name}")
+
+
+def build_all(out_dir=TOPOJSON_DIR):
+    """Offline step: build every level for india.json and all state files"""
+    print("🗺️ TOPOJSON BUILD")
+    print("=" * 60)
+    total_source = total_levels = 0
+    for name, source_path in source_paths().items():
+        sizes = build_source(name, source_path, out_dir)
+        source_size = os.path.getsize(source_path)
+        total_source += source_size
+        total_levels += sizes[TOPOLOGY_ZOOMS[-1]]
+        levels = ' | '.join(f"z{zoom} {size / 1024:,.0f} KB" for zoom, size in sizes.items())
+        print(f"✅ {name}: {source_size / 1024:,.0f} KB → {levels}")
+    print(f"\n💾 Finest level is {total_source / max(total_levels, 1):.1f}x smaller than the sources → {out_dir}")
+
+
+if __name__ == "__main__":
+    build_all()
@@ -2,6 +2,7 @@ import pandas as pd
 import os
 from datetime import datetime
 import json
+from excel_cache import load_workbook
 
 def count_total_data_from_excel_files():
     """Count total number of records from all 5 Excel files"""
@@ -32,9 +33,9 @@ def count_total_data_from_excel_files():
             file_size = os.path.getsize(file_path)
             file_size_mb = file_size / (1024 * 1024)
             
-            # Read Excel file to count rows
+            # Read workbook (via the columnar cache) to count rows
             print(f"   📖 Reading file... (Size: {file_size_mb:.1f} MB)")
-            df = pd.read_excel(file_path)
+            df = load_workbook(file_path)
             
             # Count records
             file_record_count = len(df)
@@ -154,7 +155,7 @@ def count_total_data_from_excel_files():
         # Sample first file for data quality check
         try:
             first_file_path = os.path.join(excel_folder, excel_files[0])
-            sample_df = pd.read_excel(first_file_path, nrows=1000)  # Sample first 1000 rows
+            sample_df = load_workbook(first_file_path, nrows=1000)  # Sample first 1000 rows
             
             # Check for key columns
             key_columns = ['PENSIONER_PINCODE', 'BRANCH_PINCODE', 'YOB', 'BANK_NAME']
@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Workbook fixtures for the tests
+Writes small GAD_DLC_PINCODE_DATA-style workbooks with the analyzer's input
+columns, shared by the manifest and bank-pincode analyzer tests
+"""
+
+import os
+
+import pandas as pd
+
+WORKBOOK_COLUMNS = ['BRANCH_PINCODE', 'PENSIONER_PINCODE', 'YOB']
+
+
+def write_workbook(folder, name, rows):
+    """Write rows of [BRANCH_PINCODE, PENSIONER_PINCODE, YOB] to folder/name"""
+    df = pd.DataFrame(rows, columns=WORKBOOK_COLUMNS)
+    df.to_excel(os.path.join(folder, name), index=False)
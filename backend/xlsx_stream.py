@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Streaming row reader for the GAD_DLC_PINCODE_DATA workbooks
+Parses the sheet XML with iterparse and yields fixed-size DataFrame batches
+holding only the requested columns. Each row element is dropped from the tree
+once read, so memory use depends on the batch size (and the shared string
+table) rather than on the number of rows in the workbook.
+"""
+
+import posixpath
+import zipfile
+from datetime import datetime
+from xml.etree.ElementTree import XMLParser, iterparse
+
+DEFAULT_BATCH_SIZE = 50000
+
+# Bytes of sheet XML parsed between draining finished rows
+READ_CHUNK_SIZE = 64 * 1024
+
+MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PACKAGE_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+ROW_TAG, CELL_TAG, VALUE_TAG = f'{MAIN_NS}row', f'{MAIN_NS}c', f'{MAIN_NS}v'
+TEXT_TAG, PHONETIC_TAG = f'{MAIN_NS}t', f'{MAIN_NS}rPh'
+
+def _column_index(letters):
+    """0-based column index of a cell reference's letters ('A' → 0, 'AA' → 26)"""
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - 64
+    return index - 1
+
+
+def _read_xml(archive, name):
+    with archive.open(name) as f:
+        return [elem for _, elem in iterparse(f)]
+
+
+def _sheet_part(archive, sheet_name):
+    """Zip member of the named sheet (the first sheet by default) and whether the workbook uses the 1904 epoch"""
+    workbook = _read_xml(archive, 'xl/workbook.xml')
+    date1904 = any(elem.tag == f'{MAIN_NS}workbookPr' and elem.get('date1904') in ('1', 'true')
+                   for elem in workbook)
+    sheets = [elem for elem in workbook if elem.tag == f'{MAIN_NS}sheet']
+    if sheet_name is not None:
+        sheets = [elem for elem in sheets if elem.get('name') == sheet_name]
+        if not sheets:
+            raise KeyError(f"Worksheet {sheet_name} does not exist.")
+    rel_id = sheets[0].get(f'{REL_NS}id')
+
+    targets = {elem.get('Id'): elem.get('Target') for elem in _read_xml(archive, 'xl/_rels/workbook.xml.rels')
+               if elem.tag == f'{PACKAGE_REL_NS}Relationship'}
+    target = targets[rel_id]
+    part = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+    return part, date1904
+
+
+def _string_item(elem):
+    """Text of a shared or inline string: plain <t>, or rich-text runs (phonetic hints are not part of it)"""
+    parts = []
+    for child in elem:
+        if child.tag == f'{MAIN_NS}t':
+            parts.append(child.text or '')
+        elif child.tag == f'{MAIN_NS}r':
+            parts.extend(t.text or '' for t in child.iter(f'{MAIN_NS}t'))
+    return ''.join(parts)
+
+
+def _shared_strings(archive):
+    if 'xl/sharedStrings.xml' not in archive.namelist():
+        return []
+    strings = []
+    with archive.open('xl/sharedStrings.xml') as f:
+        for _, elem in iterparse(f):
+            if elem.tag == f'{MAIN_NS}si':
+                strings.append(_string_item(elem))
+                elem.clear()
+    return strings
+
+
+def _date_styles(archive):
+    """Indexes of the cell formats that display numbers as dates or durations: {index: is_timedelta}"""
+    from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+
+    if 'xl/styles.xml' not in archive.namelist():
+        return {}
+    styles = _read_xml(archive, 'xl/styles.xml')
+    formats = dict(BUILTIN_FORMATS)
+    formats.update((int(elem.get('numFmtId')), elem.get('formatCode'))
+                   for elem in styles if elem.tag == f'{MAIN_NS}numFmt')
+    cell_xfs = next((elem for elem in styles if elem.tag == f'{MAIN_NS}cellXfs'), [])
+    date_styles = {}
+    for index, xf in enumerate(cell_xfs):
+        code = formats.get(int(xf.get('numFmtId', 0)))
+        if code and is_date_format(code):
+            date_styles[index] = is_timedelta_format(code)
+    return date_styles
+
+
+class _SheetRows:
+    """XMLParser target for a worksheet: collects finished rows as (row number, {column: value})
+
+    No element tree is built, so nothing is retained once the caller drains
+    rows. Cell values follow openpyxl's: ints and floats, dates for
+    date-formatted numbers, None for empty and error cells.
+    """
+
+    def __init__(self, shared_strings, date_styles, date1904):
+        from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel
+
+        self.shared_strings = shared_strings
+        self.date_styles = date_styles
+        self.epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+        self.from_excel = from_excel
+        self.rows = []
+        self.row_number = 0
+        self.values = None
+        self.column = 0
+        self.cell = None
+        self.text = None
+        self.collecting = False
+        self.in_phonetic = False
+
+    def start(self, tag, attrib):
+        if tag == CELL_TAG:
+            self.cell = attrib
+            self.text = None
+            ref = attrib.get('r')
+            if ref:
+                self.column = _column_index(ref.rstrip('0123456789'))
+        elif tag == VALUE_TAG or (tag == TEXT_TAG and self.cell is not None and not self.in_phonetic):
+            if self.text is None:
+                self.text = []
+            self.collecting = True
+        elif tag == PHONETIC_TAG:
+            self.in_phonetic = True
+        elif tag == ROW_TAG:
+            self.row_number = int(attrib.get('r', self.row_number + 1))
+            self.values = {}
+            self.column = 0
+
+    def data(self, data):
+        if self.collecting:
+            self.text.append(data)
+
+    def end(self, tag):
+        if tag == VALUE_TAG or tag == TEXT_TAG:
+            self.collecting = False
+        elif tag == PHONETIC_TAG:
+            self.in_phonetic = False
+        elif tag == CELL_TAG:
+            self.values[self.column] = self._cell_value()
+            self.column += 1
+            self.cell = None
+        elif tag == ROW_TAG:
+            self.rows.append((self.row_number, self.values))
+            self.values = None
+
+    def close(self):
+        pass
+
+    def _cell_value(self):
+        cell_type = self.cell.get('t', 'n')
+        if self.text is None:
+            return None
+        text = ''.join(self.text)
+        if cell_type == 'n':
+            number = float(text) if any(c in text for c in '.eE') else int(text)
+            style = int(self.cell.get('s', 0))
+            if style in self.date_styles:
+                return self.from_excel(number, self.epoch, timedelta=self.date_styles[style])
+            return number
+        if cell_type == 's':
+            return self.shared_strings[int(text)]
+        if cell_type == 'b':
+            return text == '1'
+        if cell_type == 'd':
+            return datetime.fromisoformat(text)
+        if cell_type == 'e':
+            return None
+        return text
+
+
+def iter_xlsx_batches(file_path, columns=None, batch_size=DEFAULT_BATCH_SIZE, sheet_name=None):
+    """Yield DataFrames of at most batch_size rows with the requested columns of a sheet
+
+    The first row is treated as the header. Requested columns that the sheet
+    does not have are skipped, matching load_workbook(columns=...).
+    """
+    import pandas as pd
+
+    with zipfile.ZipFile(file_path) as archive:
+        part, date1904 = _sheet_part(archive, sheet_name)
+        sheet = _SheetRows(_shared_strings(archive), _date_styles(archive), date1904)
+        parser = XMLParser(target=sheet)
+
+        header = wanted = positions = None
+        buffers = []
+        buffered = 0
+        next_row = 1
+        with archive.open(part) as f:
+            while True:
+                chunk = f.read(READ_CHUNK_SIZE)
+                if chunk:
+                    parser.feed(chunk)
+                else:
+                    parser.close()
+                rows, sheet.rows = sheet.rows, []
+
+                for row_number, values in rows:
+                    if header is None:
+                        width = max(values) + 1 if values else 0
+                        header = [str(values[i]) if values.get(i) is not None else '' for i in range(width)]
+                        wanted = header if columns is None else [c for c in columns if c in header]
+                        positions = [header.index(name) for name in wanted]
+                        buffers = [[] for _ in positions]
+                        next_row = row_number + 1
+                        continue
+
+                    # Rows the sheet skips are empty, as openpyxl reports them
+                    for row in [{}] * (row_number - next_row) + [values]:
+                        for buffer, position in zip(buffers, positions):
+                            buffer.append(row.get(position))
+                        buffered += 1
+                        if buffered == batch_size:
+                            yield pd.DataFrame(dict(zip(wanted, buffers)))
+                            buffers = [[] for _ in positions]
+                            buffered = 0
+                    next_row = row_number + 1
+
+                if not chunk:
+                    break
+
+        if buffered:
+            yield pd.DataFrame(dict(zip(wanted, buffers)))
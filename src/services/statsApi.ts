@@ -49,9 +49,10 @@ export interface PensionerRecord {
 
 export interface PensionersResponse {
   data: PensionerRecord[]
-  page: number
+  page: number | null
   per_page: number
   total: number
+  next_after?: string | null
 }
 
 export interface DLCBankData {